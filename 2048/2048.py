@@ -1,3 +1,5 @@
+import os
+import sys
 import time
 
 from selenium import webdriver
@@ -5,9 +7,18 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoSuchElementException
 
+# The engine, solver and board reader live next to the RL code
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from board_reader_2048 import read_board  # noqa: E402
+from solver_2048 import ExpectimaxSolver  # noqa: E402
+
 
 class Simple2048Bot:
-    def __init__(self):
+    def __init__(self, solver=None):
+        """
+        :param solver: optional ExpectimaxSolver. Without one the bot just
+            cycles through the arrow keys.
+        """
         # Launch Chrome and go to the official 2048 site
         self.driver = webdriver.Chrome()
         self.driver.get("https://play2048.co/")
@@ -16,6 +27,10 @@ class Simple2048Bot:
         # We'll repeatedly press these four moves in a cycle
         self.moves = [Keys.ARROW_UP, Keys.ARROW_RIGHT, Keys.ARROW_DOWN, Keys.ARROW_LEFT]
 
+        self.solver = solver
+        # Solver actions are UP, DOWN, LEFT, RIGHT in that order
+        self.solver_keys = [Keys.ARROW_UP, Keys.ARROW_DOWN, Keys.ARROW_LEFT, Keys.ARROW_RIGHT]
+
     def is_game_over(self):
         """
         Check if 'Game over!' text is displayed.
@@ -29,10 +44,24 @@ class Simple2048Bot:
             pass
         return False
 
+    def get_board(self):
+        """
+        Read the 4x4 grid of tile values in a single execute_script call.
+        """
+        return read_board(self.driver)
+
+    def next_move(self, move_index):
+        if self.solver is None:
+            return self.moves[move_index]
+        action = self.solver.best_grid_action(self.get_board())
+        if action is None:
+            return self.moves[move_index]
+        return self.solver_keys[action]
+
     def play(self):
         """
         Main loop:
-          1) Press Up, Right, Down, Left in a cycle.
+          1) Press Up, Right, Down, Left in a cycle, or the solver's move.
           2) Check if game is over.
           3) Continue until game is over.
         """
@@ -44,15 +73,18 @@ class Simple2048Bot:
                 break
 
             body = self.driver.find_element(By.TAG_NAME, "body")
-            body.send_keys(self.moves[move_index])
+            body.send_keys(self.next_move(move_index))
 
             move_index = (move_index + 1) % len(self.moves)
             time.sleep(0.1)  # A small pause so we can see the moves
 
+        if self.solver is not None:
+            print(self.solver.stats())
         time.sleep(3)
         self.driver.quit()
 
 
 if __name__ == "__main__":
-    bot = Simple2048Bot()
+    use_solver = "--expectimax" in sys.argv
+    bot = Simple2048Bot(solver=ExpectimaxSolver(time_budget=0.005) if use_solver else None)
     bot.play()
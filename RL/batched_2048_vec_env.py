@@ -0,0 +1,144 @@
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+import engine_2048 as engine
+from obs_encoding_2048 import Log2Encoder, encode_boards, observation_space
+from reward_2048 import RewardShaper
+
+
+class Batched2048VecEnv(VecEnv):
+    """
+    N games of 2048 held as one uint64 array of bitboards and stepped
+    together with NumPy table lookups. Implements the stable_baselines3
+    VecEnv interface, so it replaces DummyVecEnv([Local2048Env] * N):
+
+        env = Batched2048VecEnv(num_envs=1024)
+        model = PPO("MlpPolicy", env)
+
+    Observations, actions and rewards are the same as Local2048Env and
+    Browser2048Env. Finished games are reset automatically; the final board
+    is in infos[i]["terminal_observation"] as SB3 expects.
+
+    encoding="exponent" or "onehot" observes log2 encodings of the boards
+    instead of tile values (see obs_encoding_2048), encoded straight from
+    the bitboards into preallocated buffers.
+
+    reward picks the reward terms like Local2048Env (see reward_2048). With
+    more than one term, each env's unweighted terms are in
+    infos[i]["reward_terms"].
+    """
+    metadata = {"render_modes": ["human"]}
+
+    def __init__(self, num_envs=1024, seed=None, encoding="raw", reward="tile_sum"):
+        action_space = gym.spaces.Discrete(4)
+        self.encoding = encoding
+        self.encoder = None if encoding == "raw" else Log2Encoder(encoding, num_envs)
+        self.render_mode = None
+        self.shaper = RewardShaper(reward)
+
+        self.ACTION_MAP = np.array([
+            engine.UP,
+            engine.DOWN,
+            engine.LEFT,
+            engine.RIGHT
+        ])
+
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros(num_envs, dtype=np.uint64)
+        self.actions = None
+        super().__init__(num_envs, observation_space(encoding), action_space)
+
+    def reset(self):
+        # VecEnv.seed() stores one seed per env; one generator drives the batch
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+
+        self.boards = engine.new_board_batch(self.num_envs, self.rng)
+        return self._observe(self.boards)
+
+    def _observe(self, boards):
+        if self.encoder is None:
+            return engine.unpack_batch(boards)
+        return self.encoder.from_boards(boards)
+
+    def step_async(self, actions):
+        self.actions = self.ACTION_MAP[np.asarray(actions).reshape(self.num_envs)]
+
+    def step_wait(self):
+        boards = self.boards
+        moved = boards.copy()
+        scores = np.zeros(self.num_envs, dtype=np.int64)
+        for action in engine.ACTIONS:
+            idx = np.flatnonzero(self.actions == action)
+            if len(idx):
+                moved[idx], scores[idx] = engine.move_with_score_batch(boards[idx], action)
+
+        # Like the web game, a move that changes nothing spawns nothing
+        changed = np.flatnonzero(moved != boards)
+        moved[changed] = engine.spawn_batch(moved[changed], self.rng)
+        self.boards = moved
+
+        rewards, terms = self.shaper.batch(boards, moved, scores)
+        dones = engine.is_game_over_batch(moved)
+        infos = [{} for _ in range(self.num_envs)]
+        if len(terms) > 1:
+            for i, info in enumerate(infos):
+                info["reward_terms"] = {k: v[i] for k, v in terms.items()}
+
+        done_idx = np.flatnonzero(dones)
+        if len(done_idx):
+            if self.encoder is None:
+                terminal = engine.unpack_batch(moved[done_idx])
+            else:
+                terminal = encode_boards(moved[done_idx], self.encoding)
+            for i, final in zip(done_idx, terminal):
+                infos[i]["terminal_observation"] = final
+                infos[i]["TimeLimit.truncated"] = False
+            self.boards[done_idx] = engine.new_board_batch(len(done_idx), self.rng)
+
+        if self.encoder is None:
+            obs = engine.unpack_batch(self.boards)
+        else:
+            obs = self.encoder.from_boards(self.boards)
+
+        return obs, rewards, dones, infos
+
+    def checkpoint(self):
+        """Boards and spawn RNG state; restore() replays every game exactly from here."""
+        return {"boards": self.boards.copy(), "rng": self.rng.bit_generator.state}
+
+    def restore(self, state):
+        self.boards = state["boards"].copy()
+        self.rng.bit_generator.state = state["rng"]
+
+    def close(self):
+        pass
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        # All games share this one object, so every index sees the same value
+        value = getattr(self, attr_name)
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "render":
+            return [self.render_board(i) for i in self._indices(indices)]
+        raise AttributeError(f"Batched2048VecEnv has no per-env method {method_name!r}")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
+
+    def render_board(self, index=0):
+        print(engine.unpack(int(self.boards[index])))
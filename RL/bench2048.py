@@ -0,0 +1,210 @@
+"""
+Self-play evaluation of 2048 strategies on the local engine. Run from RL/:
+
+    python -m bench2048 --games 1000 --strategies priority,cycle,random
+    python -m bench2048 --games 200 --strategies expectimax --budget-ms 0 --depth 2
+    python -m bench2048 --strategies ppo --out ppo.json
+
+Every strategy plays the same seeded games (game i spawns its tiles from
+np.random.default_rng(seed + i)), spread over a process pool. The report
+has the score distribution (the web game's score, the sum of merged
+tiles), the share of games reaching 2048/4096/8192, moves/sec and the
+per-move decision latency.
+
+--out writes the summary as JSON and --csv one row per game. Scores and
+tiles are reproducible, so diffing two result files shows strategy
+regressions; the timing fields show performance ones. Expectimax is only
+reproducible with --budget-ms 0 (fixed depth); a time budget depends on
+machine load.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+MAX_TILES = (2048, 4096, 8192)
+PERCENTILES = (10, 25, 50, 75, 90)
+# The trained model at the repo root, wherever this is run from
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ppo_2048_browser")
+
+_ppo = {}
+
+
+def _make_policy(name, seed, opts):
+    from policies_2048 import make_policy
+
+    if name == "ppo":
+        # Load the model once per worker, not once per game
+        key = (opts["model"], opts["encoding"])
+        if key not in _ppo:
+            _ppo[key] = make_policy("ppo", model_path=opts["model"], encoding=opts["encoding"])
+        return _ppo[key]
+    # The policy's own randomness gets a stream apart from the tile spawns
+    return make_policy(name, seed=(1, seed), budget_ms=opts["budget_ms"], depth=opts["depth"])
+
+
+def play_game(policy, seed, max_moves, max_stuck):
+    """
+    One game from seed. Returns the result row and the decision times (s).
+    A game ends when no move is left, after max_moves moves, or after
+    max_stuck decisions in a row that don't change the board.
+    """
+    import engine_2048 as engine
+
+    rng = np.random.default_rng(seed)
+    board = engine.new_board(rng)
+    score = moves = stuck = 0
+    latencies = []
+    start = time.perf_counter()
+    while moves < max_moves:
+        t = time.perf_counter()
+        action = policy(board)
+        latencies.append(time.perf_counter() - t)
+        if action is None:
+            break
+        moved, points = engine.move_with_score(board, action)
+        if moved == board:
+            stuck += 1
+            if stuck >= max_stuck:
+                break
+            continue
+        stuck = 0
+        board = engine.spawn_tile(moved, rng)
+        score += points
+        moves += 1
+        if engine.is_game_over(board):
+            break
+    row = {
+        "seed": seed,
+        "score": score,
+        "max_tile": 1 << engine.max_exponent(board),
+        "moves": moves,
+        "stuck": stuck >= max_stuck,
+        "seconds": time.perf_counter() - start,
+    }
+    return row, latencies
+
+
+def play_games(name, seeds, opts):
+    """Worker: play `seeds` with strategy `name`."""
+    rows, latencies = [], []
+    for seed in seeds:
+        row, lat = play_game(_make_policy(name, seed, opts), seed, opts["max_moves"], opts["max_stuck"])
+        rows.append(row)
+        latencies.extend(lat)
+    return rows, np.array(latencies, dtype=np.float64)
+
+
+def summarize(rows, latencies, wall):
+    scores = np.array([r["score"] for r in rows])
+    tiles = np.array([r["max_tile"] for r in rows])
+    moves = sum(r["moves"] for r in rows)
+    game_seconds = sum(r["seconds"] for r in rows)
+    return {
+        "games": len(rows),
+        "score": {
+            "mean": round(float(scores.mean()), 1),
+            "min": int(scores.min()),
+            "max": int(scores.max()),
+            **{f"p{p}": float(np.percentile(scores, p)) for p in PERCENTILES},
+        },
+        "max_tile_rate": {str(t): round(float((tiles >= t).mean()), 4) for t in MAX_TILES},
+        "max_tile_counts": {str(t): int(n) for t, n in zip(*np.unique(tiles, return_counts=True))},
+        "moves": {"total": moves, "mean": round(moves / len(rows), 1)},
+        "stuck_games": sum(r["stuck"] for r in rows),
+        "timing": {
+            "moves_per_sec": round(moves / game_seconds, 1) if game_seconds else None,
+            "moves_per_sec_all_workers": round(moves / wall, 1),
+            "decision_ms_mean": round(1000 * float(latencies.mean()), 4),
+            "decision_ms_p50": round(1000 * float(np.percentile(latencies, 50)), 4),
+            "decision_ms_p99": round(1000 * float(np.percentile(latencies, 99)), 4),
+        },
+    }
+
+
+def run(strategies, games, seed, workers, opts):
+    seeds = list(range(seed, seed + games))
+    # A few chunks per worker so slow games don't leave workers idle
+    chunk = max(1, games // (4 * workers))
+    chunks = [seeds[i:i + chunk] for i in range(0, games, chunk)]
+    results, game_rows = {}, []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name in strategies:
+            start = time.perf_counter()
+            parts = list(pool.map(play_games, [name] * len(chunks), chunks, [opts] * len(chunks)))
+            wall = time.perf_counter() - start
+            rows = [row for part, _ in parts for row in part]
+            latencies = np.concatenate([lat for _, lat in parts])
+            results[name] = summarize(rows, latencies, wall)
+            game_rows.extend({"strategy": name, **row} for row in rows)
+    return results, game_rows
+
+
+def print_report(results):
+    head = f"{'strategy':<12} {'games':>6} {'mean':>9} {'p50':>9} {'p90':>9}"
+    head += "".join(f" {'>=' + str(t):>7}" for t in MAX_TILES)
+    head += f" {'moves/s':>10} {'ms p50':>8} {'ms p99':>8}"
+    print(head)
+    for name, r in results.items():
+        line = f"{name:<12} {r['games']:>6} {r['score']['mean']:>9.0f} {r['score']['p50']:>9.0f} {r['score']['p90']:>9.0f}"
+        line += "".join(f" {r['max_tile_rate'][str(t)]:>7.1%}" for t in MAX_TILES)
+        t = r["timing"]
+        line += f" {t['moves_per_sec']:>10,.0f} {t['decision_ms_p50']:>8.3f} {t['decision_ms_p99']:>8.3f}"
+        print(line)
+
+
+def main(argv=None):
+    from policies_2048 import POLICIES
+
+    parser = argparse.ArgumentParser(prog="bench2048", description="Evaluate 2048 strategies by self-play.")
+    parser.add_argument("--strategies", default="priority,cycle,random",
+                        help=f"comma-separated, from {', '.join(POLICIES)}")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="game i uses seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-moves", type=int, default=100000)
+    parser.add_argument("--max-stuck", type=int, default=10,
+                        help="end a game after this many decisions in a row that change nothing")
+    parser.add_argument("--budget-ms", type=float, default=0.0,
+                        help="expectimax time per move; 0 searches to --depth")
+    parser.add_argument("--depth", type=int, default=2, help="expectimax search depth")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="saved PPO model for the ppo strategy")
+    parser.add_argument("--encoding", default="raw", help="observation encoding the PPO model was trained with")
+    parser.add_argument("--out", help="write the summary as JSON")
+    parser.add_argument("--csv", help="write one row per game as CSV")
+    args = parser.parse_args(argv)
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in strategies if s not in POLICIES]
+    if unknown:
+        parser.error(f"unknown strategies {unknown}")
+    opts = {
+        "max_moves": args.max_moves, "max_stuck": args.max_stuck, "budget_ms": args.budget_ms,
+        "depth": args.depth, "model": args.model, "encoding": args.encoding,
+    }
+
+    results, game_rows = run(strategies, args.games, args.seed, args.workers, opts)
+    print_report(results)
+
+    if args.out:
+        config = {"games": args.games, "seed": args.seed, "workers": args.workers, **opts}
+        with open(args.out, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            # No timing columns, so the file only changes when results do
+            writer = csv.DictWriter(f, fieldnames=["strategy", "seed", "score", "max_tile", "moves", "stuck"],
+                                    extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(game_rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
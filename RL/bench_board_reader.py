@@ -0,0 +1,71 @@
+"""
+Latency of one 2048 board read against the local page (local_pages/2048),
+per-tile scraping (before) vs one execute_script call (after), and a check
+that both readers agree on the board.
+
+    python bench_board_reader.py [reads]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from board_reader_2048 import read_board, read_state
+from local_pages import headless_chrome, page_url
+
+
+def scrape_board_per_tile(driver):
+    """The old reader: find_elements, then get_attribute per tile."""
+    board = np.zeros((4, 4), dtype=np.int32)
+    for tile in driver.find_elements(By.CLASS_NAME, "tile"):
+        value, row, col = 0, -1, -1
+        for cl in tile.get_attribute("class").split():
+            parts = cl.split("-")
+            if cl.startswith("tile-position-") and len(parts) == 4:
+                col, row = int(parts[2]) - 1, int(parts[3]) - 1
+            elif len(parts) == 2 and parts[0] == "tile" and parts[1].isdigit():
+                value = int(parts[1])
+        if 0 <= row < 4 and 0 <= col < 4:
+            board[row, col] = max(board[row, col], value)
+    return board
+
+
+def time_reads(reader, driver, reads):
+    samples = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        reader(driver)
+        samples.append(1000 * (time.perf_counter() - start))
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(f"{name:<22} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    driver = headless_chrome()
+    try:
+        driver.get(page_url("2048", "?seed=1"))
+        body = driver.find_element(By.TAG_NAME, "body")
+        # Fill the board up a bit so there are more tiles to scrape
+        for key in [Keys.ARROW_UP, Keys.ARROW_LEFT] * 15:
+            body.send_keys(key)
+        time.sleep(0.5)
+
+        state = read_state(driver)
+        assert (scrape_board_per_tile(driver) == state["board"]).all(), "readers disagree"
+        print(f"{np.count_nonzero(state['board'])} tiles, state source: {state['source']}")
+
+        report("per-tile scrape", time_reads(scrape_board_per_tile, driver, reads))
+        report("single execute_script", time_reads(read_board, driver, reads))
+    finally:
+        driver.quit()
@@ -0,0 +1,49 @@
+"""
+Scaling of the multi-browser pool: env steps/s for K = 1, 2, 4, ... up to
+the core count, each against its own headless Chrome on the local 2048
+page, and the speedup over K = 1.
+
+    python bench_browser_pool.py [seconds per K]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from browser_env_pool import make_browser_pool
+
+
+def bench(num_envs, seconds):
+    start = time.perf_counter()
+    env = make_browser_pool(num_envs, seed=0)
+    startup = time.perf_counter() - start
+    rng = np.random.default_rng(0)
+    try:
+        env.reset()
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            env.step(rng.integers(4, size=num_envs))
+            steps += num_envs
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+    return steps / elapsed, startup
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    cores = os.cpu_count() or 1
+    sizes = [1]
+    while sizes[-1] * 2 <= cores:
+        sizes.append(sizes[-1] * 2)
+    if sizes[-1] != cores:
+        sizes.append(cores)
+
+    base = None
+    print(f"{'K':>3} {'steps/s':>10} {'speedup':>8} {'efficiency':>10} {'startup':>9}")
+    for k in sizes:
+        rate, startup = bench(k, seconds)
+        base = base or rate
+        print(f"{k:>3} {rate:>10.1f} {rate / base:>8.2f} {rate / base / k:>10.0%} {startup:>8.1f}s")
@@ -0,0 +1,66 @@
+"""
+Single-core throughput of the bitboard engine and of Local2048Env.
+
+    python bench_engine.py
+"""
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+from local_2048_env import Local2048Env
+
+
+def bench_moves(n_boards=10000, repeats=20):
+    """Raw engine.move() calls per second over random mid-game boards."""
+    rng = np.random.default_rng(0)
+    boards = []
+    board = engine.new_board(rng)
+    while len(boards) < n_boards:
+        board = engine.spawn_tile(engine.move(board, int(rng.integers(4))), rng)
+        if engine.is_game_over(board):
+            board = engine.new_board(rng)
+        boards.append(board)
+    actions = rng.integers(4, size=n_boards).tolist()
+    pairs = list(zip(boards, actions))
+
+    move = engine.move
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for b, a in pairs:
+            move(b, a)
+    elapsed = time.perf_counter() - start
+    return n_boards * repeats / elapsed
+
+
+def bench_move_batch(n_boards=100000, repeats=20):
+    """engine.move_batch() over one uint64 array of boards, per board moved."""
+    rng = np.random.default_rng(0)
+    boards = np.array([engine.new_board(rng) for _ in range(n_boards)], dtype=np.uint64)
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        engine.move_batch(boards, i % 4)
+    elapsed = time.perf_counter() - start
+    return n_boards * repeats / elapsed
+
+
+def bench_env(n_steps=50000):
+    """Full Local2048Env.step() calls per second, random actions."""
+    env = Local2048Env()
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(4, size=n_steps).tolist()
+
+    start = time.perf_counter()
+    for a in actions:
+        _, _, terminated, _, _ = env.step(a)
+        if terminated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    return n_steps / elapsed
+
+
+if __name__ == "__main__":
+    print(f"engine.move:       {bench_moves():>12,.0f} moves/s")
+    print(f"engine.move_batch: {bench_move_batch():>12,.0f} moves/s")
+    print(f"Local2048Env.step: {bench_env():>12,.0f} steps/s")
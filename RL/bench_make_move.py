@@ -0,0 +1,82 @@
+"""
+Moves/sec of main_01.make_move against the local 2048 page: the old loop,
+which pressed up, left, right, down in turn and re-read the board after
+each key until one changed it, vs picking the move locally from one board
+read and sending only that key. Both play the same seeded games with the
+same up/left/right/down priority.
+
+    python bench_make_move.py [moves]
+"""
+import sys
+import time
+
+from selenium.webdriver.common.keys import Keys
+
+import engine_2048 as engine
+from board_reader_2048 import install_move_watch, read_board, restart_game, seed_game, wait_for_board, wait_for_move
+from local_pages import headless_chrome, page_url
+from policies_2048 import priority_policy
+
+ACTION_KEYS = [Keys.ARROW_UP, Keys.ARROW_DOWN, Keys.ARROW_LEFT, Keys.ARROW_RIGHT]
+PROBE_KEYS = [Keys.ARROW_UP, Keys.ARROW_LEFT, Keys.ARROW_RIGHT, Keys.ARROW_DOWN]
+
+
+def probe_move(driver, body, board):
+    """The old make_move: try each key until the board changes."""
+    for key in PROBE_KEYS:
+        before = read_board(driver)
+        body.send_keys(key)
+        state = wait_for_move(driver, before)
+        if (state["board"] != before).any():
+            return state
+    return state
+
+
+def fused_move(driver, body, board):
+    """The new make_move: one read (carried over from the last move), one key."""
+    action = priority_policy(engine.pack(board))
+    if action is None:
+        return {"board": board, "message": True}
+    body.send_keys(ACTION_KEYS[action])
+    return wait_for_move(driver)
+
+
+def new_game(driver, seed):
+    seed_game(driver, seed)
+    restart_game(driver)
+    return wait_for_board(driver)["board"]
+
+
+def run(make_move, moves):
+    driver = headless_chrome()
+    try:
+        driver.get(page_url("2048"))
+        wait_for_board(driver)
+        install_move_watch(driver)
+        body = driver.find_element("tag name", "body")
+        # Count the keys each version sends
+        send_keys, sent = body.send_keys, [0]
+
+        def counting_send_keys(*keys):
+            sent[0] += 1
+            send_keys(*keys)
+        body.send_keys = counting_send_keys
+        seed = 0
+        board = new_game(driver, seed)
+        start = time.perf_counter()
+        for _ in range(moves):
+            state = make_move(driver, body, board)
+            board = state["board"]
+            if state["message"]:
+                seed += 1
+                board = new_game(driver, seed)
+        return moves / (time.perf_counter() - start), sent[0] / moves, seed
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for name, make_move in (("probe", probe_move), ("fused", fused_move)):
+        rate, keys, games = run(make_move, moves)
+        print(f"{name}: {moves} moves over {games + 1} games, {rate:.1f} moves/s, {keys:.2f} keys/move")
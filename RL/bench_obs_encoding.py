@@ -0,0 +1,112 @@
+"""
+Raw tile values vs the log2 encodings of obs_encoding_2048: cost per
+encode, Batched2048VecEnv step rate, and optionally a short PPO learning
+curve for each encoding.
+
+    python bench_obs_encoding.py              # encode cost and step rate
+    python bench_obs_encoding.py --learn 200000
+
+The learning curve trains PPO on Batched2048VecEnv(num_envs=64) and, after
+every chunk, plays 256 games with the stochastic policy and reports the
+mean max tile.
+"""
+import sys
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+from batched_2048_vec_env import Batched2048VecEnv
+from obs_encoding_2048 import Log2Encoder
+
+
+def per_call_us(fn, arg, seconds=0.5):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            fn(arg)
+        calls += 100
+    return 1e6 * (time.perf_counter() - start) / calls
+
+
+def encode_cost():
+    rng = np.random.default_rng(0)
+    boards = engine.new_board_batch(1024, rng)
+    for _ in range(50):
+        boards = engine.spawn_batch(engine.move_batch(boards, int(rng.integers(4))), rng)
+    grid = engine.unpack(int(boards[0]))
+    grids = engine.unpack_batch(boards)
+
+    print(f"{'single board':<14} {'from grid':>10} {'from board':>11}")
+    print(f"{'raw':<14} {per_call_us(engine.unpack, int(boards[0])):>8.2f}us {'':>11}  (unpack)")
+    for encoding in ("exponent", "onehot"):
+        enc = Log2Encoder(encoding)
+        print(f"{encoding:<14} {per_call_us(enc.from_grids, grid):>8.2f}us"
+              f" {per_call_us(enc.from_boards, int(boards[0])):>9.2f}us")
+
+    print(f"\n{'1024 boards':<14} {'from grid':>10} {'from board':>11}")
+    print(f"{'raw':<14} {'':>10} {per_call_us(engine.unpack_batch, boards):>9.2f}us  (unpack_batch)")
+    for encoding in ("exponent", "onehot"):
+        enc = Log2Encoder(encoding, len(boards))
+        print(f"{encoding:<14} {per_call_us(enc.from_grids, grids):>8.2f}us"
+              f" {per_call_us(enc.from_boards, boards):>9.2f}us")
+
+
+def step_rate(encoding, num_envs=1024, seconds=2.0):
+    env = Batched2048VecEnv(num_envs=num_envs, seed=0, encoding=encoding)
+    env.reset()
+    actions = np.random.default_rng(0).integers(4, size=(64, num_envs))
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for a in actions:
+            env.step(a)
+        steps += len(actions)
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+def evaluate(model, encoding, games=256, max_steps=2000):
+    env = Batched2048VecEnv(num_envs=games, seed=123, encoding=encoding)
+    obs = env.reset()
+    final = np.zeros(games, dtype=np.uint64)
+    finished = np.zeros(games, dtype=bool)
+    for _ in range(max_steps):
+        actions, _ = model.predict(obs, deterministic=False)
+        before = env.boards.copy()
+        obs, _, dones, _ = env.step(actions)
+        newly = dones & ~finished
+        final[newly] = before[newly]
+        finished |= dones
+        if finished.all():
+            break
+    final[~finished] = env.boards[~finished]
+    return np.mean([1 << engine.max_exponent(int(b)) for b in final])
+
+
+def learning_curve(encoding, timesteps, chunks=5):
+    from stable_baselines3 import PPO
+
+    env = Batched2048VecEnv(num_envs=64, seed=0, encoding=encoding)
+    model = PPO("MlpPolicy", env, seed=0, verbose=0)
+    curve = []
+    start = time.perf_counter()
+    for _ in range(chunks):
+        model.learn(total_timesteps=timesteps // chunks, reset_num_timesteps=False)
+        curve.append(evaluate(model, encoding))
+    return curve, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    encode_cost()
+
+    print("\nBatched2048VecEnv(num_envs=1024) steps/s")
+    for encoding in ("raw", "exponent", "onehot"):
+        print(f"{encoding:<14} {step_rate(encoding):>12,.0f}")
+
+    if "--learn" in sys.argv:
+        timesteps = int(sys.argv[sys.argv.index("--learn") + 1])
+        print(f"\nPPO, mean max tile of 256 games after each {timesteps // 5} steps")
+        for encoding in ("raw", "exponent", "onehot"):
+            curve, elapsed = learning_curve(encoding, timesteps)
+            print(f"{encoding:<14} " + " ".join(f"{v:7.1f}" for v in curve) + f"   ({elapsed:.0f}s)")
@@ -0,0 +1,89 @@
+"""
+Latency and throughput of PPO action predictions for 1, 8 and 64
+concurrent game loops (threads), each calling model.predict() on its own
+observation (before) vs sharing one batching PolicyServer (after).
+
+    python bench_policy_server.py [seconds per run] [--socket]
+
+--socket runs the clients over PolicyServer.listen() / PolicyClient
+instead of the in-process queue. Serves ppo_2048_browser.zip from the repo
+root.
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+from stable_baselines3 import PPO
+
+import engine_2048 as engine
+from policy_server import PolicyClient, PolicyServer
+
+MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ppo_2048_browser")
+CLIENTS = (1, 8, 64)
+
+
+def observations(n=256):
+    rng = np.random.default_rng(0)
+    boards = engine.new_board_batch(n, rng)
+    for _ in range(60):
+        boards = engine.spawn_batch(engine.move_batch(boards, int(rng.integers(4))), rng)
+    return engine.unpack_batch(boards)
+
+
+def run(make_predict, clients, seconds, obs):
+    """Each client thread predicts in a loop; returns latencies (ms) and predictions/s."""
+    latencies = [[] for _ in range(clients)]
+    stop = threading.Event()
+
+    def loop(i):
+        predict = make_predict()
+        k = i
+        while not stop.is_set():
+            start = time.perf_counter()
+            predict(obs[k % len(obs)])
+            latencies[i].append(1000 * (time.perf_counter() - start))
+            k += clients
+
+    threads = [threading.Thread(target=loop, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    samples = sorted(x for lat in latencies for x in lat)
+    return samples, len(samples) / elapsed
+
+
+def report(name, clients, samples, rate, extra=""):
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(f"{name:<26} {clients:>3} clients  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  {rate:>9,.0f} pred/s {extra}")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1][0].isdigit() else 3.0
+    use_socket = "--socket" in sys.argv
+    model = PPO.load(MODEL)
+    obs = observations()
+
+    for clients in CLIENTS:
+        samples, rate = run(lambda: (lambda o: model.predict(o, deterministic=True)), clients, seconds, obs)
+        report("model.predict per loop", clients, samples, rate)
+
+        for max_latency in (0.0, 0.002):
+            server = PolicyServer(model=model, max_latency=max_latency).start()
+            if use_socket:
+                address = server.listen(("localhost", 0))
+                make_predict = lambda: PolicyClient(address).predict
+            else:
+                make_predict = lambda: server.predict
+            samples, rate = run(make_predict, clients, seconds, obs)
+            server.close()
+            name = f"PolicyServer({max_latency * 1000:g} ms{', socket' if use_socket else ''})"
+            report(name, clients, samples, rate, f"avg batch {server.stats()['avg_batch']:.1f}")
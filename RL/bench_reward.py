@@ -0,0 +1,49 @@
+"""
+Cost of computing the step reward: the original full-board reduction
+(np.sum of the (4, 4) grid) vs the table-based terms of reward_2048, for
+one board and for a batch.
+
+    python bench_reward.py
+"""
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+from reward_2048 import RewardShaper, tile_sum_batch
+
+
+def per_call_us(fn, calls=20000):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return 1e6 * (time.perf_counter() - start) / calls
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    boards = engine.new_board_batch(1024, rng)
+    for _ in range(100):
+        boards = engine.spawn_batch(engine.move_batch(boards, int(rng.integers(4))), rng)
+    before = int(boards[0])
+    after, score = engine.move_with_score(before, engine.LEFT)
+    grid = engine.unpack(after)
+
+    print("one board, per step")
+    print(f"  np.sum(grid)                        {per_call_us(lambda: np.sum(grid)):6.2f} us")
+    print(f"  move()                              {per_call_us(lambda: engine.move(before, engine.LEFT)):6.2f} us")
+    print(f"  move_with_score()                   {per_call_us(lambda: engine.move_with_score(before, engine.LEFT)):6.2f} us")
+    for reward in ("tile_sum", "merge", "empty", "monotonicity",
+                   {"merge": 1.0, "empty": 10.0, "monotonicity": 1.0}):
+        shaper = RewardShaper(reward)
+        name = reward if isinstance(reward, str) else "merge+empty+monotonicity"
+        print(f"  RewardShaper({name:<24}) {per_call_us(lambda: shaper(before, after, score)):6.2f} us")
+
+    print("\n1024 boards, per step")
+    moved, scores = engine.move_with_score_batch(boards, engine.LEFT)
+    print(f"  unpack_batch().sum()                {per_call_us(lambda: engine.unpack_batch(moved).sum(axis=(1, 2)), 2000):6.1f} us")
+    print(f"  tile_sum_batch()                    {per_call_us(lambda: tile_sum_batch(moved), 2000):6.1f} us")
+    print(f"  move_batch()                        {per_call_us(lambda: engine.move_batch(boards, engine.LEFT), 2000):6.1f} us")
+    print(f"  move_with_score_batch()             {per_call_us(lambda: engine.move_with_score_batch(boards, engine.LEFT), 2000):6.1f} us")
+    shaper = RewardShaper({"merge": 1.0, "empty": 10.0, "monotonicity": 1.0})
+    print(f"  RewardShaper.batch(3 terms)         {per_call_us(lambda: shaper.batch(boards, moved, scores), 2000):6.1f} us")
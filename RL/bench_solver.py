@@ -0,0 +1,40 @@
+"""
+Plays games on the local engine with ExpectimaxSolver and prints the
+search statistics (nodes/s, cache hit rate, ms per move).
+
+    python bench_solver.py [games] [time budget in ms]
+"""
+import sys
+
+import numpy as np
+
+import engine_2048 as engine
+from solver_2048 import ExpectimaxSolver
+
+
+def play(solver, seed, max_moves=5000):
+    rng = np.random.default_rng(seed)
+    board = engine.new_board(rng)
+    moves = 0
+    while moves < max_moves:
+        action = solver.best_action(board)
+        if action is None:
+            break
+        board = engine.spawn_tile(engine.move(board, action), rng)
+        moves += 1
+    return 1 << engine.max_exponent(board), moves
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    solver = ExpectimaxSolver(time_budget=budget_ms / 1000)
+    for seed in range(games):
+        max_tile, moves = play(solver, seed)
+        print(f"game {seed}: max tile {max_tile} after {moves} moves")
+
+    stats = solver.stats()
+    print(f"nodes/s:        {stats['nodes_per_sec']:,.0f}")
+    print(f"cache hit rate: {stats['cache_hit_rate']:.1%}")
+    print(f"ms per move:    {stats['avg_move_ms']:.2f}")
@@ -0,0 +1,65 @@
+"""
+Tile spawn sampling throughput: engine.spawn_tile() one board at a time vs
+engine.spawn_batch() for a range of batch sizes, plus a check that a
+seeded env replays exactly after checkpoint()/restore().
+
+    python bench_spawn.py
+"""
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+from batched_2048_vec_env import Batched2048VecEnv
+from local_2048_env import Local2048Env
+
+
+def boards_for(n, rng):
+    boards = engine.new_board_batch(n, rng)
+    for _ in range(30):
+        boards = engine.spawn_batch(engine.move_batch(boards, int(rng.integers(4))), rng)
+    return boards
+
+
+def scalar_rate(boards, rng, seconds=1.0):
+    boards = boards.tolist()
+    spawned = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for b in boards:
+            engine.spawn_tile(b, rng)
+        spawned += len(boards)
+    return spawned / (time.perf_counter() - start)
+
+
+def batch_rate(boards, rng, seconds=1.0):
+    spawned = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        engine.spawn_batch(boards, rng)
+        spawned += len(boards)
+    return spawned / (time.perf_counter() - start)
+
+
+def replays(env, actions):
+    """Steps after a checkpoint, twice: both runs must match."""
+    state = env.checkpoint()
+    runs = []
+    for _ in range(2):
+        env.restore(state)
+        runs.append([np.array(env.step(a)[0]).copy() for a in actions])
+    return all((x == y).all() for x, y in zip(*runs))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"spawn_tile()          {scalar_rate(boards_for(1024, rng), rng):>14,.0f} spawns/s")
+    for n in (1, 64, 1024, 16384):
+        print(f"spawn_batch(N={n:<6}) {batch_rate(boards_for(n, rng), rng):>14,.0f} spawns/s")
+
+    local = Local2048Env()
+    local.reset(seed=1)
+    batched = Batched2048VecEnv(num_envs=256, seed=1)
+    batched.reset()
+    print("Local2048Env replays after restore():", replays(local, rng.integers(4, size=200)))
+    print("Batched2048VecEnv replays after restore():", replays(batched, rng.integers(4, size=(200, 256))))
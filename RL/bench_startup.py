@@ -0,0 +1,77 @@
+"""
+Startup costs of the RL entry points, each measured in a fresh interpreter:
+cumulative import time (-X importtime) of the main modules, wall time of
+the rl2048 CLI --help and --dry-run paths, and time to first step.
+
+    python bench_startup.py [--browser]
+
+--browser adds time to first step of Browser2048Env on the local page
+(needs Chrome).
+"""
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "engine_2048", "solver_2048", "local_2048_env", "browser_2048_env",
+    "batched_2048_vec_env", "rl2048", "stable_baselines3", "selenium.webdriver",
+]
+
+FIRST_STEP = {
+    "Local2048Env": (
+        "from local_2048_env import Local2048Env\n"
+        "env = Local2048Env(); env.reset(seed=0); env.step(0)\n"
+    ),
+    "Batched2048VecEnv(1024)": (
+        "from batched_2048_vec_env import Batched2048VecEnv\n"
+        "import numpy as np\n"
+        "env = Batched2048VecEnv(1024); env.reset(); env.step(np.zeros(1024, dtype=int))\n"
+    ),
+}
+
+BROWSER_FIRST_STEP = (
+    "from browser_2048_env import Browser2048Env\n"
+    "from local_pages import headless_chrome, page_url\n"
+    "env = Browser2048Env(url=page_url('2048'), driver=headless_chrome())\n"
+    "env.reset(); env.step(0); env.close()\n"
+)
+
+
+def run(args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + args, cwd=HERE, capture_output=True, text=True)
+    return time.perf_counter() - start, proc
+
+
+def import_time(module):
+    """Cumulative import time of `module` in seconds, from -X importtime."""
+    _, proc = run(["-X", "importtime", "-c", f"import {module}"])
+    for line in reversed(proc.stderr.splitlines()):
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    return float("nan")
+
+
+if __name__ == "__main__":
+    print("import time (cumulative)")
+    for module in MODULES:
+        print(f"  {module:<24} {1000 * import_time(module):8.1f} ms")
+
+    baseline, _ = run(["-c", "pass"])
+    print(f"CLI wall time (bare interpreter {1000 * baseline:.0f} ms)")
+    for args in (["--help"], ["play", "--dry-run"], ["train", "--env", "pool", "--dry-run"]):
+        elapsed, _ = run(["-m", "rl2048"] + args)
+        print(f"  rl2048 {' '.join(args):<30} {1000 * elapsed:8.1f} ms")
+
+    cases = dict(FIRST_STEP)
+    if "--browser" in sys.argv:
+        cases["Browser2048Env (local page)"] = BROWSER_FIRST_STEP
+    print("time to first step, including interpreter start")
+    for name, code in cases.items():
+        elapsed, proc = run(["-c", code])
+        status = "" if proc.returncode == 0 else "  (failed)"
+        print(f"  {name:<28} {1000 * elapsed:8.1f} ms{status}")
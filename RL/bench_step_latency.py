@@ -0,0 +1,60 @@
+"""
+Per-step wall time of Browser2048Env against the local 2048 page, with the
+old fixed 0.1 s sleep after every key vs waiting for the page's own
+"move finished" signal. Prints a latency histogram for each, plus the
+mean in-page reset time (it used to be a reload and a 2 s sleep).
+
+    python bench_step_latency.py [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+from browser_2048_env import Browser2048Env
+from local_pages import headless_chrome, page_url
+
+BUCKETS_MS = [10, 20, 40, 60, 80, 100, 120, 150, 200, 300, 500, 1000]
+
+
+def histogram(samples_ms):
+    counts = np.histogram(samples_ms, bins=[0] + BUCKETS_MS + [np.inf])[0]
+    lines = []
+    lo = 0
+    for hi, count in zip(BUCKETS_MS + [float("inf")], counts):
+        bar = "#" * int(round(50 * count / max(1, len(samples_ms))))
+        lines.append(f"  {lo:>5}-{hi:<5} ms {count:>6}  {bar}")
+        lo = hi
+    return "\n".join(lines)
+
+
+def run(step_wait, steps):
+    env = Browser2048Env(url=page_url("2048", "?seed=1"), driver=headless_chrome(), step_wait=step_wait)
+    rng = np.random.default_rng(0)
+    step_ms = []
+    reset_ms = []
+    try:
+        start = time.perf_counter()
+        env.reset()
+        reset_ms.append(1000 * (time.perf_counter() - start))
+        for action in rng.integers(4, size=steps):
+            start = time.perf_counter()
+            _, _, terminated, _, _ = env.step(int(action))
+            step_ms.append(1000 * (time.perf_counter() - start))
+            if terminated:
+                start = time.perf_counter()
+                env.reset()
+                reset_ms.append(1000 * (time.perf_counter() - start))
+    finally:
+        env.close()
+    return np.array(step_ms), np.array(reset_ms)
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    for step_wait in ("sleep", "event"):
+        step_ms, reset_ms = run(step_wait, steps)
+        print(f"step_wait={step_wait!r}: {len(step_ms)} steps, "
+              f"p50 {np.median(step_ms):.1f} ms, p99 {np.percentile(step_ms, 99):.1f} ms, "
+              f"{1000 / step_ms.mean():.1f} steps/s, reset {reset_ms.mean():.0f} ms")
+        print(histogram(step_ms))
@@ -0,0 +1,81 @@
+"""
+How much symmetry canonicalization shrinks the set of 2048 positions:
+unique boards vs unique canonical boards over recorded games, and the
+cost of canonicalizing.
+
+    python bench_symmetry.py [trajectory file]
+
+Without a file it records 1000 random-policy games first, in the format
+`python -m rl2048 play --record <file>` writes. A single strong game never
+repeats a position (the tile sum only grows), so the savings show up across
+many games, mostly in the opening where the same few positions recur.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+from symmetry_2048 import canonical, canonical_batch
+from trajectory_2048 import TERMINATED, TRUNCATED, TrajectoryReader, TrajectoryWriter
+
+
+def record_games(path, games=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    with TrajectoryWriter(path) as writer:
+        for _ in range(games):
+            board = engine.new_board(rng)
+            while True:
+                legal = engine.legal_actions(board)
+                if not legal:
+                    break
+                action = legal[rng.integers(len(legal))]
+                board_after = engine.spawn_tile(engine.move(board, action), rng)
+                writer.add(board, action, engine.is_game_over(board_after))
+                board = board_after
+
+
+def move_numbers(flags):
+    """Index of every transition within its game."""
+    ends = np.flatnonzero(flags & (TERMINATED | TRUNCATED))
+    starts = np.zeros(len(flags), dtype=np.int64)
+    starts[ends[:-1] + 1] = ends[:-1] + 1
+    return np.arange(len(flags)) - np.maximum.accumulate(starts)
+
+
+def report(name, boards, reps):
+    raw, canon = len(np.unique(boards)), len(np.unique(reps))
+    print(f"{name:<18} {len(boards):>9} {raw:>9} {canon:>9} {raw / canon:>7.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "random.traj")
+        print("recording random games...")
+        record_games(path)
+
+    reader = TrajectoryReader(path)
+    boards = np.array(reader.records["board"])
+    reps, _ = canonical_batch(boards)
+    moves = move_numbers(np.array(reader.records["flags"]))
+    print(f"{len(boards)} transitions in {reader.episodes()} games")
+    print(f"{'':<18} {'boards':>9} {'unique':>9} {'canonical':>9} {'saving':>8}")
+    report("all moves", boards, reps)
+    for lo, hi in ((0, 10), (10, 50), (50, 200)):
+        sel = (moves >= lo) & (moves < hi)
+        if sel.any():
+            report(f"moves {lo}-{hi - 1}", boards[sel], reps[sel])
+
+    sample = boards[:10000].tolist()
+    start = time.perf_counter()
+    for b in sample:
+        canonical(b)
+    scalar = len(sample) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    canonical_batch(boards)
+    batch = len(boards) / (time.perf_counter() - start)
+    print(f"canonical() {scalar:,.0f} boards/s, canonical_batch() {batch:,.0f} boards/s")
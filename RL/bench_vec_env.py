@@ -0,0 +1,33 @@
+"""
+Env steps per second of Batched2048VecEnv for a range of batch sizes.
+One VecEnv.step() advances every game, so steps/s counts boards moved.
+
+    python bench_vec_env.py
+"""
+import time
+
+import numpy as np
+
+from batched_2048_vec_env import Batched2048VecEnv
+
+
+def bench(num_envs, seconds=2.0):
+    env = Batched2048VecEnv(num_envs=num_envs, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(4, size=(64, num_envs))
+
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for a in actions:
+            env.step(a)
+        steps += len(actions)
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps * num_envs / elapsed
+
+
+if __name__ == "__main__":
+    for n in (1, 64, 1024, 16384):
+        print(f"N={n:>6}: {bench(n):>12,.0f} env steps/s")
@@ -0,0 +1,215 @@
+"""
+Reads the whole 2048 board from a Selenium driver in one execute_script call.
+
+Scraping tile by tile costs one WebDriver round trip for find_elements and
+one more per tile for get_attribute("class"), so 17+ HTTP calls per board.
+READ_STATE_JS gathers everything in the page and returns it in one go:
+
+  1. the game's own state, which the 2048 page serializes to
+     localStorage["gameState"] after every move (exact, and already
+     up to date while the tiles are still animating), or
+  2. the tile classes under .tile-container when there is no saved state
+     (e.g. right after game over, when the game clears it).
+
+It also knows when a move has finished: install_move_watch() puts a
+MutationObserver on the tile container once, and wait_for_move() resolves
+as soon as the tiles have settled (or right away if the key changed
+nothing), instead of sleeping a fixed time after every key.
+
+Shared by Browser2048Env, main_01.py and Simple2048Bot.
+"""
+import time
+
+import numpy as np
+
+READ_STATE_JS = """
+var size = 4;
+var cells = [];
+for (var i = 0; i < size * size; i++) cells.push(0);
+var score = null, over = null, won = null, source = "dom";
+
+var state = null;
+try { state = JSON.parse(window.localStorage.getItem("gameState")); } catch (e) {}
+
+if (state && state.grid && state.grid.cells) {
+  source = "state";
+  state.grid.cells.forEach(function (column, x) {
+    column.forEach(function (tile, y) {
+      if (tile) cells[y * size + x] = tile.value;
+    });
+  });
+  score = state.score;
+  over = state.over;
+  won = state.won && !state.keepPlaying;
+} else {
+  // Tile classes look like "tile tile-4 tile-position-2-1 tile-merged",
+  // with the position given as <col>-<row>, both 1-based
+  var tiles = document.querySelectorAll(".tile-container .tile");
+  for (var t = 0; t < tiles.length; t++) {
+    var cls = tiles[t].className;
+    var value = /(?:^|\\s)tile-(\\d+)(?:\\s|$)/.exec(cls);
+    var pos = /tile-position-(\\d+)-(\\d+)/.exec(cls);
+    if (!value || !pos) continue;
+    var idx = (parseInt(pos[2], 10) - 1) * size + (parseInt(pos[1], 10) - 1);
+    if (idx >= 0 && idx < size * size) cells[idx] = Math.max(cells[idx], parseInt(value[1], 10));
+  }
+  var scoreElem = document.querySelector(".score-container");
+  if (scoreElem) score = parseInt(scoreElem.textContent, 10) || 0;
+}
+
+var message = document.querySelector(".game-message");
+var shown = !!message && window.getComputedStyle(message).display !== "none";
+if (over === null) over = shown && message.classList.contains("game-over");
+if (won === null) won = shown && message.classList.contains("game-won");
+
+return {cells: cells, score: score, over: over, won: won, message: shown, source: source};
+"""
+
+
+INSTALL_WATCH_JS = """
+if (window.__moveWatch) return true;
+var container = document.querySelector(".tile-container");
+if (!container || !window.MutationObserver) return false;
+var watch = {container: container, count: 0, mark: 0, last: performance.now()};
+new MutationObserver(function () {
+  watch.count++;
+  watch.last = performance.now();
+}).observe(container, {childList: true, subtree: true, attributes: true, attributeFilter: ["class"]});
+window.__moveWatch = watch;
+return true;
+"""
+
+# Resolves with the board state once the tile container has changed since
+# the last call and then gone quiet: no mutation for one frame and no tile
+# transition still running. The tile pop/appear animations are cosmetic
+# and don't hold it up. If nothing changes within noop_ms the key was a
+# no-op. Returns null when the watch isn't installed.
+WAIT_MOVE_JS = """
+var done = arguments[arguments.length - 1];
+var timeoutMs = arguments[0], noopMs = arguments[1], quietMs = arguments[2];
+var watch = window.__moveWatch;
+if (!watch) { done(null); return; }
+var readState = function () {
+""" + READ_STATE_JS + """
+};
+var start = performance.now();
+function sliding() {
+  if (!document.getAnimations || !window.CSSTransition) return false;
+  return document.getAnimations().some(function (a) {
+    return a instanceof CSSTransition && a.playState === "running" &&
+      a.effect && a.effect.target && watch.container.contains(a.effect.target);
+  });
+}
+function check() {
+  var now = performance.now();
+  var moved = watch.count !== watch.mark;
+  var status = null;
+  if (moved && now - watch.last >= quietMs && !sliding()) status = "settled";
+  else if (!moved && now - start >= noopMs) status = "noop";
+  else if (now - start >= timeoutMs) status = "timeout";
+  if (!status) { setTimeout(check, 4); return; }
+  watch.mark = watch.count;
+  var state = readState();
+  state.wait = status;
+  state.waited_ms = now - start;
+  done(state);
+}
+check();
+"""
+
+# Only the local page (local_pages/2048) has the reseed hook
+SEED_JS = """
+if (typeof window.__seed2048 !== "function") return false;
+window.__seed2048(arguments[0]);
+return true;
+"""
+
+RESTART_JS = """
+var button = document.querySelector(".restart-button") || document.querySelector(".retry-button");
+if (!button) return false;
+button.click();
+return true;
+"""
+
+
+def _with_board(state):
+    state["board"] = np.array(state.pop("cells"), dtype=np.int32).reshape(4, 4)
+    return state
+
+
+def read_state(driver):
+    """
+    Board and game status in one round trip. Returns a dict with
+    "board" ((4, 4) int32 tile values), "score", "over", "won",
+    "message" (the game-message overlay is displayed) and "source"
+    ("state" or "dom").
+    """
+    return _with_board(driver.execute_script(READ_STATE_JS))
+
+
+def read_board(driver):
+    """The (4, 4) int32 grid of tile values, in one round trip."""
+    return read_state(driver)["board"]
+
+
+def install_move_watch(driver):
+    """
+    Install the tile-container observer used by wait_for_move(). Survives
+    in-page restarts; call again after a reload. False if the page has no
+    tile container.
+    """
+    return driver.execute_script(INSTALL_WATCH_JS)
+
+
+def wait_for_move(driver, before=None, timeout=1.0, noop_after=0.05, quiet=0.016):
+    """
+    Wait for the move triggered by the last key to finish and return
+    read_state() of the result, plus "wait" ("settled", "noop", "timeout"
+    or "poll") and "waited_ms".
+
+    Without an installed watch this falls back to polling read_state()
+    every 10 ms until the board differs from `before`, or the timeout.
+    """
+    state = driver.execute_async_script(WAIT_MOVE_JS, 1000 * timeout, 1000 * noop_after, 1000 * quiet)
+    if state is not None:
+        return _with_board(state)
+
+    start = time.perf_counter()
+    while True:
+        state = read_state(driver)
+        waited = time.perf_counter() - start
+        if before is not None and (state["board"] != before).any():
+            state["wait"] = "poll"
+            break
+        if waited >= (timeout if before is not None else noop_after):
+            state["wait"] = "timeout"
+            break
+        time.sleep(0.01)
+    state["waited_ms"] = 1000 * waited
+    return state
+
+
+def seed_game(driver, seed):
+    """
+    Seed the page's tile spawns for the next game. False on pages that
+    can't be seeded (anything but the local copy), whose spawns stay random.
+    """
+    return driver.execute_script(SEED_JS, int(seed) & 0xFFFFFFFF)
+
+
+def restart_game(driver):
+    """
+    Start a new game in-page with the restart/retry button. Returns False
+    if the page has neither, so the caller can reload instead.
+    """
+    return driver.execute_script(RESTART_JS)
+
+
+def wait_for_board(driver, timeout=10.0):
+    """Poll until the page shows its starting tiles, e.g. after a load."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        state = read_state(driver)
+        if state["board"].any() or time.perf_counter() > deadline:
+            return state
+        time.sleep(0.05)
@@ -1,24 +1,44 @@
 import gymnasium as gym
 import numpy as np
 import time
-from selenium import webdriver
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
+
+import engine_2048 as engine
+from board_reader_2048 import (
+    install_move_watch, read_state, restart_game, seed_game, wait_for_board, wait_for_move
+)
+from reward_2048 import RewardShaper
 
 class Browser2048Env(gym.Env):
     metadata = {"render_modes": ["human"]}
 
-    def __init__(self):
+    def __init__(self, url="https://2048.ninja", driver=None, step_wait="event", reward="tile_sum"):
+        """
+        :param url: the 2048 page, e.g. local_pages.page_url("2048")
+        :param driver: an existing WebDriver to use instead of a new Chrome.
+            Otherwise Chrome is only launched by the first reset(), so
+            building the env for its spaces costs nothing.
+        :param step_wait: "event" waits for the page to finish the move,
+            "sleep" is the old fixed 0.1 s sleep after every key
+        :param reward: reward term name or dict of weights, see reward_2048.
+            The default "tile_sum" is the original sum-of-tiles reward.
+        """
         super().__init__()
         self.action_space = gym.spaces.Discrete(4)
         self.observation_space = gym.spaces.Box(
             low=0, high=2048, shape=(4, 4), dtype=np.int32
         )
 
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://2048.ninja")
-        time.sleep(2)
-        self.body_elem = self.driver.find_element(By.TAG_NAME, "body")
+        self.url = url
+        self.step_wait = step_wait
+        self.driver = driver
+        self.body_elem = None
+        self._board = None
+        # Whether the last reset(seed=...) could seed the page's spawns
+        self.seeded = False
+        self.shaper = RewardShaper(reward)
+
+        # Selenium is only needed once we actually talk to a browser
+        from selenium.webdriver.common.keys import Keys
 
         self.ACTION_MAP = {
             0: Keys.ARROW_UP,
@@ -27,74 +47,85 @@ class Browser2048Env(gym.Env):
             3: Keys.ARROW_RIGHT
         }
 
+    def _ensure_page(self):
+        """Launch Chrome and load the game on first use."""
+        if self.body_elem is not None:
+            return
+        from selenium.webdriver.common.by import By
+
+        if self.driver is None:
+            from selenium import webdriver
+            self.driver = webdriver.Chrome()
+        self.driver.get(self.url)
+        self._board = wait_for_board(self.driver)["board"]
+        install_move_watch(self.driver)
+        self.body_elem = self.driver.find_element(By.TAG_NAME, "body")
+
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
-        # Reload the game to reset state
-        self.driver.refresh()
-        time.sleep(2)
-
-        obs = self._get_board()
+        self._ensure_page()
+        # Reproducible spawns on the local page; other sites ignore the seed
+        if seed is not None:
+            self.seeded = seed_game(self.driver, seed)
+
+        # Start a new game in-page; reload only if the page has no button for it
+        if restart_game(self.driver):
+            obs = wait_for_move(self.driver, timeout=2.0)["board"]
+        else:
+            # _ensure_page() loads the page again
+            self.body_elem = None
+            self._ensure_page()
+            obs = self._board
+        self._board = obs
         info = {}
         return obs, info
 
     def step(self, action):
+        self._ensure_page()
+        before = self._board
         self._perform_action(action)
-        new_board = self._get_board()
+        # Board and 'Game Over' status come back in one round trip
+        if self.step_wait == "sleep":
+            time.sleep(0.1)
+            state = read_state(self.driver)
+        else:
+            state = wait_for_move(self.driver, before=self._board)
+        new_board = state["board"]
+        self._board = new_board
 
         # If 'Game Over' is displayed, we treat it as "terminated"
-        game_over = self._is_game_over()
-        reward = self._calculate_reward(new_board)
+        game_over = state["message"]
+        reward, terms = self._calculate_reward(before, action, new_board)
 
         terminated = game_over
         truncated = False  # For 2048, we typically don't have a time-limit or forced cut
 
-        return new_board, reward, terminated, truncated, {}
+        return new_board, reward, terminated, truncated, {"reward_terms": terms}
 
     def _perform_action(self, action):
         if action in self.ACTION_MAP:
             self.body_elem.send_keys(self.ACTION_MAP[action])
-            time.sleep(0.1)
 
     def _get_board(self):
-        tiles = self.driver.find_elements(By.CLASS_NAME, "tile")
-        board = np.zeros((4, 4), dtype=int)
-
-        for tile in tiles:
-            class_str = tile.get_attribute("class")
-            classes = class_str.split()
-            value, row, col = 0, 0, 0
-
-            for cl in classes:
-                if cl.startswith("tile-") and "tile-position" not in cl:
-                    try:
-                        value = int(cl.split("-")[1])
-                    except ValueError:
-                        pass
-                if cl.startswith("tile-position-"):
-                    parts = cl.split("-")
-                    try:
-                        row, col = int(parts[1]) - 1, int(parts[2]) - 1
-                    except ValueError:
-                        pass
-
-            if 0 <= row < 4 and 0 <= col < 4:
-                board[row, col] = max(board[row, col], value)
-
-        return board
+        self._ensure_page()
+        return read_state(self.driver)["board"]
 
     def _is_game_over(self):
-        try:
-            game_message = self.driver.find_element(By.CLASS_NAME, "game-message")
-            return game_message.is_displayed()
-        except:
-            return False
+        self._ensure_page()
+        return read_state(self.driver)["message"]
 
-    def _calculate_reward(self, board):
-        # A simple (not necessarily optimal) reward: sum of tiles
-        return np.sum(board)
+    def _calculate_reward(self, before, action, board):
+        # The page plays the same rules as the engine, so the merge score
+        # comes from the engine's tables for the board the key was sent on
+        before, after = engine.pack(before), engine.pack(board)
+        score = engine.move_score(before, int(action)) if after != before else 0
+        return self.shaper(before, after, score)
 
     def render(self, mode="human"):
         print(self._get_board())
 
     def close(self):
-        self.driver.quit()
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+            self.body_elem = None
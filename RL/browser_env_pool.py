@@ -0,0 +1,88 @@
+"""
+A pool of K headless Chrome sessions playing the 2048 page, as a
+stable_baselines3 SubprocVecEnv, for when training has to run against the
+real web game instead of the local engine:
+
+    env = make_browser_pool(num_envs=4)
+    model = PPO("MlpPolicy", env)
+
+Every session lives in its own worker process, so they launch
+concurrently and step in parallel. A worker whose driver crashes or hangs
+relaunches Chrome and carries on (RestartOnCrash) instead of taking the
+training run down with it. Each step is bounded by step_timeout, so one
+slow tab delays the batch by at most that long.
+"""
+import gymnasium as gym
+from selenium.common.exceptions import WebDriverException
+
+from browser_2048_env import Browser2048Env
+from local_pages import headless_chrome, page_url
+
+
+class RestartOnCrash(gym.Wrapper):
+    """
+    Rebuilds the wrapped env with `make_env` whenever the WebDriver raises
+    (crashed Chrome, dead chromedriver, script timeout). A step that hits
+    a crash ends the episode as truncated, with info["driver_restarted"].
+    """
+
+    def __init__(self, make_env, max_restarts=100):
+        super().__init__(make_env())
+        self.make_env = make_env
+        self.max_restarts = max_restarts
+        self.restarts = 0
+
+    def _restart(self):
+        if self.restarts >= self.max_restarts:
+            raise RuntimeError(f"browser crashed {self.restarts} times, giving up")
+        try:
+            self.env.close()
+        except Exception:
+            pass  # the driver is most likely already gone
+        self.env = self.make_env()
+        self.restarts += 1
+
+    def reset(self, **kwargs):
+        try:
+            return self.env.reset(**kwargs)
+        except WebDriverException:
+            self._restart()
+            return self.env.reset(**kwargs)
+
+    def step(self, action):
+        try:
+            return self.env.step(action)
+        except WebDriverException:
+            self._restart()
+            # The fresh page already shows a new game
+            info = {"driver_restarted": True, "restarts": self.restarts}
+            return self.env.unwrapped._get_board(), 0.0, False, True, info
+
+
+def make_browser_env(url, step_timeout=5.0):
+    """A Browser2048Env on a new headless Chrome, with bounded script calls."""
+    driver = headless_chrome()
+    driver.set_script_timeout(step_timeout)
+    driver.set_page_load_timeout(30)
+    return Browser2048Env(url=url, driver=driver)
+
+
+def _env_fn(rank, seed, step_timeout):
+    def _init():
+        query = f"?seed={seed + rank}" if seed is not None else ""
+        url = page_url("2048", query)
+        return RestartOnCrash(lambda: make_browser_env(url, step_timeout))
+    return _init
+
+
+def make_browser_pool(num_envs, seed=None, step_timeout=5.0, start_method=None):
+    """
+    SubprocVecEnv of `num_envs` headless Chrome sessions on the local 2048
+    page (local_pages/2048). With a seed, worker i plays ?seed=<seed + i>.
+    """
+    from stable_baselines3.common.vec_env import SubprocVecEnv
+
+    return SubprocVecEnv(
+        [_env_fn(rank, seed, step_timeout) for rank in range(num_envs)],
+        start_method=start_method,
+    )
@@ -0,0 +1,402 @@
+"""
+Headless 2048 engine on a 64-bit bitboard.
+
+The 4x4 board is packed into one Python int: every cell is a 4-bit nibble
+holding log2 of the tile (0 = empty, 1 = 2, 2 = 4, ... 15 = 32768).
+Cell (row, col) lives at bit offset 4 * (4 * row + col), so row r is the
+16-bit value (board >> 16 * r) & 0xFFFF with column 0 in the low nibble.
+
+Moves never loop over cells. Every possible 16-bit row is slid once at
+import time into 65536-entry tables that store the XOR difference between
+the row before and after the move, so a move is four lookups and four
+XORs. Columns reuse the same tables after a bit-twiddled transpose.
+"""
+import numpy as np
+
+# Action ids, same order as Browser2048Env.ACTION_MAP
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+
+
+def _slide_rows_left(rows):
+    """
+    Slide every 16-bit row of an int array towards column 0 (the low
+    nibble), merging equal neighbours once. Returns the resulting rows and
+    the score of each slide (the sum of the merged tile values).
+    """
+    cells = np.stack([(rows >> (4 * i)) & 0xF for i in range(4)])
+    # Push the empty cells to the end, keeping the tiles in order
+    order = np.argsort(cells == 0, axis=0, kind="stable")
+    a, b, c, d = np.take_along_axis(cells, order, axis=0)
+    z = np.zeros_like(a)
+
+    def merged(x):
+        # 15 is the largest exponent a nibble can hold, so cap there
+        return np.minimum(x + 1, 15)
+
+    # After compaction a == b can only merge if a is a tile, and so on
+    ab = (a != 0) & (a == b)
+    bc = (b != 0) & (b == c)
+    cd = (c != 0) & (c == d)
+    out = np.select(
+        [ab & cd, ab, bc, cd],
+        [
+            np.stack([merged(a), merged(c), z, z]),
+            np.stack([merged(a), c, d, z]),
+            np.stack([a, merged(b), d, z]),
+            np.stack([a, b, merged(c), z]),
+        ],
+        default=np.stack([a, b, c, d]),
+    )
+    score = np.select(
+        [ab & cd, ab, bc, cd],
+        [(1 << merged(a)) + (1 << merged(c)), 1 << merged(a), 1 << merged(b), 1 << merged(c)],
+        default=0,
+    )
+    return out[0] | (out[1] << 4) | (out[2] << 8) | (out[3] << 12), score
+
+
+def _reverse_row(row):
+    return ((row >> 12) & 0xF) | ((row >> 4) & 0xF0) | ((row << 4) & 0xF00) | ((row << 12) & 0xF000)
+
+
+def _unpack_col(row):
+    """Spread the four nibbles of a row down one column of a board."""
+    return (row & 0xF) | ((row & 0xF0) << 12) | ((row & 0xF00) << 24) | ((row & 0xF000) << 36)
+
+
+def _build_tables():
+    rows = np.arange(65536, dtype=np.uint64)
+    slid, score_left = _slide_rows_left(rows)
+    left = rows ^ slid
+    slid, score_right = _slide_rows_left(_reverse_row(rows))
+    right = rows ^ _reverse_row(slid)
+    return (left.astype(np.uint16), right.astype(np.uint16), _unpack_col(left), _unpack_col(right),
+            score_left.astype(np.uint32), score_right.astype(np.uint32))
+
+
+# XOR deltas, as NumPy arrays for vectorised code...
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, SCORE_LEFT, SCORE_RIGHT = _build_tables()
+# ...and as plain lists, which are much faster to index from scalar code
+_ROW_LEFT = ROW_LEFT.tolist()
+_ROW_RIGHT = ROW_RIGHT.tolist()
+_COL_UP = COL_UP.tolist()
+_COL_DOWN = COL_DOWN.tolist()
+# Merge score of sliding a row left/right (a column up/down, once transposed)
+_SCORE_LEFT = SCORE_LEFT.tolist()
+_SCORE_RIGHT = SCORE_RIGHT.tolist()
+
+
+def transpose(board):
+    """Swap rows and columns of a packed board."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_cols(board, t):
+    # transpose() inlined: this is the hot path for UP and DOWN
+    a = (board & 0xF0F00F0FF0F00F0F) | ((board & 0x0000F0F00000F0F0) << 12) | ((board & 0x0F0F00000F0F0000) >> 12)
+    c = (a & 0xFF00FF0000FF00FF) | ((a & 0x00FF00FF00000000) >> 24) | ((a & 0x00000000FF00FF00) << 24)
+    return (board
+            ^ t[c & 0xFFFF]
+            ^ (t[(c >> 16) & 0xFFFF] << 4)
+            ^ (t[(c >> 32) & 0xFFFF] << 8)
+            ^ (t[c >> 48] << 12))
+
+
+def _move_rows(board, t):
+    return (board
+            ^ t[board & 0xFFFF]
+            ^ (t[(board >> 16) & 0xFFFF] << 16)
+            ^ (t[(board >> 32) & 0xFFFF] << 32)
+            ^ (t[board >> 48] << 48))
+
+
+def move_up(board):
+    return _move_cols(board, _COL_UP)
+
+
+def move_down(board):
+    return _move_cols(board, _COL_DOWN)
+
+
+def move_left(board):
+    return _move_rows(board, _ROW_LEFT)
+
+
+def move_right(board):
+    return _move_rows(board, _ROW_RIGHT)
+
+
+_MOVES = (move_up, move_down, move_left, move_right)
+_TABLES = (_COL_UP, _COL_DOWN, _ROW_LEFT, _ROW_RIGHT)
+
+
+def move(board, action):
+    """
+    Apply an action (UP/DOWN/LEFT/RIGHT) and return the new board.
+    No tile is spawned; an illegal move returns the board unchanged.
+    """
+    if action >= LEFT:
+        return _move_rows(board, _TABLES[action])
+    return _move_cols(board, _TABLES[action])
+
+
+_SCORE_TABLES = (_SCORE_LEFT, _SCORE_RIGHT, _SCORE_LEFT, _SCORE_RIGHT)
+
+
+def move_score(board, action):
+    """
+    Points the web game awards for `action`: the sum of the tiles it
+    merges. 0 for a move without merges, including an illegal one.
+    """
+    t = _SCORE_TABLES[action]
+    if action < LEFT:
+        board = transpose(board)
+    return t[board & 0xFFFF] + t[(board >> 16) & 0xFFFF] + t[(board >> 32) & 0xFFFF] + t[board >> 48]
+
+
+def move_with_score(board, action):
+    """
+    move() and move_score() in one pass: the four row (or column) indices
+    are computed once and used for both table lookups. Returns
+    (new board, merge score).
+    """
+    t = _TABLES[action]
+    s = _SCORE_TABLES[action]
+    if action >= LEFT:
+        r0, r1, r2, r3 = board & 0xFFFF, (board >> 16) & 0xFFFF, (board >> 32) & 0xFFFF, board >> 48
+        moved = board ^ t[r0] ^ (t[r1] << 16) ^ (t[r2] << 32) ^ (t[r3] << 48)
+    else:
+        c = transpose(board)
+        r0, r1, r2, r3 = c & 0xFFFF, (c >> 16) & 0xFFFF, (c >> 32) & 0xFFFF, c >> 48
+        moved = board ^ t[r0] ^ (t[r1] << 4) ^ (t[r2] << 8) ^ (t[r3] << 12)
+    return moved, s[r0] + s[r1] + s[r2] + s[r3]
+
+
+def _transpose_batch(boards):
+    """transpose() over a uint64 array of boards."""
+    a = ((boards & np.uint64(0xF0F00F0FF0F00F0F))
+         | ((boards & np.uint64(0x0000F0F00000F0F0)) << np.uint64(12))
+         | ((boards & np.uint64(0x0F0F00000F0F0000)) >> np.uint64(12)))
+    return ((a & np.uint64(0xFF00FF0000FF00FF))
+            | ((a & np.uint64(0x00FF00FF00000000)) >> np.uint64(24))
+            | ((a & np.uint64(0x00000000FF00FF00)) << np.uint64(24)))
+
+
+_SHIFTS = [np.uint64(s) for s in (0, 16, 32, 48)]
+_COL_SHIFTS = [np.uint64(s) for s in (0, 4, 8, 12)]
+_MASK16 = np.uint64(0xFFFF)
+_NP_TABLES = (COL_UP, COL_DOWN, ROW_LEFT.astype(np.uint64), ROW_RIGHT.astype(np.uint64))
+
+
+def move_batch(boards, action):
+    """
+    Vectorised move(): apply one action to every board of a uint64 array.
+    Returns a new array; no tiles are spawned.
+    """
+    table = _NP_TABLES[action]
+    if action >= LEFT:
+        src, out_shifts = boards, _SHIFTS
+    else:
+        src, out_shifts = _transpose_batch(boards), _COL_SHIFTS
+    result = boards.copy()
+    for s, o in zip(_SHIFTS, out_shifts):
+        result ^= table[(src >> s) & _MASK16] << o
+    return result
+
+
+_NP_SCORE_TABLES = (SCORE_LEFT, SCORE_RIGHT, SCORE_LEFT, SCORE_RIGHT)
+
+
+def move_score_batch(boards, actions):
+    """
+    Vectorised move_score() for a uint64 array of boards and a matching
+    array of actions. Returns int64 scores.
+    """
+    actions = np.asarray(actions)
+    rows = np.where(actions < LEFT, _transpose_batch(boards), boards)
+    score = np.zeros(len(boards), dtype=np.int64)
+    for action in ACTIONS:
+        sel = actions == action
+        if sel.any():
+            src = rows[sel]
+            table = _NP_SCORE_TABLES[action]
+            score[sel] = sum(table[(src >> s) & _MASK16].astype(np.int64) for s in _SHIFTS)
+    return score
+
+
+def move_with_score_batch(boards, action):
+    """Vectorised move_with_score(): (new boards, int64 merge scores)."""
+    table = _NP_TABLES[action]
+    scores = _NP_SCORE_TABLES[action]
+    if action >= LEFT:
+        src, out_shifts = boards, _SHIFTS
+    else:
+        src, out_shifts = _transpose_batch(boards), _COL_SHIFTS
+    result = boards.copy()
+    score = np.zeros(len(boards), dtype=np.int64)
+    for s, o in zip(_SHIFTS, out_shifts):
+        rows = (src >> s) & _MASK16
+        result ^= table[rows] << o
+        score += scores[rows]
+    return result, score
+
+
+_CELL_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+_NIBBLE = np.uint64(0xF)
+
+
+def exponents_batch(boards):
+    """(N, 16) uint8 exponents, row-major, for a uint64 array of boards."""
+    return ((boards[:, None] >> _CELL_SHIFTS) & _NIBBLE).astype(np.uint8)
+
+
+def unpack_batch(boards):
+    """Vectorised unpack(): (N, 4, 4) int32 tile values."""
+    exponents = exponents_batch(boards)
+    values = np.where(exponents > 0, np.left_shift(1, exponents, dtype=np.int32), 0)
+    return values.reshape(-1, 4, 4)
+
+
+def _spawn_tables():
+    rows = np.arange(65536)
+    # Bit i set when cell i of the row is empty
+    empty_mask = sum((((rows >> (4 * i)) & 0xF) == 0).astype(np.int64) << i for i in range(4))
+    bits = ((rows[:, None] >> np.arange(16)) & 1).astype(bool)
+    popcount = bits.sum(axis=1)
+    # Row m of kth_bit lists the set bits of m in order, so kth_bit[m, k]
+    # is the k-th empty cell of a board whose empty mask is m
+    kth_bit = np.argsort(~bits, axis=1, kind="stable")
+    return empty_mask.astype(np.int64), popcount.astype(np.int64), kth_bit.astype(np.uint64).ravel()
+
+
+ROW_EMPTY_MASK, POPCOUNT16, KTH_BIT = _spawn_tables()
+_ROW_EMPTY_MASK = ROW_EMPTY_MASK.tolist()
+_POPCOUNT16 = POPCOUNT16.tolist()
+_KTH_BIT = KTH_BIT.tolist()
+
+
+def empty_mask(board):
+    """16-bit mask of the empty cells, bit i for cell i (row-major)."""
+    t = _ROW_EMPTY_MASK
+    return t[board & 0xFFFF] | (t[(board >> 16) & 0xFFFF] << 4) | (t[(board >> 32) & 0xFFFF] << 8) | (t[board >> 48] << 12)
+
+
+def empty_mask_batch(boards):
+    t = ROW_EMPTY_MASK
+    return (t[boards & _MASK16] | (t[(boards >> _SHIFTS[1]) & _MASK16] << 4)
+            | (t[(boards >> _SHIFTS[2]) & _MASK16] << 8) | (t[boards >> _SHIFTS[3]] << 12))
+
+
+def spawn_batch(boards, rng):
+    """
+    Vectorised spawn_tile(): one random 2/4 on an empty cell of every board.
+    Full boards are returned unchanged. One uniform per board picks both:
+    its integer part (scaled by the number of empty cells) the cell, its
+    fractional part the value.
+    """
+    mask = empty_mask_batch(boards)
+    n_empty = POPCOUNT16[mask]
+    x = rng.random(len(boards)) * n_empty
+    k = x.astype(np.int64)
+    cell = KTH_BIT[mask * 16 + k]
+    exponent = np.where(x - k < 0.1, np.uint64(2), np.uint64(1))
+    spawned = np.where(n_empty > 0, exponent << (np.uint64(4) * cell), np.uint64(0))
+    return boards | spawned
+
+
+def new_board_batch(n, rng):
+    """n fresh games as a uint64 array."""
+    return spawn_batch(spawn_batch(np.zeros(n, dtype=np.uint64), rng), rng)
+
+
+def is_game_over_batch(boards):
+    """Vectorised is_game_over() over a uint64 array of boards."""
+    over = (exponents_batch(boards) != 0).all(axis=1)
+    full = np.flatnonzero(over)
+    if len(full):
+        stuck = np.ones(len(full), dtype=bool)
+        for action in ACTIONS:
+            stuck &= move_batch(boards[full], action) == boards[full]
+        over[full] = stuck
+    return over
+
+
+def count_empty(board):
+    """Number of empty cells on a packed board."""
+    # Fold every nibble into its low bit: 1 if the cell is occupied
+    x = board | (board >> 2)
+    x |= x >> 1
+    x &= 0x1111111111111111
+    return 16 - bin(x).count("1")
+
+
+def empty_cells(board):
+    """Indices (0..15, row-major) of the empty cells."""
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def max_exponent(board):
+    return max((board >> (4 * i)) & 0xF for i in range(16))
+
+
+def is_game_over(board):
+    """True when no action changes the board."""
+    if count_empty(board):
+        return False
+    return all(m(board) == board for m in _MOVES)
+
+
+def legal_actions(board):
+    return [a for a in ACTIONS if _MOVES[a](board) != board]
+
+
+def spawn_tile(board, rng):
+    """
+    Put a 2 (90%) or a 4 (10%) on a random empty cell, like the web game.
+    `rng` is a np.random.Generator. A full board is returned unchanged.
+    """
+    mask = empty_mask(board)
+    if not mask:
+        return board
+    cell = _KTH_BIT[mask * 16 + int(rng.integers(_POPCOUNT16[mask]))]
+    exponent = 2 if rng.random() < 0.1 else 1
+    return board | (exponent << (4 * cell))
+
+
+def new_board(rng):
+    """A fresh game: an empty board with two spawned tiles."""
+    return spawn_tile(spawn_tile(0, rng), rng)
+
+
+def pack(grid):
+    """
+    Pack a 4x4 grid of tile values (0, 2, 4, ...), as returned by
+    Browser2048Env._get_board, into a bitboard.
+    """
+    board = 0
+    for i, value in enumerate(np.asarray(grid).ravel()):
+        value = int(value)
+        if value:
+            board |= (value.bit_length() - 1) << (4 * i)
+    return board
+
+
+def unpack(board, out=None):
+    """Unpack a bitboard into a (4, 4) int32 grid of tile values."""
+    exponents = np.array([(board >> (4 * i)) & 0xF for i in range(16)], dtype=np.int32)
+    values = np.where(exponents > 0, np.left_shift(1, exponents), 0).astype(np.int32)
+    if out is None:
+        return values.reshape(4, 4)
+    out[...] = values.reshape(4, 4)
+    return out
@@ -0,0 +1,217 @@
+"""
+Recorded canvas frames of the browser bots (ChromeDinoBot, FlappyBirdBot),
+so their detectors can be replayed and timed without a browser:
+
+    with FrameWriter("runs/dino", capture.regions, keys=("jump",), labels=("game_over",)) as writer:
+        writer.add(time.perf_counter(), frame, keys=("jump",), labels=(0,))
+
+    reader = FrameReader("runs/dino")
+    for tick, frame in reader:            # frame: name -> (h, w) uint8 view
+        ...
+    results = replay(reader, {"see_obstacle": bot.see_obstacle})
+
+A store is a directory:
+
+    meta.json    the regions (name -> x, y, width, height), key and label names
+    ticks.bin    one record per tick: time (float64), the keys sent that
+                 tick as a bitmask over meta["keys"] (uint8), and float32
+                 labels, NaN where unknown
+    chunks.bin   offset, compressed size and frame count of each chunk
+    frames.bin   the frames, chunk_size ticks at a time, each chunk one
+                 zlib stream of (count, frame bytes) uint8
+
+Every frame is the regions' bytes back to back, like CanvasCapture reads
+them. The writer appends whole chunks; the reader np.memmaps the three
+.bin files and decompresses a chunk only when a frame in it is asked for,
+so opening a long recording costs nothing and replay holds one chunk in
+memory at a time.
+"""
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+
+CHUNK = np.dtype([("offset", "<u8"), ("size", "<u4"), ("count", "<u4")])
+
+
+def tick_dtype(labels):
+    return np.dtype([("t", "<f8"), ("keys", "u1"), ("labels", "<f4", (len(labels),))])
+
+
+def _split(regions, row):
+    frame, offset = {}, 0
+    for name, (x, y, w, h) in regions.items():
+        frame[name] = row[offset:offset + w * h].reshape(h, w)
+        offset += w * h
+    return frame
+
+
+class FrameWriter:
+    """
+    Appends ticks to a frame store, creating it if needed; an existing
+    store must have the same regions, keys and labels. Ticks reach the disk
+    a chunk at a time, on flush() and on close().
+    """
+
+    def __init__(self, path, regions, keys=(), labels=(), chunk_size=256, level=1):
+        if len(keys) > 8:
+            raise ValueError("at most 8 key names")
+        self.path = path
+        self.regions = {name: tuple(int(v) for v in r) for name, r in regions.items()}
+        self.keys = tuple(keys)
+        self.labels = tuple(labels)
+        self.level = level
+        meta = {"regions": self.regions, "keys": list(self.keys), "labels": list(self.labels)}
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                old = json.load(f)
+            old["regions"] = {name: tuple(r) for name, r in old["regions"].items()}
+            if old != meta:
+                raise ValueError(f"{path} holds frames of other regions, keys or labels")
+        else:
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+        self.frame_size = sum(w * h for _, _, w, h in self.regions.values())
+        self.frames = np.zeros((chunk_size, self.frame_size), dtype=np.uint8)
+        self.ticks = np.zeros(chunk_size, dtype=tick_dtype(self.labels))
+        self.pending = 0
+        self.written = 0
+        self.files = [open(os.path.join(path, name), "ab") for name in ("ticks.bin", "chunks.bin", "frames.bin")]
+
+    def add(self, t, frame, keys=(), labels=None):
+        """
+        Record one tick: its time in seconds, the frame (name -> array, as
+        from CanvasCapture.grab()), the names of the keys sent and the
+        labels (in the order given to the writer).
+        """
+        row = self.frames[self.pending]
+        offset = 0
+        for name, (x, y, w, h) in self.regions.items():
+            row[offset:offset + w * h] = np.asarray(frame[name], dtype=np.uint8).reshape(-1)
+            offset += w * h
+        mask = 0
+        for key in keys:
+            mask |= 1 << self.keys.index(key)
+        tick = self.ticks[self.pending]
+        tick["t"] = t
+        tick["keys"] = mask
+        tick["labels"] = np.nan if labels is None else labels
+        self.pending += 1
+        if self.pending == len(self.ticks):
+            self.flush()
+
+    def flush(self):
+        ticks, chunks, frames = self.files
+        if self.pending:
+            data = zlib.compress(self.frames[:self.pending].tobytes(), self.level)
+            chunk = np.zeros(1, dtype=CHUNK)
+            chunk[0] = (frames.tell(), len(data), self.pending)
+            frames.write(data)
+            chunks.write(chunk.tobytes())
+            ticks.write(self.ticks[:self.pending].tobytes())
+            self.written += self.pending
+            self.pending = 0
+        for f in (frames, chunks, ticks):
+            f.flush()
+
+    def close(self):
+        if not self.files[0].closed:
+            self.flush()
+            for f in self.files:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _memmap(path, dtype):
+    n = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+    if not n:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+
+
+class FrameReader:
+    """Memory-mapped view of a frame store. Call refresh() to see chunks written since."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.regions = {name: tuple(r) for name, r in meta["regions"].items()}
+        self.keys = tuple(meta["keys"])
+        self.labels = tuple(meta["labels"])
+        self.frame_size = sum(w * h for _, _, w, h in self.regions.values())
+        self.refresh()
+
+    def refresh(self):
+        self.chunks = _memmap(os.path.join(self.path, "chunks.bin"), CHUNK)
+        counts = self.chunks["count"].astype(np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(counts)))
+        # Only ticks whose chunk of frames is complete
+        self.ticks = _memmap(os.path.join(self.path, "ticks.bin"), tick_dtype(self.labels))[:self.starts[-1]]
+        self.data = _memmap(os.path.join(self.path, "frames.bin"), np.dtype(np.uint8))
+        self._cached = (None, None)
+        return len(self.ticks)
+
+    def __len__(self):
+        return len(self.ticks)
+
+    @property
+    def times(self):
+        return self.ticks["t"]
+
+    def pressed(self, key):
+        """Bool array: whether `key` was sent on each tick."""
+        return (self.ticks["keys"] & (1 << self.keys.index(key))) != 0
+
+    def label(self, name):
+        """float32 array of label `name` per tick, NaN where unknown."""
+        return self.ticks["labels"][:, self.labels.index(name)]
+
+    def chunk(self, c):
+        """Chunk c's frames as a (count, frame bytes) uint8 array."""
+        if self._cached[0] != c:
+            offset, size, count = (int(v) for v in self.chunks[c])
+            raw = zlib.decompress(self.data[offset:offset + size])
+            self._cached = (c, np.frombuffer(raw, dtype=np.uint8).reshape(count, self.frame_size))
+        return self._cached[1]
+
+    def frame(self, i):
+        """Tick i's frame: name -> (height, width) uint8 view."""
+        c = int(np.searchsorted(self.starts, i, side="right")) - 1
+        return _split(self.regions, self.chunk(c)[i - self.starts[c]])
+
+    def __iter__(self):
+        """(tick record, frame) for every tick, in order."""
+        for c in range(len(self.chunks)):
+            frames = self.chunk(c)
+            for j in range(len(frames)):
+                yield self.ticks[self.starts[c] + j], _split(self.regions, frames[j])
+
+
+def replay(reader, detectors):
+    """
+    Feed every recorded frame to each detector (name -> callable taking a
+    frame) as fast as it goes. Returns name -> (list of results, frames per
+    second); decompressing the chunks isn't counted.
+    """
+    results = {name: [] for name in detectors}
+    seconds = {name: 0.0 for name in detectors}
+    for c in range(len(reader.chunks)):
+        chunk = reader.chunk(c)
+        frames = [_split(reader.regions, row) for row in chunk]
+        for name, detect in detectors.items():
+            out = results[name]
+            start = time.perf_counter()
+            for frame in frames:
+                out.append(detect(frame))
+            seconds[name] += time.perf_counter() - start
+    return {name: (results[name], len(reader) / seconds[name] if seconds[name] else 0.0) for name in detectors}
@@ -0,0 +1,88 @@
+import gymnasium as gym
+import numpy as np
+
+import engine_2048 as engine
+from reward_2048 import RewardShaper
+
+
+class Local2048Env(gym.Env):
+    """
+    Drop-in replacement for Browser2048Env that plays 2048 in-process on the
+    bitboard engine instead of driving a Chrome tab. Spaces, ACTION_MAP
+    ordering and reward match the browser env, so a policy trained here can
+    be pointed at the real page later.
+
+    :param reward: reward term name or dict of weights, see reward_2048.
+        The default "tile_sum" is the browser env's original reward.
+    """
+    metadata = {"render_modes": ["human"]}
+
+    def __init__(self, reward="tile_sum"):
+        super().__init__()
+        self.action_space = gym.spaces.Discrete(4)
+        self.observation_space = gym.spaces.Box(
+            low=0, high=2048, shape=(4, 4), dtype=np.int32
+        )
+
+        self.ACTION_MAP = {
+            0: engine.UP,
+            1: engine.DOWN,
+            2: engine.LEFT,
+            3: engine.RIGHT
+        }
+
+        self.board = 0
+        self.shaper = RewardShaper(reward)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.board = engine.new_board(self.np_random)
+
+        obs = self._get_board()
+        info = {}
+        return obs, info
+
+    def step(self, action):
+        before = self.board
+        score = self._perform_action(action)
+        new_board = self._get_board()
+
+        game_over = engine.is_game_over(self.board)
+        reward, terms = self._calculate_reward(before, score)
+
+        terminated = game_over
+        truncated = False
+
+        return new_board, reward, terminated, truncated, {"reward_terms": terms}
+
+    def _perform_action(self, action):
+        """Play the action and return its merge score."""
+        action = int(action)
+        if action not in self.ACTION_MAP:
+            return 0
+        moved, score = engine.move_with_score(self.board, self.ACTION_MAP[action])
+        # Like the web game, a move that changes nothing spawns nothing
+        if moved != self.board:
+            self.board = engine.spawn_tile(moved, self.np_random)
+        return score
+
+    def checkpoint(self):
+        """Board and spawn RNG state; restore() replays the game exactly from here."""
+        return {"board": self.board, "rng": self.np_random.bit_generator.state}
+
+    def restore(self, state):
+        self.board = state["board"]
+        self.np_random.bit_generator.state = state["rng"]
+
+    def _get_board(self):
+        return engine.unpack(self.board)
+
+    def _calculate_reward(self, before, score):
+        # Same reward terms as Browser2048Env
+        return self.shaper(before, self.board, score)
+
+    def render(self, mode="human"):
+        print(self._get_board())
+
+    def close(self):
+        pass
@@ -0,0 +1,24 @@
+"""
+Helpers for running the bots against the local game copies in local_pages/,
+so benchmarks and tests don't depend on the live sites.
+"""
+from pathlib import Path
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "local_pages"
+
+
+def page_url(game, query=""):
+    """file:// URL of local_pages/<game>/index.html, e.g. page_url("2048", "?seed=1")."""
+    return (PAGES_DIR / game / "index.html").as_uri() + query
+
+
+def headless_chrome():
+    """A headless Chrome driver with the flags we need in containers and CI."""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=800,800")
+    return webdriver.Chrome(options=options)
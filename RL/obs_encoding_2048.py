@@ -0,0 +1,105 @@
+"""
+Log2 encodings of the 2048 board for the policy network.
+
+The envs observe raw tile values, a (4, 4) int32 grid where one cell can
+be 2 and its neighbour 2048, and the Box(0, 2048) space is wrong past the
+2048 tile. The encodings here use the tile exponent instead:
+
+    "exponent"  (4, 4) uint8, 0 for empty, 1 for 2, ... 15 for 32768
+    "onehot"    (16, 4, 4) float32, plane k is 1 where the exponent is k
+
+Log2Encoder writes them into buffers allocated once up front, so encoding
+a step allocates nothing. It takes either tile grids (Browser2048Env,
+Local2048Env observations) or packed uint64 boards (engine_2048), and
+works on one board or a batch.
+
+The output alternates between two buffers: an encoded observation stays
+valid until two more have been encoded. That is what SB3 needs (PPO holds
+on to the previous observation for one step, and DummyVecEnv keeps the
+terminal observation across the reset); copy it to keep it longer.
+"""
+import gymnasium as gym
+import numpy as np
+
+ENCODINGS = ("raw", "exponent", "onehot")
+PLANES = 16
+
+
+def observation_space(encoding):
+    if encoding == "raw":
+        return gym.spaces.Box(low=0, high=2048, shape=(4, 4), dtype=np.int32)
+    if encoding == "exponent":
+        return gym.spaces.Box(low=0, high=PLANES - 1, shape=(4, 4), dtype=np.uint8)
+    if encoding == "onehot":
+        return gym.spaces.Box(low=0, high=1, shape=(PLANES, 4, 4), dtype=np.float32)
+    raise ValueError(f"unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+
+
+class Log2Encoder:
+    """
+    Encodes one board (n=None) or a batch of n boards as "exponent" or
+    "onehot" into preallocated buffers.
+    """
+
+    def __init__(self, encoding="onehot", n=None):
+        if encoding not in ("exponent", "onehot"):
+            raise ValueError(f"Log2Encoder encodes 'exponent' or 'onehot', not {encoding!r}")
+        self.encoding = encoding
+        self.n = n
+        batch = (1,) if n is None else (n,)
+        self._exp = [np.zeros(batch + (16,), dtype=np.uint8) for _ in range(2)]
+        self._onehot = [np.zeros(batch + (PLANES, 16), dtype=np.float32) for _ in range(2)]
+        self._frac = np.zeros(batch + (16,), dtype=np.float64)
+        self._exp32 = np.zeros(batch + (16,), dtype=np.int32)
+        self._planes = np.arange(PLANES, dtype=np.uint8)[:, None]
+        self._slot = 0
+
+    def _output(self, exp):
+        out = self._onehot[self._slot] if self.encoding == "onehot" else exp
+        if self.encoding == "onehot":
+            np.equal(exp[:, None, :], self._planes, out=out, casting="unsafe")
+        self._slot ^= 1
+        shape = out.shape[1:-1] + (4, 4)
+        if self.n is not None:
+            shape = (self.n,) + shape
+        return out.reshape(shape)
+
+    def from_grids(self, grids):
+        """Encode tile values: a (4, 4) grid, or (n, 4, 4) for a batch."""
+        exp = self._exp[self._slot]
+        # frexp(2**k) == (0.5, k + 1) and frexp(0) == (0, 0)
+        np.frexp(np.asarray(grids).reshape(exp.shape), out=(self._frac, self._exp32))
+        np.subtract(self._exp32, 1, out=self._exp32)
+        np.maximum(self._exp32, 0, out=self._exp32)
+        np.copyto(exp, self._exp32, casting="unsafe")
+        return self._output(exp)
+
+    def from_boards(self, boards):
+        """Encode packed boards: one int, or a uint64 array of n boards."""
+        exp = self._exp[self._slot]
+        boards = np.asarray(boards, dtype="<u8").reshape(-1)
+        # Each byte of a little-endian board holds two cells, low nibble first
+        cells = boards.view(np.uint8).reshape(-1, 8)
+        np.bitwise_and(cells, 0xF, out=exp[:, 0::2])
+        np.right_shift(cells, 4, out=exp[:, 1::2])
+        return self._output(exp)
+
+
+def encode_boards(boards, encoding):
+    """Log2 encoding of a uint64 array of boards into a new array."""
+    return Log2Encoder(encoding, len(boards)).from_boards(boards).copy()
+
+
+class Log2Observation(gym.ObservationWrapper):
+    """
+    Observes a single 2048 env (Browser2048Env, Local2048Env) through a
+    Log2Encoder. For batches see Batched2048VecEnv(encoding=...).
+    """
+
+    def __init__(self, env, encoding="onehot"):
+        super().__init__(env)
+        self.encoder = Log2Encoder(encoding)
+        self.observation_space = observation_space(encoding)
+
+    def observation(self, observation):
+        return self.encoder.from_grids(observation)
@@ -1,17 +1,39 @@
 # play_trained.py
-from stable_baselines3 import PPO
 from browser_2048_env import Browser2048Env
+from solver_2048 import ExpectimaxSolver
 
-model = PPO.load("ppo_2048_browser")
+# Set to True to play with the expectimax solver instead of the PPO model
+USE_EXPECTIMAX = False
+# Set to the address of a running `python -m rl2048 serve` to share its
+# model with other bots instead of loading a copy here
+POLICY_SERVER = None  # e.g. ("localhost", 6048)
+
+if USE_EXPECTIMAX:
+    solver = ExpectimaxSolver(time_budget=0.005)
+elif POLICY_SERVER is not None:
+    from policy_server import PolicyClient
+    model = PolicyClient(POLICY_SERVER)
+else:
+    from stable_baselines3 import PPO
+    model = PPO.load("ppo_2048_browser")
 env = Browser2048Env()
 
-obs = env.reset()
+obs, info = env.reset()
 done = False
 
 while not done:
-    action, _ = model.predict(obs)
-    obs, reward, done, info = env.step(action)
+    if USE_EXPECTIMAX:
+        # Solver actions use the same ids as the env's ACTION_MAP
+        action = solver.best_grid_action(obs)
+    elif POLICY_SERVER is not None:
+        action = model.predict(obs)
+    else:
+        action, _ = model.predict(obs)
+    obs, reward, terminated, truncated, info = env.step(action)
+    done = terminated or truncated
     env.render()  # Print the board state
 
 print("Game Over!")
+if USE_EXPECTIMAX:
+    print(solver.stats())
 env.close()
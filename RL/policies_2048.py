@@ -0,0 +1,89 @@
+"""
+The 2048 bots' move rules as policies on packed boards (see engine_2048),
+so they can be played and measured on the local engine without a browser.
+
+A policy is a callable taking a packed board and returning an action
+(UP/DOWN/LEFT/RIGHT) or None when it has no move to offer. make_policy()
+builds one by name:
+
+    priority    main_01.make_move: the first of up, left, right, down that
+                changes the board
+    cycle       Simple2048Bot: up, right, down, left in turn, legal or not
+    random      a uniformly random legal move
+    expectimax  ExpectimaxSolver.best_action; budget_ms=0 searches to a
+                fixed depth, which makes games reproducible
+    ppo         a saved stable_baselines3 PPO model
+"""
+import numpy as np
+
+import engine_2048 as engine
+
+POLICIES = ("priority", "cycle", "random", "expectimax", "ppo")
+
+PRIORITY_ORDER = (engine.UP, engine.LEFT, engine.RIGHT, engine.DOWN)
+CYCLE_ORDER = (engine.UP, engine.RIGHT, engine.DOWN, engine.LEFT)
+
+
+def priority_policy(board, order=PRIORITY_ORDER):
+    """The first action in `order` that changes the board, else None."""
+    for action in order:
+        if engine.move(board, action) != board:
+            return action
+    return None
+
+
+class CyclePolicy:
+    """Presses the actions of `order` in turn without looking at the board."""
+
+    def __init__(self, order=CYCLE_ORDER):
+        self.order = order
+        self.index = 0
+
+    def __call__(self, board):
+        action = self.order[self.index]
+        self.index = (self.index + 1) % len(self.order)
+        return action
+
+
+class RandomPolicy:
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, board):
+        legal = engine.legal_actions(board)
+        if not legal:
+            return None
+        return legal[self.rng.integers(len(legal))]
+
+
+class PPOPolicy:
+    """A saved PPO model; `encoding` as it was trained with (obs_encoding_2048)."""
+
+    def __init__(self, model_path="ppo_2048_browser", encoding="raw", deterministic=True):
+        from stable_baselines3 import PPO
+
+        self.model = PPO.load(model_path, device="cpu")
+        self.deterministic = deterministic
+        self.encode = None
+        if encoding != "raw":
+            from obs_encoding_2048 import Log2Encoder
+            self.encode = Log2Encoder(encoding).from_boards
+
+    def __call__(self, board):
+        obs = engine.unpack(board) if self.encode is None else self.encode(board)
+        return int(self.model.predict(obs, deterministic=self.deterministic)[0])
+
+
+def make_policy(name, seed=None, budget_ms=5.0, depth=4, model_path="ppo_2048_browser", encoding="raw"):
+    if name == "priority":
+        return priority_policy
+    if name == "cycle":
+        return CyclePolicy()
+    if name == "random":
+        return RandomPolicy(seed)
+    if name == "expectimax":
+        from solver_2048 import ExpectimaxSolver
+        return ExpectimaxSolver(max_depth=depth, time_budget=budget_ms / 1000 or None).best_action
+    if name == "ppo":
+        return PPOPolicy(model_path, encoding)
+    raise ValueError(f"unknown policy {name!r}, expected one of {POLICIES}")
@@ -0,0 +1,283 @@
+"""
+One copy of a PPO model serving many game loops at once.
+
+Game loops hand their observation to the server and block until the
+action comes back. A worker thread gathers the pending observations into
+one batch and runs a single forward pass for all of them:
+
+    server = PolicyServer("ppo_2048_browser").start()
+    action = server.predict(obs)          # from any thread
+
+Loops in other processes (another bot script, the SubprocVecEnv browser
+pool) connect over a local socket instead:
+
+    server.listen(("localhost", 6048))    # in the serving process
+    client = PolicyClient(("localhost", 6048))
+    action = client.predict(obs)
+
+A batch is closed when it holds max_batch observations, when its oldest
+observation has waited max_latency seconds, or as soon as it holds every
+outstanding request: a loop blocked in predict() can't send another
+observation, so waiting for one would only add latency. With
+max_latency=0 the worker never waits and takes whatever queued up while the
+previous forward pass ran.
+
+The socket carries pickles, so only processes that hold the server's key
+may connect. listen() makes a random key for each server and writes it
+to key_path(port), readable by this user only, and to the POLICY_SERVER_KEY
+environment variable for processes it starts. PolicyClient reads it from
+either; pass authkey= to use another key.
+"""
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+KEY_ENV = "POLICY_SERVER_KEY"
+
+
+def key_path(port):
+    """Where the server listening on `port` keeps its key."""
+    return os.path.join(tempfile.gettempdir(), f"rl2048-policy-{port}.key")
+
+
+def server_key(port):
+    """The key of the server on `port`: from POLICY_SERVER_KEY, else its key file."""
+    if os.environ.get(KEY_ENV):
+        return bytes.fromhex(os.environ[KEY_ENV])
+    try:
+        with open(key_path(port)) as f:
+            return bytes.fromhex(f.read().strip())
+    except FileNotFoundError:
+        raise ValueError(f"no key for a policy server on port {port}: set {KEY_ENV} or pass authkey") from None
+
+
+def _write_key(path, key):
+    # Created 0600; an old file from another server is replaced, not reused
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(key.hex())
+
+
+class PolicyServer:
+    def __init__(self, model_path="ppo_2048_browser", max_batch=64, max_latency=0.002,
+                 deterministic=True, model=None):
+        """
+        :param model_path: saved stable_baselines3 PPO model, loaded once
+        :param max_batch: most observations per forward pass
+        :param max_latency: longest an observation waits for its batch to fill
+        :param model: an already loaded model to serve instead of model_path
+        """
+        if model is None:
+            from stable_baselines3 import PPO
+            model = PPO.load(model_path)
+        self.model = model
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.deterministic = deterministic
+        # Observations of any other shape are refused one by one, so they
+        # can't break the batch they would land in
+        space = getattr(model, "observation_space", None)
+        self.obs_shape = tuple(space.shape) if getattr(space, "shape", None) is not None else None
+
+        self.requests = queue.Queue()
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._listener = None
+        self._key_file = None
+        self._closed = threading.Event()
+        self.batches = 0
+        self.predictions = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._serve, name="policy-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, obs):
+        """
+        Queue one observation; the Future resolves to its action. An
+        observation whose shape isn't the model's (or, without an
+        observation_space, the first one served) fails on its own.
+        """
+        future = Future()
+        if self._closed.is_set():
+            future.set_exception(RuntimeError("policy server is closed"))
+            return future
+        obs = np.asarray(obs)
+        with self._lock:
+            if self.obs_shape is None:
+                self.obs_shape = obs.shape
+            if obs.shape != self.obs_shape:
+                future.set_exception(ValueError(f"observation of shape {obs.shape}, expected {self.obs_shape}"))
+                return future
+            self._outstanding += 1
+        self.requests.put((time.perf_counter(), obs, future))
+        return future
+
+    def predict(self, obs):
+        """The action for one observation, from a batched forward pass."""
+        return self.submit(obs).result()
+
+    def _collect(self):
+        first = self.requests.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first[0] + self.max_latency
+        while len(batch) < self.max_batch and len(batch) < self._outstanding:
+            try:
+                # Drain what is already queued, then wait out the deadline
+                remaining = deadline - time.perf_counter()
+                item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _serve(self):
+        while not self._closed.is_set():
+            batch = self._collect()
+            if batch is None:
+                break
+            try:
+                obs = np.stack([item[1] for item in batch])
+                actions, _ = self.model.predict(obs, deterministic=self.deterministic)
+            except Exception as e:
+                self._done(len(batch))
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            self._done(len(batch))
+            self.batches += 1
+            self.predictions += len(batch)
+            for (_, _, future), action in zip(batch, actions):
+                future.set_result(int(action))
+
+    def _done(self, n):
+        with self._lock:
+            self._outstanding -= n
+
+    def listen(self, address=("localhost", 6048), authkey=None, backlog=64):
+        """
+        Serve PolicyClients on a local socket, one thread per client. Without
+        an authkey a random one is made and published (see key_path).
+        """
+        self.start()
+        publish = authkey is None
+        if publish:
+            authkey = os.urandom(32)
+        # The default backlog of 1 leaves clients that connect together
+        # waiting on TCP retries
+        self._listener = Listener(address, authkey=authkey, backlog=backlog)
+        self._authkey = authkey
+        if publish:
+            self._key_file = key_path(self._listener.address[1])
+            _write_key(self._key_file, authkey)
+            os.environ[KEY_ENV] = authkey.hex()
+        threading.Thread(target=self._accept, name="policy-listener", daemon=True).start()
+        return self._listener.address
+
+    def _accept(self):
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                continue  # a client without the key
+            except OSError:
+                break  # listener closed
+            if self._closed.is_set():
+                conn.close()
+                break
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    obs = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    reply = self.predict(obs)
+                except Exception as e:
+                    if self._closed.is_set():
+                        break
+                    reply = e  # PolicyClient.predict raises it
+                try:
+                    conn.send(reply)
+                except OSError:
+                    break
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "predictions": self.predictions,
+            "avg_batch": self.predictions / self.batches if self.batches else 0.0,
+        }
+
+    def close(self):
+        self._closed.set()
+        self.requests.put(None)
+        if self._listener is not None:
+            # accept() doesn't return when the listener is closed under it:
+            # wake it with one last connection first
+            try:
+                Client(self._listener.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+            self._listener.close()
+            if self._key_file is not None:
+                if os.environ.get(KEY_ENV) == self._authkey.hex():
+                    del os.environ[KEY_ENV]
+                try:
+                    os.remove(self._key_file)
+                except FileNotFoundError:
+                    pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        # Fail what the worker will never answer
+        while True:
+            try:
+                item = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._done(1)
+                item[2].set_exception(RuntimeError("policy server is closed"))
+
+
+class PolicyClient:
+    """
+    A game loop's connection to a PolicyServer.listen() socket. The key
+    defaults to the server's published one (see server_key).
+    """
+
+    def __init__(self, address=("localhost", 6048), authkey=None):
+        if authkey is None:
+            authkey = server_key(address[1])
+        self.conn = Client(address, authkey=authkey)
+
+    def predict(self, obs):
+        """The action, or raises the server's error for this observation."""
+        self.conn.send(np.asarray(obs))
+        reply = self.conn.recv()
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,119 @@
+"""
+Reward terms for the 2048 envs, all computed from packed boards with
+per-row tables (see engine_2048), so a step costs a few lookups instead of
+a pass over the (4, 4) grid:
+
+    tile_sum      sum of the tiles after the step (the original reward,
+                  which grows with game length rather than with good moves)
+    merge         the merge score of the move, what the web game adds to
+                  its score; a by-product of engine_2048.move_with_score
+    empty         change in the number of empty cells
+    monotonicity  change in how monotonic the rows and columns are (0 when
+                  every line is sorted, more negative the more out of order)
+
+Pick them with the envs' `reward` argument: a term name, or a dict of
+weights such as {"merge": 1.0, "empty": 10.0}. The envs return the
+unweighted terms in info["reward_terms"].
+"""
+import numpy as np
+
+import engine_2048 as engine
+
+TERMS = ("tile_sum", "merge", "empty", "monotonicity")
+
+
+def _row_tables():
+    rows = np.arange(65536)
+    line = [(rows >> (4 * i)) & 0xF for i in range(4)]
+    total = sum(np.where(e > 0, 1 << e, 0) for e in line)
+    empty = sum((e == 0).astype(np.int64) for e in line)
+    # How far the exponents climb and fall along the row; a sorted row
+    # only goes one way
+    rising = sum(np.maximum(line[i] - line[i - 1], 0) for i in range(1, 4))
+    falling = sum(np.maximum(line[i - 1] - line[i], 0) for i in range(1, 4))
+    mono = -np.minimum(rising, falling)
+    return total.astype(np.int64), empty.astype(np.int64), mono.astype(np.int64)
+
+
+ROW_SUM, ROW_EMPTY, ROW_MONOTONICITY = _row_tables()
+_ROW_SUM = ROW_SUM.tolist()
+_ROW_MONOTONICITY = ROW_MONOTONICITY.tolist()
+
+
+def tile_sum(board):
+    t = _ROW_SUM
+    return t[board & 0xFFFF] + t[(board >> 16) & 0xFFFF] + t[(board >> 32) & 0xFFFF] + t[board >> 48]
+
+
+def monotonicity(board):
+    """Monotonicity of all rows plus all columns, <= 0."""
+    t = _ROW_MONOTONICITY
+    c = engine.transpose(board)
+    return (t[board & 0xFFFF] + t[(board >> 16) & 0xFFFF] + t[(board >> 32) & 0xFFFF] + t[board >> 48]
+            + t[c & 0xFFFF] + t[(c >> 16) & 0xFFFF] + t[(c >> 32) & 0xFFFF] + t[c >> 48])
+
+
+_SHIFTS = [np.uint64(s) for s in (0, 16, 32, 48)]
+_MASK16 = np.uint64(0xFFFF)
+
+
+def _rows_sum_batch(table, boards):
+    return sum(table[(boards >> s) & _MASK16] for s in _SHIFTS)
+
+
+def tile_sum_batch(boards):
+    return _rows_sum_batch(ROW_SUM, boards)
+
+
+def count_empty_batch(boards):
+    return _rows_sum_batch(ROW_EMPTY, boards)
+
+
+def monotonicity_batch(boards):
+    return (_rows_sum_batch(ROW_MONOTONICITY, boards)
+            + _rows_sum_batch(ROW_MONOTONICITY, engine._transpose_batch(boards)))
+
+
+class RewardShaper:
+    """
+    Weighted sum of reward TERMS for one step, from the board before the
+    move, the board after it (with the spawned tile) and the merge score.
+    """
+
+    def __init__(self, reward="tile_sum"):
+        weights = {reward: 1.0} if isinstance(reward, str) else dict(reward)
+        unknown = set(weights) - set(TERMS)
+        if unknown:
+            raise ValueError(f"unknown reward terms {sorted(unknown)}, expected some of {TERMS}")
+        self.weights = weights
+
+    def __call__(self, before, after, score):
+        """(reward, terms) for one step on packed boards."""
+        terms = {}
+        w = self.weights
+        if "tile_sum" in w:
+            terms["tile_sum"] = tile_sum(after)
+        if "merge" in w:
+            terms["merge"] = score
+        if "empty" in w:
+            terms["empty"] = engine.count_empty(after) - engine.count_empty(before)
+        if "monotonicity" in w:
+            terms["monotonicity"] = monotonicity(after) - monotonicity(before)
+        return float(sum(w[k] * v for k, v in terms.items())), terms
+
+    def batch(self, before, after, scores):
+        """(float32 rewards, terms as int64 arrays) for uint64 board arrays."""
+        terms = {}
+        w = self.weights
+        if "tile_sum" in w:
+            terms["tile_sum"] = tile_sum_batch(after)
+        if "merge" in w:
+            terms["merge"] = scores
+        if "empty" in w:
+            terms["empty"] = count_empty_batch(after) - count_empty_batch(before)
+        if "monotonicity" in w:
+            terms["monotonicity"] = monotonicity_batch(after) - monotonicity_batch(before)
+        rewards = np.zeros(len(after), dtype=np.float32)
+        for k, v in terms.items():
+            rewards += np.float32(w[k]) * v
+        return rewards, terms
@@ -0,0 +1,214 @@
+"""
+Command line entry point for the 2048 RL tools. Run from RL/:
+
+    python -m rl2048 train --env batched --num-envs 1024 --timesteps 1000000
+    python -m rl2048 play --policy expectimax --env local --render
+    python -m rl2048 play --policy ppo --env browser --dry-run
+    python -m rl2048 play --policy expectimax --record expectimax.traj
+    python -m rl2048 serve --port 6048
+
+Heavy dependencies (stable_baselines3/torch, selenium, the engine tables)
+are only imported by the command that actually needs them, so --help and
+--dry-run return without loading any of them.
+"""
+import argparse
+import os
+import sys
+
+# The trained model at the repo root, wherever this is run from
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ppo_2048_browser")
+ENVS = ("local", "batched", "browser", "pool")
+ENCODINGS = ("raw", "exponent", "onehot")
+
+
+def parse_reward(text):
+    """"merge" or "merge=1,empty=10" (see reward_2048.TERMS)."""
+    if "=" not in text:
+        return text
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def build_env(name, num_envs=1, url="https://2048.ninja", seed=None, encoding="raw", reward="tile_sum"):
+    if name == "batched":
+        from batched_2048_vec_env import Batched2048VecEnv
+        return Batched2048VecEnv(num_envs=num_envs, seed=seed, encoding=encoding, reward=reward)
+    if name == "pool":
+        if encoding != "raw" or reward != "tile_sum":
+            raise ValueError("the browser pool only observes raw boards with the tile_sum reward")
+        from browser_env_pool import make_browser_pool
+        return make_browser_pool(num_envs, seed=seed)
+
+    if name == "local":
+        from local_2048_env import Local2048Env
+        env = Local2048Env(reward=reward)
+    elif name == "browser":
+        from browser_2048_env import Browser2048Env
+        env = Browser2048Env(url=url, reward=reward)
+    else:
+        raise ValueError(f"unknown env {name!r}")
+    if encoding != "raw":
+        from obs_encoding_2048 import Log2Observation
+        env = Log2Observation(env, encoding)
+    return env
+
+
+def describe(args):
+    return ", ".join(f"{k}={v}" for k, v in sorted(vars(args).items()) if k not in ("func", "dry_run"))
+
+
+def cmd_train(args):
+    if args.dry_run:
+        print(f"would train PPO: {describe(args)}")
+        return 0
+
+    from stable_baselines3 import PPO
+
+    env = build_env(args.env, args.num_envs, args.url, args.seed, args.encoding, parse_reward(args.reward))
+    model = PPO("MlpPolicy", env, verbose=1, seed=args.seed)
+    model.learn(total_timesteps=args.timesteps)
+    model.save(args.out)
+    env.close()
+    return 0
+
+
+def cmd_play(args):
+    if args.env not in ("local", "browser"):
+        print("play needs a single env: --env local or --env browser", file=sys.stderr)
+        return 2
+    if args.dry_run:
+        print(f"would play one game: {describe(args)}")
+        return 0
+
+    if args.policy == "expectimax":
+        from solver_2048 import ExpectimaxSolver
+        solver = ExpectimaxSolver(time_budget=args.budget_ms / 1000)
+
+        def choose(obs):
+            return solver.best_grid_action(obs)
+    else:
+        from stable_baselines3 import PPO
+        model = PPO.load(args.model)
+        # The game is played on raw boards; only the model sees the encoding
+        encode = None
+        if args.encoding != "raw":
+            from obs_encoding_2048 import Log2Encoder
+            encode = Log2Encoder(args.encoding).from_grids
+
+        def choose(obs):
+            if encode is not None:
+                obs = encode(obs)
+            return int(model.predict(obs, deterministic=True)[0])
+
+    env = build_env(args.env, url=args.url)
+    writer = None
+    if args.record:
+        from trajectory_2048 import RecordTrajectory, TrajectoryWriter
+        writer = TrajectoryWriter(args.record)
+        env = RecordTrajectory(env, writer)
+    obs, _ = env.reset(seed=args.seed)
+    steps = 0
+    stuck = 0
+    done = False
+    while not done:
+        action = choose(obs)
+        if action is None:
+            break
+        prev = obs
+        obs, _, terminated, truncated, _ = env.step(action)
+        done = terminated or truncated
+        steps += 1
+        if args.render:
+            env.render()
+        # A deterministic policy that picks an illegal move repeats it forever
+        stuck = stuck + 1 if (obs == prev).all() else 0
+        if stuck >= args.max_stuck:
+            print("Policy is stuck on a move that changes nothing, stopping")
+            break
+
+    print(obs)
+    print(f"Finished after {steps} moves, max tile {obs.max()}")
+    env.close()
+    if writer is not None:
+        writer.close()
+        print(f"Appended {writer.written} transitions to {args.record}")
+    return 0
+
+
+def cmd_serve(args):
+    if args.dry_run:
+        print(f"would serve {args.model} on localhost:{args.port}: {describe(args)}")
+        return 0
+
+    import time
+
+    from policy_server import PolicyServer, key_path
+
+    server = PolicyServer(args.model, max_batch=args.max_batch, max_latency=args.max_latency_ms / 1000)
+    host, port = server.listen(("localhost", args.port))
+    print(f"Serving {args.model} on {host}:{port} (key in {key_path(port)}), Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(10)
+            print(server.stats())
+    except KeyboardInterrupt:
+        pass
+    server.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="rl2048", description="Train and play 2048 agents.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print what would run without importing or launching anything")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--url", default="https://2048.ninja", help="2048 page for the browser envs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train = sub.add_parser("train", help="train a PPO agent")
+    train.add_argument("--env", choices=ENVS, default="batched")
+    train.add_argument("--num-envs", type=int, default=1024)
+    train.add_argument("--timesteps", type=int, default=1000000)
+    train.add_argument("--out", default="ppo_2048")
+    train.add_argument("--encoding", choices=ENCODINGS, default="raw",
+                       help="observation encoding (see obs_encoding_2048)")
+    train.add_argument("--reward", default="tile_sum",
+                       help="reward term or weighted terms, e.g. merge=1,empty=10 (see reward_2048)")
+    train.set_defaults(func=cmd_train)
+
+    play = sub.add_parser("play", help="play one game")
+    play.add_argument("--env", choices=ENVS, default="local")
+    play.add_argument("--policy", choices=("ppo", "expectimax"), default="expectimax")
+    play.add_argument("--model", default=DEFAULT_MODEL, help="saved PPO model for --policy ppo")
+    play.add_argument("--encoding", choices=ENCODINGS, default="raw",
+                      help="observation encoding the PPO model was trained with")
+    play.add_argument("--budget-ms", type=float, default=5.0, help="expectimax time per move")
+    play.add_argument("--render", action="store_true")
+    play.add_argument("--max-stuck", type=int, default=10,
+                      help="stop after this many moves in a row that change nothing")
+    play.add_argument("--record", metavar="PATH", default=None,
+                      help="append the game to a trajectory file (see trajectory_2048)")
+    play.set_defaults(func=cmd_play)
+
+    serve = sub.add_parser("serve", help="serve a PPO model to many game loops (see policy_server)")
+    serve.add_argument("--model", default=DEFAULT_MODEL)
+    serve.add_argument("--port", type=int, default=6048)
+    serve.add_argument("--max-batch", type=int, default=64)
+    serve.add_argument("--max-latency-ms", type=float, default=2.0)
+    serve.set_defaults(func=cmd_serve)
+
+    # Accept --dry-run/--seed/--url after the subcommand too
+    for p in (train, play, serve):
+        p.add_argument("--dry-run", action="store_true", default=argparse.SUPPRESS)
+        p.add_argument("--seed", type=int, default=argparse.SUPPRESS)
+        p.add_argument("--url", default=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
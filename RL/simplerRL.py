@@ -4,6 +4,9 @@ from stable_baselines3 import PPO
 
 # Create the 2048 environment
 env = gym.make('2048-v0')
+# Or, thousands of boards per step on the local bitboard engine:
+# from batched_2048_vec_env import Batched2048VecEnv
+# env = Batched2048VecEnv(num_envs=1024)
 
 # Initialize the PPO model
 model = PPO('MlpPolicy', env, verbose=1)
@@ -0,0 +1,237 @@
+"""
+Depth-limited expectimax search for 2048 on top of the bitboard engine.
+
+Max nodes are the player's moves, chance nodes are the tile spawns (a 2
+with probability 0.9 or a 4 with probability 0.1 on each empty cell).
+Leaves are scored with a heuristic that is precomputed for all 65536 rows,
+so a board costs eight table lookups (four rows, four columns).
+
+Search runs by iterative deepening under a per-move time budget, so the
+answer is always the best move of the deepest fully searched depth.
+
+    solver = ExpectimaxSolver(time_budget=0.005)
+    action = solver.best_action(engine.pack(grid))
+    print(solver.stats())
+"""
+import itertools
+import time
+
+import numpy as np
+
+import engine_2048 as engine
+
+# Heuristic weights, tuned for this row encoding in the usual
+# bitboard expectimax bots
+SCORE_LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+
+def _row_heuristics():
+    """The heuristic of every 16-bit row, as a list indexed by row."""
+    rows = np.arange(65536)
+    line = [((rows >> (4 * i)) & 0xF).astype(np.float64) for i in range(4)]
+
+    total = sum(rank ** SUM_POWER for rank in line)
+    empty = sum((rank == 0).astype(np.int64) for rank in line)
+
+    # Runs of equal tiles, skipping empty cells: a run of n tiles scores n
+    merges = np.zeros(65536)
+    prev = np.zeros(65536)
+    counter = np.zeros(65536)
+    for rank in line:
+        tile = rank != 0
+        same = tile & (prev == rank)
+        ends = tile & ~same & (counter > 0)
+        merges += np.where(ends, 1 + counter, 0)
+        counter = np.where(same, counter + 1, np.where(ends, 0, counter))
+        prev = np.where(tile, rank, prev)
+    merges += np.where(counter > 0, 1 + counter, 0)
+
+    mono_left = np.zeros(65536)
+    mono_right = np.zeros(65536)
+    for i in range(1, 4):
+        step = line[i - 1] ** MONOTONICITY_POWER - line[i] ** MONOTONICITY_POWER
+        falling = line[i - 1] > line[i]
+        mono_left += np.where(falling, step, 0)
+        mono_right += np.where(falling, 0, -step)
+
+    heur = (SCORE_LOST_PENALTY
+            + EMPTY_WEIGHT * empty
+            + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * np.minimum(mono_left, mono_right)
+            - SUM_WEIGHT * total)
+    return heur.tolist()
+
+
+HEUR_ROW = _row_heuristics()
+
+
+def heuristic(board):
+    """Sum of the row heuristic over all rows and all columns."""
+    t = HEUR_ROW
+    c = engine.transpose(board)
+    return (t[board & 0xFFFF] + t[(board >> 16) & 0xFFFF]
+            + t[(board >> 32) & 0xFFFF] + t[board >> 48]
+            + t[c & 0xFFFF] + t[(c >> 16) & 0xFFFF]
+            + t[(c >> 32) & 0xFFFF] + t[c >> 48])
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class ExpectimaxSolver:
+    """
+    :param max_depth: deepest search, in player moves including the root move
+    :param time_budget: seconds per best_action() call, None for no limit
+    :param cache_size: max entries of the transposition table
+    :param prob_cutoff: chance branches less likely than this are scored
+        with the heuristic instead of being expanded
+    """
+
+    # Check the clock once every this many nodes
+    CLOCK_INTERVAL = 256
+
+    def __init__(self, max_depth=4, time_budget=0.005, cache_size=200000, prob_cutoff=1e-4):
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self.prob_cutoff = prob_cutoff
+
+        # Keyed on the packed board, shifted left one bit with the low bit
+        # set for max nodes, so a board can be cached as both node types.
+        # Values are (depth searched, expected score).
+        self.cache = {}
+
+        self.last = {}
+        self.total_nodes = 0
+        self.total_lookups = 0
+        self.total_hits = 0
+        self.total_time = 0.0
+        self.moves = 0
+
+    def best_action(self, board):
+        """
+        Best action (engine.UP/DOWN/LEFT/RIGHT) for a packed board, or None
+        if no move changes the board.
+        """
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget if self.time_budget else float("inf")
+        self._nodes = 0
+        self._lookups = 0
+        self._hits = 0
+
+        legal = [(a, m) for a in engine.ACTIONS for m in (engine.move(board, a),) if m != board]
+        if not legal:
+            return None
+
+        best = legal[0][0]
+        depth_done = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                scores = [(self._chance(m, depth - 1, 1.0), a) for a, m in legal]
+            except _OutOfTime:
+                break
+            best = max(scores)[1]
+            depth_done = depth
+            if len(legal) == 1:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.last = {
+            "depth": depth_done,
+            "nodes": self._nodes,
+            "cache_lookups": self._lookups,
+            "cache_hits": self._hits,
+            "seconds": elapsed,
+        }
+        self.total_nodes += self._nodes
+        self.total_lookups += self._lookups
+        self.total_hits += self._hits
+        self.total_time += elapsed
+        self.moves += 1
+        return best
+
+    def best_grid_action(self, grid):
+        """best_action() for a 4x4 grid of tile values, e.g. from a scraper."""
+        return self.best_action(engine.pack(grid))
+
+    def stats(self):
+        """Cumulative search statistics over every best_action() call."""
+        return {
+            "moves": self.moves,
+            "nodes": self.total_nodes,
+            "nodes_per_sec": self.total_nodes / self.total_time if self.total_time else 0.0,
+            "cache_hit_rate": self.total_hits / self.total_lookups if self.total_lookups else 0.0,
+            "cache_entries": len(self.cache),
+            "avg_move_ms": 1000 * self.total_time / self.moves if self.moves else 0.0,
+        }
+
+    def _tick(self):
+        self._nodes += 1
+        if self._nodes % self.CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise _OutOfTime()
+
+    def _lookup(self, key, depth):
+        self._lookups += 1
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] >= depth:
+            self._hits += 1
+            return entry[1]
+        return None
+
+    def _store(self, key, depth, value):
+        cache = self.cache
+        if len(cache) >= self.cache_size:
+            # Dicts keep insertion order: drop the oldest half
+            for old in list(itertools.islice(cache, len(cache) // 2)):
+                del cache[old]
+        cache[key] = (depth, value)
+
+    def _chance(self, board, depth, prob):
+        """Expected value over all tile spawns, `depth` player moves to go."""
+        self._tick()
+        if depth == 0 or prob < self.prob_cutoff:
+            return heuristic(board)
+
+        key = board << 1
+        value = self._lookup(key, depth)
+        if value is not None:
+            return value
+
+        empty = engine.empty_cells(board)
+        if not empty:
+            return heuristic(board)
+        prob /= len(empty)
+
+        total = 0.0
+        for cell in empty:
+            shift = 4 * cell
+            total += 0.9 * self._max(board | (1 << shift), depth, prob * 0.9)
+            total += 0.1 * self._max(board | (2 << shift), depth, prob * 0.1)
+        value = total / len(empty)
+
+        self._store(key, depth, value)
+        return value
+
+    def _max(self, board, depth, prob):
+        """Value of the best move from `board`; 0 if the game is lost."""
+        self._tick()
+        key = (board << 1) | 1
+        value = self._lookup(key, depth)
+        if value is not None:
+            return value
+
+        best = 0.0
+        for action in engine.ACTIONS:
+            moved = engine.move(board, action)
+            if moved != board:
+                best = max(best, self._chance(moved, depth - 1, prob))
+
+        self._store(key, depth, best)
+        return best
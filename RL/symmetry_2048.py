@@ -0,0 +1,178 @@
+"""
+The 8 symmetries of the 2048 board (rotations and reflections) on packed
+boards (see engine_2048).
+
+Symmetry k = h + 2*v + 4*t mirrors the rows left-right if h, then flips
+the board upside down if v, then transposes it if t. Moves commute with
+symmetries once the action is remapped too:
+
+    apply(move(board, a), k) == move(apply(board, k), ACTION_MAP[k, a])
+
+canonical(board) picks the smallest of the 8 images as the representative
+of the whole class, so symmetric positions share one observation, one
+policy output and one cache entry.
+
+CanonicalBoard wraps a single 2048 env so the agent sees canonical boards
+(mode="canonical") or a random symmetry per step (mode="random", on-policy
+augmentation). augment() turns a batch of recorded transitions (see
+trajectory_2048) into all 8 orientations for offline training.
+"""
+import gymnasium as gym
+import numpy as np
+
+import engine_2048 as engine
+
+H, V, T = 1, 2, 4
+
+# Every 16-bit row with its 4 nibbles in reverse order
+REVERSE_ROW = engine._reverse_row(np.arange(65536, dtype=np.uint64)).astype(np.uint16)
+_REVERSE_ROW = REVERSE_ROW.tolist()
+
+
+def _map_action(k, a):
+    if k & H:
+        a = {engine.LEFT: engine.RIGHT, engine.RIGHT: engine.LEFT}.get(a, a)
+    if k & V:
+        a = {engine.UP: engine.DOWN, engine.DOWN: engine.UP}.get(a, a)
+    if k & T:
+        a = {engine.UP: engine.LEFT, engine.LEFT: engine.UP,
+             engine.DOWN: engine.RIGHT, engine.RIGHT: engine.DOWN}[a]
+    return a
+
+
+# ACTION_MAP[k, a]: action a seen through symmetry k. INVERSE_ACTION_MAP
+# takes an action chosen on the transformed board back to the real one.
+ACTION_MAP = np.array([[_map_action(k, a) for a in engine.ACTIONS] for k in range(8)], dtype=np.int64)
+INVERSE_ACTION_MAP = np.argsort(ACTION_MAP, axis=1)
+
+
+def flip_h(board):
+    """Mirror every row left-right."""
+    r = _REVERSE_ROW
+    return (r[board & 0xFFFF]
+            | (r[(board >> 16) & 0xFFFF] << 16)
+            | (r[(board >> 32) & 0xFFFF] << 32)
+            | (r[board >> 48] << 48))
+
+
+def flip_v(board):
+    """Flip the board upside down (reverse the row order)."""
+    return (((board & 0xFFFF) << 48)
+            | (((board >> 16) & 0xFFFF) << 32)
+            | (((board >> 32) & 0xFFFF) << 16)
+            | (board >> 48))
+
+
+def images(board):
+    """The 8 symmetric images of a board, indexed by k."""
+    h = flip_h(board)
+    out = [board, h, flip_v(board), flip_v(h)]
+    return out + [engine.transpose(b) for b in out]
+
+
+def apply(board, k):
+    if k & H:
+        board = flip_h(board)
+    if k & V:
+        board = flip_v(board)
+    if k & T:
+        board = engine.transpose(board)
+    return board
+
+
+def canonical(board):
+    """(representative, k): the smallest image of board and its symmetry."""
+    imgs = images(board)
+    rep = min(imgs)
+    return rep, imgs.index(rep)
+
+
+_SHIFTS = [np.uint64(s) for s in (0, 16, 32, 48)]
+_MASK16 = np.uint64(0xFFFF)
+
+
+def flip_h_batch(boards):
+    out = np.zeros_like(boards)
+    for s in _SHIFTS:
+        out |= REVERSE_ROW[(boards >> s) & _MASK16].astype(np.uint64) << s
+    return out
+
+
+def flip_v_batch(boards):
+    out = np.zeros_like(boards)
+    for s, d in zip(_SHIFTS, _SHIFTS[::-1]):
+        out |= ((boards >> s) & _MASK16) << d
+    return out
+
+
+def images_batch(boards):
+    """(8, N) array of the symmetric images of a uint64 array of boards."""
+    h = flip_h_batch(boards)
+    out = [boards, h, flip_v_batch(boards), flip_v_batch(h)]
+    return np.stack(out + [engine._transpose_batch(b) for b in out])
+
+
+def canonical_batch(boards):
+    """Vectorised canonical(): (representatives, k) arrays."""
+    imgs = images_batch(boards)
+    k = np.argmin(imgs, axis=0)
+    return imgs[k, np.arange(len(boards))], k
+
+
+def augment(batch):
+    """
+    All 8 orientations of a TrajectoryReader batch: every array is tiled
+    8x, with boards/next_boards transformed and actions remapped. Rewards
+    and flags are symmetric and only repeated.
+    """
+    n = len(batch["boards"])
+    k = np.repeat(np.arange(8), n)
+    out = {key: np.tile(value, 8) for key, value in batch.items()}
+    out["boards"] = images_batch(batch["boards"]).ravel()
+    out["next_boards"] = images_batch(batch["next_boards"]).ravel()
+    out["actions"] = ACTION_MAP[k, out["actions"]]
+    return out
+
+
+class CanonicalBoard(gym.Wrapper):
+    """
+    Shows a single 2048 env (Local2048Env, Browser2048Env) to the agent
+    through a symmetry and maps the agent's actions back.
+
+    mode="canonical": every observation is the canonical board, so the
+    policy only ever sees one orientation of each position.
+    mode="random": a random symmetry per step, which augments the
+    rollouts with all 8 orientations over the course of training.
+    """
+
+    def __init__(self, env, mode="canonical"):
+        if mode not in ("canonical", "random"):
+            raise ValueError(f"unknown mode {mode!r}")
+        super().__init__(env)
+        self.mode = mode
+        self.k = 0
+        self._rng = np.random.default_rng()
+
+    def _observe(self, obs):
+        board = engine.pack(obs)
+        if self.mode == "canonical":
+            board, self.k = canonical(board)
+        else:
+            self.k = int(self._rng.integers(8))
+            board = apply(board, self.k)
+        return engine.unpack(board)
+
+    def reset(self, seed=None, **kwargs):
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        obs, info = self.env.reset(seed=seed, **kwargs)
+        obs = self._observe(obs)
+        info["symmetry"] = self.k
+        return obs, info
+
+    def step(self, action):
+        action = int(INVERSE_ACTION_MAP[self.k, int(action)])
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        obs = self._observe(obs)
+        info["symmetry"] = self.k
+        return obs, reward, terminated, truncated, info
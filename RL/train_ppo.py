@@ -26,6 +26,12 @@ class TQDMProgressBarCallback(BaseCallback):
         self.pbar.close()
 
 env = Browser2048Env()
+# To train offline on the in-process engine instead of Chrome:
+# from batched_2048_vec_env import Batched2048VecEnv
+# env = Batched2048VecEnv(num_envs=1024)
+# Or against the real page in several headless Chromes at once:
+# from browser_env_pool import make_browser_pool
+# env = make_browser_pool(num_envs=4)
 model = PPO("MlpPolicy", env, verbose=1)
 
 progress_callback = TQDMProgressBarCallback(total_timesteps=200)
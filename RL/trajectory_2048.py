@@ -0,0 +1,225 @@
+"""
+Compact on-disk record of played 2048 games, for offline / behaviour
+cloning pretraining from expectimax or human games:
+
+    with TrajectoryWriter("games.traj") as writer:
+        writer.add(board, action, terminated)
+
+    env = RecordTrajectory(Browser2048Env(), writer)   # or record an env
+
+    reader = TrajectoryReader("games.traj")
+    batch = reader.sample(256)
+
+Every transition is 9 bytes: the packed board the action was taken on
+(uint64, see engine_2048) and one flag byte holding the action (bits 0-1),
+terminated (bit 2) and truncated (bit 3). The reward is not stored, it is a
+function of the board and the action: the reader recomputes the web game's
+merge score with engine_2048.move_score_batch. That makes it ~110 million
+transitions per GB.
+
+Records are in play order, so the board after a transition is the next
+record's board; record each game of a vectorised env to its own file.
+The writer buffers records in a fixed-size chunk and appends whole chunks
+to the file. The reader np.memmaps the file, so sampling a minibatch only
+touches the pages holding the sampled records, however big the file is.
+"""
+import os
+
+import gymnasium as gym
+import numpy as np
+
+import engine_2048 as engine
+
+MAGIC = b"T2048v1\n"
+HEADER_SIZE = len(MAGIC)
+
+RECORD = np.dtype([("board", "<u8"), ("flags", "u1")])
+assert RECORD.itemsize == 9
+
+ACTION_BITS = 0x3
+TERMINATED = 0x4
+TRUNCATED = 0x8
+
+
+class TrajectoryWriter:
+    """
+    Appends transitions to a trajectory file, creating it if needed.
+    Records are flushed to disk every `chunk_size` transitions, on flush()
+    and on close().
+    """
+
+    def __init__(self, path, chunk_size=65536):
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if new:
+            self.file.write(MAGIC)
+        else:
+            _check_header(path)
+        self.chunk = np.zeros(chunk_size, dtype=RECORD)
+        self.pending = 0
+        self.written = 0
+
+    def add(self, board, action, terminated=False, truncated=False):
+        """Record `action` taken on `board` (packed, or a (4, 4) grid)."""
+        if not isinstance(board, (int, np.integer)):
+            board = engine.pack(board)
+        flags = int(action) & ACTION_BITS
+        if terminated:
+            flags |= TERMINATED
+        if truncated:
+            flags |= TRUNCATED
+        self.chunk[self.pending] = (board, flags)
+        self.pending += 1
+        if self.pending == len(self.chunk):
+            self.flush()
+
+    def truncate_last(self):
+        """
+        Mark the last transition added as truncated, unless its game already
+        ended there. For games stopped early: otherwise the reader would take
+        the next game's first board as the board after it.
+        """
+        if self.pending:
+            flags = self.chunk["flags"]
+            if not flags[self.pending - 1] & (TERMINATED | TRUNCATED):
+                flags[self.pending - 1] |= TRUNCATED
+            return
+        if not self.written:
+            return
+        # Already on disk: the flag byte is the file's last byte
+        self.file.flush()
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            flags = f.read(1)[0]
+            if not flags & (TERMINATED | TRUNCATED):
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([flags | TRUNCATED]))
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.chunk[:self.pending].tobytes())
+            self.written += self.pending
+            self.pending = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _check_header(path):
+    with open(path, "rb") as f:
+        if f.read(HEADER_SIZE) != MAGIC:
+            raise ValueError(f"{path} is not a 2048 trajectory file")
+
+
+class TrajectoryReader:
+    """
+    Memory-mapped view of a trajectory file. Call refresh() to pick up
+    records a writer has appended since.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        _check_header(path)
+        self.refresh()
+
+    def refresh(self):
+        n = (os.path.getsize(self.path) - HEADER_SIZE) // RECORD.itemsize
+        if n:
+            self.records = np.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(n,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+        return n
+
+    def __len__(self):
+        return len(self.records)
+
+    def episodes(self):
+        """Number of finished games (terminated or truncated records)."""
+        return int(np.count_nonzero(self.records["flags"] & (TERMINATED | TRUNCATED)))
+
+    def batch(self, idx):
+        """
+        The transitions at `idx`, as a dict of arrays: "boards" and
+        "next_boards" (packed uint64), "actions", "rewards" (merge score),
+        "terminated" and "truncated". The next board of the last move of a
+        game is the board after the move, without a spawned tile.
+        """
+        idx = np.asarray(idx, dtype=np.int64)
+        rec = self.records[idx]
+        boards = rec["board"]
+        actions = (rec["flags"] & ACTION_BITS).astype(np.int64)
+        terminated = (rec["flags"] & TERMINATED) != 0
+        truncated = (rec["flags"] & TRUNCATED) != 0
+
+        next_boards = np.empty_like(boards)
+        ends = terminated | truncated | (idx + 1 >= len(self.records))
+        follow = np.flatnonzero(~ends)
+        next_boards[follow] = self.records["board"][idx[follow] + 1]
+        for action in engine.ACTIONS:
+            sel = np.flatnonzero(ends & (actions == action))
+            if len(sel):
+                next_boards[sel] = engine.move_batch(boards[sel], action)
+
+        return {
+            "boards": boards,
+            "actions": actions,
+            "rewards": engine.move_score_batch(boards, actions),
+            "next_boards": next_boards,
+            "terminated": terminated,
+            "truncated": truncated,
+        }
+
+    def sample(self, batch_size, rng=None):
+        """A random minibatch (with replacement), see batch()."""
+        rng = np.random.default_rng(rng)
+        return self.batch(rng.integers(len(self.records), size=batch_size))
+
+    def observations(self, boards):
+        """(N, 4, 4) int32 tile grids, like the envs' observations."""
+        return engine.unpack_batch(boards)
+
+
+class RecordTrajectory(gym.Wrapper):
+    """
+    Records every step of a single 2048 env (Local2048Env, Browser2048Env)
+    to a TrajectoryWriter. A game left unfinished by reset() or close() has
+    its last step marked truncated. The writer is not closed with the env.
+    """
+
+    def __init__(self, env, writer):
+        super().__init__(env)
+        self.writer = writer
+        self._board = None
+        self._playing = False
+
+    def _end_game(self):
+        if self._playing:
+            self.writer.truncate_last()
+            self._playing = False
+
+    def reset(self, **kwargs):
+        self._end_game()
+        obs, info = self.env.reset(**kwargs)
+        self._board = engine.pack(obs)
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        self.writer.add(self._board, action, terminated, truncated)
+        self._playing = not (terminated or truncated)
+        self._board = engine.pack(obs)
+        return obs, reward, terminated, truncated, info
+
+    def close(self):
+        self._end_game()
+        return super().close()
@@ -0,0 +1,51 @@
+"""
+Clicks/sec and cookies/sec of CookieClickerBot's click modes against the
+local Cookie Clicker stub (local_pages/cookie), each on a fresh page and
+without buying anything, so every cookie comes from a counted click:
+
+    webdriver   click_big_cookie(50): one WebDriver click() per click (before)
+    burst       click_big_cookie(50): one execute_async_script per 50 clicks
+    loop        the requestAnimationFrame clicker, started once
+
+    python bench_clicker.py [seconds] [rate]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from local_pages import headless_chrome, page_url
+from clicker import CLICK_MODES, CookieClickerBot
+
+GAME_JS = "return [Game.cookieClicks, Game.cookiesEarned];"
+
+
+def bench(driver, mode, seconds, rate):
+    bot = CookieClickerBot(driver=driver, url=page_url("cookie"), click_mode=mode, click_rate=rate)
+    clicks, cookies = driver.execute_script(GAME_JS)
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < seconds:
+        bot.click_big_cookie(times=50)
+        if mode == "loop":
+            time.sleep(0.5)
+        else:
+            sent += 50
+    if mode == "loop":
+        sent = bot.clicker.stop()["clicks"]
+    elapsed = time.perf_counter() - start
+    counted, earned = (a - b for a, b in zip(driver.execute_script(GAME_JS), (clicks, cookies)))
+    print(f"{mode:<10} {sent / elapsed:7.1f} clicks/s sent  {counted / elapsed:7.1f} counted  "
+          f"{earned / elapsed:7.1f} cookies/s")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    driver = headless_chrome()
+    try:
+        for mode in reversed(CLICK_MODES):
+            bench(driver, mode, seconds, rate)
+    finally:
+        driver.quit()
@@ -0,0 +1,88 @@
+"""
+CpS growth over a simulated hour of the local Cookie Clicker economy
+(engine_cookie, no browser) for three purchase strategies, each deciding
+every `interval` seconds of game time with `clicks` counted clicks a
+second:
+
+    highest   the bot before: every upgrade it can afford, then the
+              affordable building with the highest id
+    cheapest  the cheapest affordable item, until none is
+    payback   PurchasePlanner: the item with the shortest payback time,
+              saving up for it when it isn't affordable yet
+
+    python bench_planner.py [minutes] [interval] [clicks]
+"""
+import sys
+import time
+
+from engine_cookie import CookieGame
+from purchase_planner import BUILDING, PurchasePlanner
+
+CHECKPOINTS = (5, 15, 30, 60)
+
+
+def buy_highest(game, _):
+    for u, _, _, price in game.upgrades_in_store():
+        if game.cookies >= price:
+            game.buy_upgrade(u)
+    for b in reversed(range(len(game.prices))):
+        if game.buy_building(b):
+            break
+
+
+def buy_cheapest(game, _):
+    while True:
+        items = [(price, BUILDING, b) for b, price in enumerate(game.prices)]
+        items += [(price, "upgrade", u) for u, _, _, price in game.upgrades_in_store()]
+        price, kind, item = min(items)
+        if price > game.cookies:
+            return
+        if kind == BUILDING:
+            game.buy_building(item)
+        else:
+            game.buy_upgrade(item)
+
+
+def buy_payback(game, planner):
+    while True:
+        state = game.state()
+        planner.update(state)
+        best = planner.best(state["cookies"], state["cookiesPs"] + planner.clicks * state["mouseCps"])
+        if best is None or best[1] > game.cookies:
+            return
+        (kind, item), _, _ = best
+        if kind == BUILDING:
+            game.buy_building(item)
+        else:
+            game.buy_upgrade(item)
+
+
+def play(strategy, minutes, interval, clicks):
+    game = CookieGame()
+    planner = PurchasePlanner(clicks=clicks)
+    cps_at = {}
+    decisions, seconds = 0, 0.0
+    while game.time < minutes * 60:
+        game.advance(interval, clicks)
+        start = time.perf_counter()
+        strategy(game, planner)
+        seconds += time.perf_counter() - start
+        decisions += 1
+        for m in CHECKPOINTS:
+            if m not in cps_at and game.time >= m * 60:
+                cps_at[m] = game.cookies_ps
+    return game, cps_at, 1e6 * seconds / decisions, planner.pushes
+
+
+if __name__ == "__main__":
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    clicks = float(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+    print(f"{minutes:g} min, buying every {interval:g} s, {clicks:g} clicks/s")
+    header = "  ".join(f"CpS @{m:>2} min" for m in CHECKPOINTS if m <= minutes)
+    print(f"{'':<10}{header}  {'earned':>12}  decision")
+    for name, strategy in (("highest", buy_highest), ("cheapest", buy_cheapest), ("payback", buy_payback)):
+        game, cps_at, us, pushes = play(strategy, minutes, interval, clicks)
+        row = "  ".join(f"{cps_at[m]:12.1f}" for m in CHECKPOINTS if m in cps_at)
+        print(f"{name:<10}{row}  {game.cookies_earned:12.0f}  {us:6.1f} us")
@@ -6,13 +6,30 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 
+from page_clicker import PageClicker
+from purchase_planner import PurchasePlanner, buy, read_state
+
+GAME_URL = "https://orteil.dashnet.org/cookieclicker/"
+# How the big cookie gets clicked: "loop" runs a clicker inside the page
+# for as long as the bot plays, "burst" sends each batch of clicks in one
+# script call, "webdriver" is one WebDriver click() per click
+CLICK_MODES = ("loop", "burst", "webdriver")
+
 
 class CookieClickerBot:
-    def __init__(self):
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://orteil.dashnet.org/cookieclicker/")
+    def __init__(self, driver=None, url=GAME_URL, click_mode="loop", click_rate=30):
+        if click_mode not in CLICK_MODES:
+            raise ValueError(f"click_mode must be one of {CLICK_MODES}")
+        self.driver = driver or webdriver.Chrome()
+        self.driver.get(url)
         # Wait a bit for the game to load
         time.sleep(5)
+        self.click_mode = click_mode
+        self.click_rate = click_rate
+        self.clicker = PageClicker(self.driver)
+        # Ranks purchases by payback time; its click rate is measured as we go
+        self.planner = PurchasePlanner(clicks=click_rate)
+        self.last_clicks = None  # (time, Game.cookieClicks) at the last read
 
     def setup_game(self):
         """
@@ -55,8 +72,17 @@ class CookieClickerBot:
 
     def click_big_cookie(self, times=50):
         """
-        Click the big cookie multiple times.
+        Click the big cookie multiple times. In "loop" mode this makes sure
+        the in-page clicker is running instead.
         """
+        if self.click_mode == "loop":
+            stats = self.clicker.stats()
+            if not stats or not stats["running"]:
+                self.clicker.start(rate=self.click_rate)
+            return
+        if self.click_mode == "burst":
+            self.clicker.burst(times, interval=1 / self.click_rate)
+            return
         big_cookie = self.driver.find_element(By.ID, "bigCookie")
         for _ in range(times):
             big_cookie.click()
@@ -65,7 +91,7 @@ class CookieClickerBot:
         """
         Buy any upgrades (top row icons) if they are available.
         """
-        upgrade_icons = self.driver.find_elements(By.CSS_SELECTOR, "# upgrades .crate.upgrade.enabled")
+        upgrade_icons = self.driver.find_elements(By.CSS_SELECTOR, "#upgrades .crate.upgrade.enabled")
         for icon in upgrade_icons:
             try:
                 icon.click()
@@ -110,6 +136,32 @@ class CookieClickerBot:
             except NoSuchElementException:
                 pass
 
+    def buy_planned(self, max_buys=50):
+        """
+        Buy whatever pays for itself soonest (see purchase_planner.py), as
+        long as it is affordable; if it isn't yet, save up for it.
+        Returns the number of purchases, or None if the page has no
+        window.Game to read.
+        """
+        state = read_state(self.driver)
+        if state is None:
+            return None
+        now = time.time()
+        if self.last_clicks is not None and now > self.last_clicks[0]:
+            self.planner.clicks = (state["cookieClicks"] - self.last_clicks[1]) / (now - self.last_clicks[0])
+        self.last_clicks = (now, state["cookieClicks"])
+
+        bought = 0
+        while bought < max_buys:
+            self.planner.update(state)
+            best = self.planner.best(state["cookies"], state["cookiesPs"] + self.planner.clicks * state["mouseCps"])
+            if best is None or best[1] > state["cookies"]:
+                break
+            (kind, item), _, _ = best
+            state = buy(self.driver, kind, item)
+            bought += 1
+        return bought
+
     def run(self):
         self.setup_game()
 
@@ -123,8 +175,9 @@ class CookieClickerBot:
 
             # Periodically attempt to buy
             if time.time() - last_buy_time > buy_interval:
-                self.buy_upgrades()
-                self.buy_buildings()
+                if self.buy_planned() is None:
+                    self.buy_upgrades()
+                    self.buy_buildings()
                 last_buy_time = time.time()
 
             cookie_count = self.get_cookie_count()
@@ -134,6 +187,8 @@ class CookieClickerBot:
             time.sleep(0.5)
 
     def close(self):
+        if self.click_mode == "loop":
+            self.clicker.stop()
         self.driver.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""
+The economy of local_pages/cookie, in-process, so purchase strategies can
+be played for hours of game time in seconds.
+
+CookieGame has the page's buildings (base prices and CpS, prices growing
+1.15x per building owned), tiered upgrades and click value, and state()
+returns what CookieClickerBot reads from the page's window.Game.
+
+    game = CookieGame()
+    game.advance(seconds=1.0, clicks=30)
+    game.buy_building(0)
+"""
+import math
+
+BUILDINGS = [
+    ("Cursor", 15, 0.1), ("Grandma", 100, 1), ("Farm", 1100, 8), ("Mine", 12000, 47),
+    ("Factory", 130000, 260), ("Bank", 1400000, 1400), ("Temple", 20000000, 7800),
+    ("Wizard tower", 330000000, 44000),
+]
+# Tiered upgrades: unlocked at this many of the building, priced at this
+# many times its base price; each doubles the building's CpS
+TIERS = [(1, 10), (5, 50), (25, 500)]
+PRICE_GROWTH = 1.15
+FPS = 30
+
+
+class CookieGame:
+    def __init__(self, cookies=0):
+        self.cookies = 0.0
+        self.cookies_earned = 0.0
+        self.cookie_clicks = 0
+        self.amounts = [0] * len(BUILDINGS)
+        self.prices = [base for _, base, _ in BUILDINGS]
+        self.multipliers = [1] * len(BUILDINGS)
+        self.mouse_multiplier = 1
+        # (id, building, unlock at, price), ids in the page's order
+        self.upgrades = [(len(TIERS) * b + t, b, at, BUILDINGS[b][1] * factor)
+                         for b in range(len(BUILDINGS)) for t, (at, factor) in enumerate(TIERS)]
+        self.bought = set()
+        self.time = 0.0
+        self.earn(cookies)
+
+    def earn(self, n):
+        self.cookies += n
+        self.cookies_earned += n
+
+    def stored_cps(self, b):
+        """CpS of one building b."""
+        return BUILDINGS[b][2] * self.multipliers[b]
+
+    @property
+    def cookies_ps(self):
+        return sum(self.amounts[b] * self.stored_cps(b) for b in range(len(BUILDINGS)))
+
+    @property
+    def mouse_cps(self):
+        """Cookies per counted click."""
+        return self.mouse_multiplier
+
+    def upgrades_in_store(self):
+        """Unlocked upgrades not bought yet, cheapest first, like Game.UpgradesInStore."""
+        store = [u for u in self.upgrades if u[0] not in self.bought and self.amounts[u[1]] >= u[2]]
+        return sorted(store, key=lambda u: u[3])
+
+    def buy_building(self, b):
+        if self.cookies < self.prices[b]:
+            return False
+        self.cookies -= self.prices[b]
+        self.amounts[b] += 1
+        self.prices[b] = math.ceil(BUILDINGS[b][1] * PRICE_GROWTH ** self.amounts[b])
+        return True
+
+    def buy_upgrade(self, upgrade_id):
+        for u, b, _, price in self.upgrades_in_store():
+            if u == upgrade_id and self.cookies >= price:
+                self.cookies -= price
+                self.bought.add(u)
+                self.multipliers[b] *= 2
+                if b == 0:
+                    self.mouse_multiplier *= 2
+                return True
+        return False
+
+    def advance(self, seconds, clicks=0):
+        """
+        Let `seconds` of game time pass, in the page's 30 Hz logic frames,
+        with `clicks` counted clicks a second.
+        """
+        frames = round(seconds * FPS)
+        self.earn(frames * self.cookies_ps / FPS + round(clicks * seconds) * self.mouse_cps)
+        self.cookie_clicks += round(clicks * seconds)
+        self.time += frames / FPS
+
+    def state(self):
+        """What CookieClickerBot.read_state() returns for the page."""
+        return {
+            "cookies": self.cookies, "cookiesPs": self.cookies_ps, "mouseCps": self.mouse_cps,
+            "cookieClicks": self.cookie_clicks, "globalMult": 1,
+            "buildings": [[b, self.prices[b], self.amounts[b], self.stored_cps(b)] for b in range(len(BUILDINGS))],
+            "upgrades": [[u, price, b] for u, b, _, price in self.upgrades_in_store()],
+        }
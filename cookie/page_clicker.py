@@ -0,0 +1,107 @@
+"""
+Clicks Cookie Clicker's big cookie from inside the page, so the click rate
+is set by the game instead of by WebDriver round trips (one HTTP request
+per WebDriver click()).
+
+    clicker = PageClicker(driver)
+    clicker.burst(50)         # one execute_async_script, 50 clicks
+    clicker.start(rate=30)    # requestAnimationFrame loop in the page
+    ...
+    clicker.stop()            # {"clicks": sent, "counted": the game's count}
+
+The game ignores a click that comes less than 20 ms after the previous one
+(Game.ClickCookie), and the ignored click still restarts the 20 ms. So
+clicks can't simply be dispatched in a tight loop: both modes space them
+at least MIN_INTERVAL apart. The events carry detail 1, like a real mouse
+click; the game only counts three synthetic (detail 0) clicks a second.
+
+The loop clicks on animation frames, so at 60 Hz its rate is at most 30
+clicks a second (every other frame), and it pauses while the tab is
+hidden, as requestAnimationFrame does.
+"""
+MIN_INTERVAL = 0.021
+
+CLICK_JS = """
+window.__cookieClick = window.__cookieClick || function (target) {
+  target.dispatchEvent(new MouseEvent("click", {bubbles: true, cancelable: true, detail: 1, view: window}));
+};
+"""
+
+BURST_JS = CLICK_JS + """
+var target = document.querySelector(arguments[0]), times = arguments[1], interval = arguments[2] * 1000;
+var done = arguments[arguments.length - 1];
+var before = window.Game ? Game.cookieClicks : null, sent = 0;
+if (!target) { done({clicks: 0, counted: 0}); return; }
+function next() {
+  window.__cookieClick(target);
+  sent += 1;
+  if (sent < times) setTimeout(next, interval);
+  else done({clicks: sent, counted: before === null ? null : Game.cookieClicks - before});
+}
+next();
+"""
+
+START_JS = CLICK_JS + """
+var target = document.querySelector(arguments[0]), interval = arguments[1] * 1000, least = arguments[2] * 1000;
+var loop = window.__cookieLoop;
+if (loop) loop.running = false;
+if (!target) return false;
+loop = window.__cookieLoop = {
+  running: true, clicks: 0, last: -Infinity,
+  before: window.Game ? Game.cookieClicks : null
+};
+function frame() {
+  if (!loop.running) return;
+  // The game's clock, not the frame's. Frame times jitter: a frame a
+  // little early for the next click still gets it, as long as the game
+  // will count it
+  var now = Date.now();
+  if (now - loop.last >= Math.max(least, interval - 4)) {
+    window.__cookieClick(target);
+    loop.clicks += 1;
+    loop.last = now;
+  }
+  window.requestAnimationFrame(frame);
+}
+window.requestAnimationFrame(frame);
+return true;
+"""
+
+STATS_JS = """
+var loop = window.__cookieLoop;
+if (!loop) return null;
+if (arguments[0]) loop.running = false;
+return {clicks: loop.clicks, counted: loop.before === null ? null : Game.cookieClicks - loop.before,
+        running: loop.running};
+"""
+
+
+class PageClicker:
+    def __init__(self, driver, selector="#bigCookie"):
+        self.driver = driver
+        self.selector = selector
+
+    def burst(self, times, interval=MIN_INTERVAL):
+        """
+        Click `times` times, `interval` seconds apart, in one
+        execute_async_script. Returns {"clicks": sent, "counted": clicks
+        the game counted, or None without a window.Game}.
+        """
+        interval = max(MIN_INTERVAL, interval)
+        self.driver.set_script_timeout(max(30, times * interval * 2 + 5))
+        return self.driver.execute_async_script(BURST_JS, self.selector, times, interval)
+
+    def start(self, rate=30):
+        """
+        Start (or restart) the in-page loop at up to `rate` clicks a second.
+        Returns False if there is no big cookie to click.
+        """
+        return self.driver.execute_script(START_JS, self.selector, max(MIN_INTERVAL, 1 / rate), MIN_INTERVAL)
+
+    def stats(self):
+        """The running loop's {"clicks", "counted", "running"}, or None if it was never started."""
+        return self.driver.execute_script(STATS_JS, False)
+
+    def stop(self):
+        """Stop the loop; returns its final stats()."""
+        return self.driver.execute_script(STATS_JS, True)
@@ -0,0 +1,142 @@
+"""
+What CookieClickerBot buys next: the building or upgrade that pays for
+itself soonest.
+
+read_state() is one execute_script call that returns, from window.Game,
+the cookies in the bank, the CpS, the cookies per click and for every
+building its price, count and CpS per building, and for every upgrade in
+store its price and the building it's tied to:
+
+    {"cookies", "cookiesPs", "mouseCps", "cookieClicks", "globalMult",
+     "buildings": [[id, price, amount, cps each], ...],
+     "upgrades": [[id, price, building id or None], ...]}
+
+buy() buys one item and returns the state after, in the same call.
+
+PurchasePlanner ranks items by payback time:
+
+    price / delta CpS  +  max(0, price - cookies) / income
+
+the seconds until it can be bought plus the seconds it then takes to earn
+its price back. Buying a building adds its CpS. A tiered upgrade doubles
+its building, so it adds the building's whole CpS; the Cursor ones also
+double clicks. Upgrades without a building tie can't be valued this way
+and aren't ranked.
+
+The first term only changes for the items a purchase touches (its price,
+or the CpS an upgrade doubles), so the planner keeps items in a heap on it
+and update() re-pushes only the items whose price or delta changed; old
+entries are skipped when they surface. The wait term is never negative,
+so best() walks the heap in payback order and stops at the first item
+whose payback alone is already worse than the best total found.
+"""
+import heapq
+import math
+
+STATE_FN = """
+function __cookieState(G) {
+  if (!G || !G.ObjectsById) return null;
+  return {
+    cookies: G.cookies, cookiesPs: G.cookiesPs, mouseCps: G.computedMouseCps,
+    cookieClicks: G.cookieClicks, globalMult: G.globalCpsMult || 1,
+    buildings: G.ObjectsById.map(function (b) { return [b.id, b.price, b.amount, b.storedCps]; }),
+    upgrades: G.UpgradesInStore.map(function (u) {
+      return [u.id, u.getPrice(), u.buildingTie ? u.buildingTie.id : null];
+    })
+  };
+}
+"""
+
+STATE_JS = STATE_FN + "return __cookieState(window.Game);"
+
+BUY_JS = STATE_FN + """
+var G = window.Game, kind = arguments[0], id = arguments[1];
+if (G) {
+  if (kind === "building") G.ObjectsById[id].buy(1);
+  else G.UpgradesById[id].buy();
+}
+return __cookieState(G);
+"""
+
+BUILDING, UPGRADE = "building", "upgrade"
+
+
+def read_state(driver):
+    """The game's economy in one call, or None if the page has no window.Game."""
+    return driver.execute_script(STATE_JS)
+
+
+def buy(driver, kind, item_id):
+    """Buy building or upgrade `item_id`; returns read_state() after."""
+    return driver.execute_script(BUY_JS, kind, item_id)
+
+
+class PurchasePlanner:
+    """
+    :param clicks: counted clicks per second, for the income and the value
+                   of the Cursor upgrades
+    """
+
+    def __init__(self, clicks=0):
+        self.clicks = clicks
+        self.heap = []      # (payback, version, (kind, id), price)
+        self.current = {}   # (kind, id) -> (version, price, delta)
+        self.version = 0
+        self.pushes = 0
+
+    def _set(self, key, price, delta):
+        old = self.current.get(key)
+        if old is not None and old[1:] == (price, delta):
+            return
+        if delta <= 0:
+            self.current.pop(key, None)
+            return
+        self.version += 1
+        self.current[key] = (self.version, price, delta)
+        heapq.heappush(self.heap, (price / delta, self.version, key, price))
+        self.pushes += 1
+
+    def update(self, state):
+        """Take in a read_state(); re-ranks only what changed since the last one."""
+        mult = state["globalMult"]
+        cps = {}
+        seen = set()
+        for b, price, amount, each in state["buildings"]:
+            cps[b] = amount * each * mult
+            self._set((BUILDING, b), price, each * mult)
+            seen.add((BUILDING, b))
+        for u, price, tie in state["upgrades"]:
+            if tie is None:
+                continue
+            delta = cps.get(tie, 0) + (self.clicks * state["mouseCps"] if tie == 0 else 0)
+            self._set((UPGRADE, u), price, delta)
+            seen.add((UPGRADE, u))
+        for key in set(self.current) - seen:
+            del self.current[key]
+        if len(self.heap) > 4 * len(self.current) + 16:
+            self.heap = [e for e in self.heap if self.current.get(e[2], (None,))[0] == e[1]]
+            heapq.heapify(self.heap)
+
+    def best(self, cookies, income):
+        """
+        ((kind, id), price, payback seconds) of the item to buy next, or None
+        if nothing can be valued. It may not be affordable yet; then it's
+        best to save up for it.
+        """
+        best = None
+        popped = []
+        while self.heap:
+            payback, version, key, price = self.heap[0]
+            if self.current.get(key, (None,))[0] != version:
+                heapq.heappop(self.heap)
+                continue
+            if best is not None and payback >= best[2]:
+                break
+            popped.append(heapq.heappop(self.heap))
+            short = price - cookies
+            wait = 0.0 if short <= 0 else (short / income if income > 0 else math.inf)
+            if best is None or payback + wait < best[2]:
+                best = (key, price, payback + wait)
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return best
@@ -0,0 +1,110 @@
+"""
+FlappyBirdBot against the local copy of the game (local_pages/flappy):
+loop ticks per second and pipes passed per game for
+
+    blind    the old loop: SPACE every 0.15 s, a find_element for the
+             Restart button every iteration
+    state    FlapPilot on window.__flappyState, one read per tick
+    canvas   FlapPilot on getImageData strips of the canvas (?state=0)
+
+    python bench_flappy.py [games]
+    python bench_flappy.py --offline [games]
+
+--offline plays engine_flappy instead (no browser): the pilot at several
+tick lengths against blind flapping, with a 10 minute cap per game.
+"""
+import os
+import statistics
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from engine_flappy import FPS, FlappyGame
+from flappy_state import FlapPilot
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+
+MAX_FRAMES = 600 * FPS
+
+
+def report(name, pipes, rate=None):
+    pipes = sorted(pipes)
+    quartiles = statistics.quantiles(pipes, n=4) if len(pipes) > 1 else pipes * 3
+    line = (f"{name:<16} pipes mean {statistics.mean(pipes):6.1f}  min {pipes[0]:4d}  "
+            f"p25 {quartiles[0]:6.1f}  median {quartiles[1]:6.1f}  p75 {quartiles[2]:6.1f}  max {pipes[-1]:4d}")
+    if rate is not None:
+        line += f"  {rate:6.1f} ticks/s"
+    print(line)
+
+
+def blind_loop(bot):
+    body = bot.driver.find_element(By.TAG_NAME, "body")
+    ticks = 0
+    while not bot.is_game_over():
+        body.send_keys(Keys.SPACE)
+        ticks += 1
+        time.sleep(0.15)
+    return ticks
+
+
+def bench_browser(games):
+    from local_pages import headless_chrome, page_url
+    from fb import FlappyBirdBot
+
+    driver = headless_chrome()
+    try:
+        for mode, query in (("blind", "?seed=1"), ("state", "?seed=1"), ("canvas", "?seed=1&state=0")):
+            bot = FlappyBirdBot(driver=driver, url=page_url("flappy", query))
+            pipes, ticks, seconds = [], 0, 0.0
+            for _ in range(games):
+                bot.start_game()
+                start = time.perf_counter()
+                ticks += blind_loop(bot) if mode == "blind" else bot.keep_flapping()
+                seconds += time.perf_counter() - start
+                pipes.append(driver.execute_script("return window.__flappyScore();"))
+                driver.find_element(By.CSS_SELECTOR, "button[onclick*='restart']").click()
+            report(mode, pipes, ticks / seconds)
+    finally:
+        driver.quit()
+
+
+def play_offline(seed, tick_frames, latency_frames=1, blind=False):
+    game = FlappyGame(seed=seed)
+    pilot = FlapPilot(tick=tick_frames / FPS, latency=latency_frames / FPS)
+    game.flap()
+    while not game.over and game.frames < MAX_FRAMES:
+        if blind:
+            flap = True
+        else:
+            state = game.state()
+            flap = pilot.decide(game.frames / FPS, state["y"], state["pipes"], state["velocity"])
+        advance(game, latency_frames)
+        if flap:
+            game.flap()
+        advance(game, tick_frames - latency_frames)
+    return game.score
+
+
+def advance(game, frames):
+    """One frame per update, as the page runs at 60 Hz, with a hit test each."""
+    for _ in range(frames):
+        if game.step(1):
+            return
+
+
+def bench_offline(games):
+    report("blind 150 ms", [play_offline(seed, 9, blind=True) for seed in range(games)])
+    for ms in (33, 50, 100):
+        tick = round(ms * FPS / 1000)
+        report(f"pilot {ms} ms", [play_offline(seed, tick) for seed in range(games)])
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    games = int(args[0]) if args else 20
+    if "--offline" in sys.argv:
+        bench_offline(games)
+    else:
+        bench_browser(games)
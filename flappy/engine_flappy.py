@@ -0,0 +1,108 @@
+"""
+Flappy Bird as played on local_pages/flappy, in-process, so FlapPilot can
+be scored over many games without a browser.
+
+FlappyGame follows the page's physics, pipes and seeded course (the same
+mulberry32 stream, so ?seed=N and FlappyGame(seed=N) lay out the same
+gaps), and state() returns what the page's window.__flappyState() does.
+
+    game = FlappyGame(seed=1)
+    game.flap()                 # starts the game, like the first SPACE
+    over = game.step(frames=2)
+"""
+import numpy as np
+
+WIDTH, HEIGHT, GROUND, FPS = 288, 512, 400, 60
+BIRD_X, BIRD_WIDTH, BIRD_HEIGHT, BIRD_START = 60, 34, 24, 200
+GRAVITY, FLAP_VELOCITY, MAX_FALL = 0.25, -4.6, 8
+PIPE_WIDTH, GAP, PIPE_SPACING, SPEED, GAP_MARGIN = 52, 100, 170, 2, 80
+
+_M32 = 0xFFFFFFFF
+
+
+def mulberry32(seed):
+    """The page's seeded Math.random replacement."""
+    a = seed & _M32
+
+    def random():
+        nonlocal a
+        a = (a + 0x6D2B79F5) & _M32
+        t = a
+        t = ((t ^ (t >> 15)) * (t | 1)) & _M32
+        t ^= (t + ((t ^ (t >> 7)) * (t | 61))) & _M32
+        return ((t ^ (t >> 14)) & _M32) / 4294967296
+
+    return random
+
+
+class FlappyGame:
+    def __init__(self, seed=None):
+        self.random = mulberry32(seed) if seed is not None else np.random.default_rng().random
+        self.reset()
+
+    def reset(self):
+        """The start screen, like the Restart button."""
+        self.y = float(BIRD_START)
+        self.velocity = 0.0
+        self.pipes = []  # [x, gapTop, passed]
+        self.score = 0
+        self.running = False
+        self.over = False
+        self.frames = 0
+
+    def _add_pipe(self, x):
+        gap_top = GAP_MARGIN + int(self.random() * (GROUND - 2 * GAP_MARGIN - GAP))
+        self.pipes.append([x, gap_top, False])
+
+    def flap(self):
+        """SPACE: starts the game on the start screen, flaps while playing."""
+        if self.over:
+            return
+        if not self.running:
+            self.running = True
+            self._add_pipe(WIDTH + 100)
+        self.velocity = FLAP_VELOCITY
+
+    def _hits(self, pipe):
+        x, gap_top, _ = pipe
+        if BIRD_X + BIRD_WIDTH - 2 <= x or x + PIPE_WIDTH <= BIRD_X + 2:
+            return False
+        return self.y + 2 < gap_top or self.y + BIRD_HEIGHT - 2 > gap_top + GAP
+
+    def step(self, frames=1):
+        """
+        Advance `frames` 60 Hz frames (fractions allowed) in one update,
+        with one hit test at the end. Returns whether the game is over. The
+        page updates a frame at a time (at most 4 after a stall), so play
+        it with step(1).
+        """
+        if not self.running:
+            return self.over
+        self.frames += frames
+        self.velocity = min(MAX_FALL, self.velocity + GRAVITY * frames)
+        self.y += self.velocity * frames
+        if self.y < 0:
+            self.y = 0.0
+            self.velocity = 0.0
+        for pipe in self.pipes:
+            pipe[0] -= SPEED * frames
+            if not pipe[2] and pipe[0] + PIPE_WIDTH < BIRD_X:
+                pipe[2] = True
+                self.score += 1
+        self.pipes = [p for p in self.pipes if p[0] + PIPE_WIDTH > 0]
+        if self.pipes[-1][0] <= WIDTH - PIPE_SPACING:
+            self._add_pipe(self.pipes[-1][0] + PIPE_SPACING)
+
+        if self.y + BIRD_HEIGHT >= GROUND or any(self._hits(p) for p in self.pipes):
+            self.y = min(self.y, GROUND - BIRD_HEIGHT)
+            self.running = False
+            self.over = True
+        return self.over
+
+    def state(self):
+        """Same fields as the page's window.__flappyState()."""
+        return {
+            "y": self.y, "velocity": self.velocity, "over": self.over, "score": self.score,
+            "running": self.running,
+            "pipes": [[x, x + PIPE_WIDTH, gap_top, gap_top + GAP] for x, gap_top, _ in self.pipes],
+        }
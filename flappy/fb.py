@@ -1,16 +1,59 @@
+import os
+import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "RL"))
+sys.path.insert(0, os.path.join(HERE, "..", "trexrunner"))
+from canvas_capture import CanvasCapture
+from flappy_state import FlappyReader, FlapPilot
+from frame_store import FrameWriter
+
+GAME_URL = "https://flappybird.io/"
+
 class FlappyBirdBot:
-    def __init__(self):
+    def __init__(self, driver=None, url=GAME_URL):
         # Launch a new browser session
-        self.driver = webdriver.Chrome()
+        self.driver = driver or webdriver.Chrome()
         # Navigate to the Flappy Bird clone site
-        self.driver.get("https://flappybird.io/")
+        self.driver.get(url)
         time.sleep(2)  # Let the page load
+        self.capture = None
+        self.recorder = None
+
+        # One read of the bird and the pipes per tick, and the pilot that
+        # decides from them when to flap
+        self.reader = FlappyReader(self.driver)
+        self.tick = 0.01
+        self.pilot = FlapPilot(tick=self.tick + 0.02, latency=0.01)
+        # Without a readable bird, flap blindly every this many seconds
+        self.blind_interval = 0.15
+
+    def start_recording(self, path):
+        """
+        Record every tick from now on (the whole game canvas, its time,
+        whether SPACE was sent and whether the game was over) to the frame
+        store at `path`, see RL/frame_store.py.
+        """
+        width, height = self.driver.execute_script(
+            "var c = document.querySelector('canvas'); return [c.clientWidth, c.clientHeight];")
+        self.capture = CanvasCapture(self.driver, {"canvas": (0, 0, width, height)}, selector="canvas")
+        self.recorder = FrameWriter(path, self.capture.regions, keys=("flap",), labels=("game_over",))
+        return self.recorder
+
+    def record_tick(self, flapped, game_over):
+        """
+        Add this tick to the recording, if there is one.
+        """
+        if self.recorder is None:
+            return
+        frame = self.capture.grab()
+        if frame is not None:
+            self.recorder.add(time.perf_counter(), frame, keys=("flap",) if flapped else (), labels=(int(game_over),))
 
     def start_game(self):
         """
@@ -35,18 +78,34 @@ class FlappyBirdBot:
 
     def keep_flapping(self):
         """
-        Repeatedly press SPACE to keep the bird in the air.
+        Flap whenever the bird would otherwise drop below the next gap,
+        until the game is over. Each tick is one read of the game (its
+        state, or the canvas) that also says whether it's over.
+        Returns the number of ticks.
         """
         body = self.driver.find_element(By.TAG_NAME, "body")
-        # Press space every 0.15s
+        self.pilot.reset()
+        ticks = 0
+        last_flap = 0.0
         while True:
+            state = self.reader.read()
+            now = time.perf_counter()
+            ticks += 1
             # If we detect 'Restart', game is over
-            if self.is_game_over():
+            if state["over"]:
+                self.record_tick(False, True)
                 print("Game Over!")
-                break
+                return ticks
 
-            body.send_keys(Keys.SPACE)
-            time.sleep(0.15)
+            if state["y"] is not None:
+                flap = self.pilot.decide(now, state["y"], state["pipes"], state["velocity"])
+            else:
+                flap = now - last_flap >= self.blind_interval
+            if flap:
+                body.send_keys(Keys.SPACE)
+                last_flap = now
+            self.record_tick(flap, False)
+            time.sleep(self.tick)
 
     def run(self):
         """
@@ -58,6 +117,8 @@ class FlappyBirdBot:
         self.start_game()
         self.keep_flapping()
         time.sleep(2)
+        if self.recorder is not None:
+            self.recorder.close()
         self.driver.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""
+Per-tick reads of the Flappy Bird page for FlappyBirdBot, and the flap
+decision.
+
+FlappyReader.read() is one execute_script call per tick. It returns the
+bird's y, the pipes ahead and whether the game is over (the Restart button
+is showing). When the page exposes its state (local_pages/flappy's
+window.__flappyState) it is read directly, velocity included; otherwise
+the script reads a few thin strips of the canvas with getImageData and
+finds the bird and the pipes by colour in the page:
+
+    - the column through the middle of the bird: the bird's top edge
+    - the top row of the canvas: where the pipes are (every pipe reaches it)
+    - the column through the middle of each pipe: its gap
+
+FlapPilot predicts the bird's fall frame by frame up to when the next
+tick's flap could land (gravity, the flap's fixed upward velocity, the
+page's top fall speed) and flaps now if by then it would hit the pipe it
+is passing, or be lower than the gap of the pipe it is heading for
+(unless the flap would rise into that pipe's top; then it waits a tick).
+Times passed in are seconds; inside it's 60 Hz frames and canvas pixels,
+the units the page moves in.
+"""
+import math
+
+from engine_flappy import (BIRD_HEIGHT, BIRD_WIDTH, BIRD_X, FLAP_VELOCITY, FPS, GRAVITY, GROUND,
+                           MAX_FALL, SPEED)
+
+READ_JS = """
+var selector = arguments[0], birdX = arguments[1], birdWidth = arguments[2], ground = arguments[3];
+var restart = document.querySelector("button[onclick*='restart']");
+var over = !!(restart && restart.offsetParent !== null);
+if (window.__flappyState) {
+  var s = window.__flappyState();
+  return {source: "state", y: s.y, velocity: s.velocity, pipes: s.pipes, over: over || s.over, score: s.score};
+}
+var canvas = document.querySelector(selector);
+var ctx = canvas && canvas.getContext && canvas.getContext("2d");
+if (!ctx) return {source: null, y: null, velocity: null, pipes: [], over: over, score: null};
+var scale = canvas.width / (canvas.clientWidth || canvas.width);
+var width = canvas.clientWidth || canvas.width;
+function isPipe(d, p) { return d[p + 1] > d[p] + 40 && d[p + 1] > d[p + 2] + 40; }
+function isBird(d, p) { return d[p] > 200 && d[p + 1] > 150 && d[p + 2] < 100; }
+function column(x) {
+  return ctx.getImageData(Math.round(x * scale), 0, 1, Math.round(ground * scale)).data;
+}
+var result = {source: "canvas", y: null, velocity: null, pipes: [], over: over, score: null};
+try {
+  var d = column(birdX + birdWidth / 2);
+  for (var y = 0; y < ground; y++) {
+    if (isBird(d, Math.floor(y * scale) * 4)) { result.y = y; break; }
+  }
+  var row = ctx.getImageData(0, Math.round(scale), Math.round(width * scale), 1).data;
+  var start = -1;
+  for (var x = 0; x <= width && result.pipes.length < 2; x++) {
+    var pipe = x < width && isPipe(row, Math.floor(x * scale) * 4);
+    if (pipe && start < 0) start = x;
+    if (!pipe && start >= 0) {
+      if (x > birdX) {
+        var c = column((start + x) / 2), top = -1, bottom = ground;
+        for (var j = 0; j < ground; j++) {
+          var inPipe = isPipe(c, Math.floor(j * scale) * 4);
+          if (top < 0 && !inPipe) top = j;
+          else if (top >= 0 && inPipe) { bottom = j; break; }
+        }
+        result.pipes.push([start, x, top, bottom]);
+      }
+      start = -1;
+    }
+  }
+} catch (e) {
+  result.source = null;  // tainted canvas
+}
+return result;
+"""
+
+
+class FlappyReader:
+    def __init__(self, driver, selector="canvas"):
+        self.driver = driver
+        self.selector = selector
+        self.reads = 0
+
+    def read(self):
+        """
+        {"source": "state" | "canvas" | None, "y": bird top or None,
+        "velocity": px per frame or None (not visible on the canvas),
+        "pipes": [[left, right, gapTop, gapBottom], ...], "over": bool}
+        """
+        self.reads += 1
+        return self.driver.execute_script(READ_JS, self.selector, BIRD_X, BIRD_WIDTH, GROUND)
+
+
+def next_pipe(pipes, frames=0):
+    """The first pipe the bird won't have got past `frames` frames from now, or None."""
+    ahead = [p for p in pipes if p[1] - SPEED * frames > BIRD_X]
+    return min(ahead, key=lambda p: p[0]) if ahead else None
+
+
+class FlapPilot:
+    """
+    decide(t, y, pipes, velocity=None) says whether to flap now. Without
+    a velocity (canvas reads) it is estimated from the last read and the
+    last flap.
+
+    :param tick: expected seconds between decide() calls, refined as they come
+    :param latency: seconds between the read and the flap reaching the game
+    :param margin: pixels kept between the bird and the bottom of the gap
+    """
+
+    def __init__(self, tick=0.03, latency=0.01, margin=8):
+        self.initial_tick = tick * FPS
+        self.latency = latency * FPS
+        self.margin = margin
+        self.reset()
+
+    def reset(self):
+        """Call at the start of each game."""
+        self.tick = self.initial_tick
+        self.last = None
+        self.last_y = None
+        self.flapped_at = None
+
+    def estimate_velocity(self, now, y):
+        if self.flapped_at is not None and self.last is not None and self.flapped_at + self.latency > self.last:
+            # A flap landed since the last read: it set the velocity
+            return min(MAX_FALL, FLAP_VELOCITY + GRAVITY * max(0.0, now - self.flapped_at - self.latency))
+        if self.last_y is None or now <= self.last:
+            return 0.0
+        elapsed = now - self.last
+        # Average velocity over the interval, moved on to now
+        return min(MAX_FALL, (y - self.last_y) / elapsed + GRAVITY * elapsed / 2)
+
+    @staticmethod
+    def fall(y, velocity, frames):
+        """The bird's top after each of the next ceil(frames) frames without a flap."""
+        out = []
+        for k in range(1, math.ceil(frames) + 1):
+            step = min(1.0, frames - k + 1)
+            velocity = min(MAX_FALL, velocity + GRAVITY * step)
+            y += velocity * step
+            out.append(y)
+        return out
+
+    def decide(self, t, y, pipes, velocity=None):
+        now = t * FPS
+        if self.last is not None and now > self.last:
+            self.tick += 0.2 * (now - self.last - self.tick)
+        if velocity is None:
+            velocity = self.estimate_velocity(now, y)
+        self.last, self.last_y = now, y
+
+        # Flap now if waiting for the next tick's flap to land would be too
+        # late; the page moves in whole frames, so keep one more
+        lead = self.tick + self.latency + 1
+        path = self.fall(y, velocity, lead)
+        for k, top in enumerate(path, 1):
+            bottom = top + BIRD_HEIGHT
+            if bottom >= GROUND:
+                return self._flap(now)
+            for left, right, gap_top, gap_bottom in pipes:
+                # The page's hit test, with its 2 px of slack
+                shift = SPEED * k
+                if left - shift < BIRD_X + BIRD_WIDTH - 2 and right - shift > BIRD_X + 2 and bottom - 2 > gap_bottom:
+                    return self._flap(now)
+        # Then be above the bottom of the gap the bird is heading for, unless
+        # flapping now would rise into the top of a pipe; the next tick can
+        # still flap
+        pipe = next_pipe(pipes, lead)
+        floor = pipe[3] - self.margin if pipe else GROUND - 100
+        if path[-1] + BIRD_HEIGHT > floor and not self._hits_top(y, velocity, pipes):
+            return self._flap(now)
+        return False
+
+    def _hits_top(self, y, velocity, pipes):
+        """Whether a flap landing after the latency would take the bird into a pipe's top."""
+        wait = self.fall(y, velocity, self.latency)
+        top = wait[-1] if wait else y
+        velocity = FLAP_VELOCITY
+        for k in range(len(wait) + 1, len(wait) + 1 + math.ceil(-FLAP_VELOCITY / GRAVITY)):
+            velocity += GRAVITY
+            top += velocity
+            shift = SPEED * k
+            for left, right, gap_top, _ in pipes:
+                if left - shift < BIRD_X + BIRD_WIDTH - 2 and right - shift > BIRD_X + 2 and top + 2 < gap_top:
+                    return True
+        return False
+
+    def _flap(self, now):
+        self.flapped_at = now
+        return True
@@ -1,3 +1,5 @@
+import os
+import sys
 import time
 import numpy as np
 
@@ -5,10 +7,25 @@ from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoSuchElementException
 
+# The engine, solver and board reader live in RL/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "RL"))
+import engine_2048 as engine
+from board_reader_2048 import install_move_watch, read_board, read_state, wait_for_board, wait_for_move
+from policies_2048 import priority_policy
+from solver_2048 import ExpectimaxSolver
+
 # 1. Define the URL of the 2048 game
 #GAME_URL = "https://play2048.co/"
 GAME_URL = "https://gabrielecirulli.github.io/2048/"
 
+# Set to True to pick every move with the expectimax solver instead of
+# the fixed up/left/right/down order
+USE_EXPECTIMAX = False
+
+# Seed for the bot's own randomness (the delays), None for a fresh one
+SEED = None
+rng = np.random.default_rng(SEED)
+
 # 2. Set up Selenium (Chrome)
 options = webdriver.ChromeOptions()
 # Comment out headless if you actually want to see the browser window
@@ -16,7 +33,9 @@ options = webdriver.ChromeOptions()
 driver = webdriver.Chrome(options=options)
 driver.get(GAME_URL)
 
-time.sleep(2)  # give browser a moment to load
+wait_for_board(driver)  # give browser a moment to load
+# Lets wait_for_move() see when the page has finished a move
+install_move_watch(driver)
 
 # 3. Grab the main container (body) for sending keys
 game_board = driver.find_element("tag name", "body")
@@ -24,88 +43,72 @@ game_board = driver.find_element("tag name", "body")
 # 4. Function to mimic human-like (random) delay
 def get_human_like_delay():
     # mean=0.5s, std=0.05s but absolute value to avoid negative
-    return abs(np.random.normal(loc=0.01, scale=0.05))
+    return abs(rng.normal(loc=0.01, scale=0.05))
 
 # 5. A simple “try up, else left, else right, else down” strategy
-def make_move():
+# Engine actions are UP, DOWN, LEFT, RIGHT in that order
+ACTION_KEYS = [Keys.ARROW_UP, Keys.ARROW_DOWN, Keys.ARROW_LEFT, Keys.ARROW_RIGHT]
+
+# 5b. Or let the expectimax solver pick the move from the current grid.
+# Any policy from RL/policies_2048.py (packed board -> action) fits here.
+solver = ExpectimaxSolver(time_budget=0.005) if USE_EXPECTIMAX else None
+policy = solver.best_action if solver is not None else priority_policy
+
+def make_move(board=None):
     """
-    Attempt an 'UP' move first. If it doesn't change the board, try
-    LEFT -> RIGHT -> DOWN, in that order, until you find a move that changes.
-    This helps keep high-value tiles in a corner. 
+    Pick the move locally and send only that key. The engine works out
+    which of up/left/right/down change the board from a single read, so
+    nothing is tried on the page. The default policy keeps the old order:
+    UP if it changes the board, else LEFT -> RIGHT -> DOWN, which keeps
+    high-value tiles in a corner.
+
+    :param board: the current grid if already known, e.g. from the last move
+    Returns the page state after the move (see board_reader_2048.read_state).
     """
-    move_order = [Keys.ARROW_UP, Keys.ARROW_LEFT, Keys.ARROW_RIGHT, Keys.ARROW_DOWN]
-    
-    # We'll attempt each move in sequence until something changes.
-    # To detect change, we can read the text from the tile containers before and after.
-    
-    before_board = get_board_state()
-    
-    for move in move_order:
-        game_board.send_keys(move)
-        time.sleep(get_human_like_delay())
-        
-        after_board = get_board_state()
-        
-        # If board changed, break out of loop
-        if after_board != before_board:
-            break
+    if board is None:
+        board = get_board_grid()
+    action = policy(engine.pack(board))
+    if action is None:
+        # Nothing changes the board: the game is over, let the page say so
+        return read_state(driver)
+    game_board.send_keys(ACTION_KEYS[action])
+    # Wait for the page to finish the move; this also reads the new board
+    return wait_for_move(driver)
 
-def get_board_state():
+def get_board_grid():
     """
-    Reads the current board tiles from the webpage and returns 
-    a tuple of tile values (or any representation) so we can 
-    detect if a move had any effect.
+    Reads the 4x4 grid of tile values in a single execute_script call.
     """
-    tiles = driver.find_elements("class name", "tile")
-    print("DEBUG: Found", len(tiles), "tiles")
-
-
-    
-    # Each tile has classes like 'tile tile-2 tile-position-1-2 tile-new'
-    # We can extract the 'tile-2' part to get the value:
-    tile_values = []
-    for t in tiles:
-        class_str = t.get_attribute("class")
-        # class_str might look like: "tile tile-4 tile-position-2-1 tile-merged"
-        # We'll parse out the part that says tile-X
-        for c in class_str.split():
-            if c.startswith("tile-") and c != "tile-position" and c != "tile-new" and c != "tile-merged":
-                # e.g. c = "tile-4"
-                # Remove "tile-" to get just the number
-                try:
-                    val = int(c.split("-")[1])
-                    tile_values.append(val)
-                except:
-                    pass
-    # return a tuple so it's hashable/comparable
-    return tuple(sorted(tile_values))
+    return read_board(driver)
 
 # 6. Main game loop
 print("Starting 2048 bot. Press CTRL+C to stop.")
 
 try:
+    board = get_board_grid()
     while True:
-        make_move()
+        state = make_move(board)
+        board = state["board"]
         
-        # After each move or sequence, check if game is over
+        # After each move, check if game is over
         # The game might declare "Game over!" or show a 'try again' button
-        try:
-            game_over_message = driver.find_element("class name", "game-message")
-            if game_over_message.is_displayed():
-                # If "Game over!" is displayed, attempt to click "Try again"
-                print("Game Over! Restarting...")
+        if state["message"]:
+            # If "Game over!" is displayed, attempt to click "Try again"
+            print("Game Over! Restarting...")
+            try:
                 retry_button = driver.find_element("class name", "retry-button")
                 retry_button.click()
-                time.sleep(2)
-        except NoSuchElementException:
-            # Not over yet
-            pass
+                board = wait_for_move(driver, timeout=2.0)["board"]
+            except NoSuchElementException:
+                board = get_board_grid()
         
         # add a short delay to avoid spamming
         time.sleep(get_human_like_delay())
 
 except KeyboardInterrupt:
     print("Bot stopped by user.")
+    if solver is not None:
+        print(solver.stats())
 
 finally:
     driver.quit()
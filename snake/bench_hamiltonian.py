@@ -0,0 +1,83 @@
+"""
+SnakeBot's planners on the simulator (engine_snake): apples per game,
+games that fill the board, and per-decision latency. "bfs" and
+"hamiltonian" go through SnakeBot.choose_direction as on the page;
+"cycle only" times HamiltonianPlanner.decide on flat cells by itself.
+
+    python bench_hamiltonian.py [games]
+"""
+import sys
+import time
+
+import numpy as np
+
+import engine_snake as engine
+from bench_snake_engine import ACTION_OF
+from hamiltonian import HamiltonianPlanner
+from snake import SnakeBot
+
+
+def play_bot(seed, max_moves, planner):
+    bot = SnakeBot.offline(planner)
+    if bot.hamiltonian is not None:
+        bot.hamiltonian.reset()
+    game = engine.SnakeGame(rng=np.random.default_rng(seed))
+    bot.direction = "DOWN"
+    latencies = []
+    w = game.width
+    while not game.over and game.food >= 0 and game.moves < max_moves:
+        snake = [(int(i) % w, int(i) // w) for i in game.cells()]
+        food = (game.food % w, game.food // w)
+        bot.head = snake[0]
+        start = time.perf_counter()
+        direction = bot.choose_direction(snake, food, game.grid)
+        latencies.append(time.perf_counter() - start)
+        if not bot.is_opposite(direction):
+            bot.direction = direction
+        game.step(ACTION_OF[bot.direction])
+    return game, latencies
+
+
+def play_hamiltonian(seed, max_moves, planner):
+    game = engine.SnakeGame(rng=np.random.default_rng(seed))
+    planner.reset()
+    latencies = []
+    while not game.over and game.food >= 0 and game.moves < max_moves:
+        start = time.perf_counter()
+        cell = planner.decide(game.head_cell, game.tail_cell, game.length, game.food, game.grid)
+        latencies.append(time.perf_counter() - start)
+        if cell is None:
+            # Not on the cycle yet; any safe move
+            safe = game.safe_actions()
+            action = safe[0] if safe else game.direction
+        else:
+            action = engine.direction_between(game.width, game.head_cell, cell)
+        game.step(action)
+    return game, latencies
+
+
+def report(name, games, latencies, seconds):
+    apples = np.array([g.score for g in games])
+    full = sum(g.food < 0 for g in games)
+    died = sum(g.over for g in games)
+    moves = np.array([g.moves for g in games])
+    lat = 1e6 * np.array(latencies)
+    print(f"{name:<12} apples mean {apples.mean():6.1f} min {apples.min():4d} max {apples.max():4d}  "
+          f"board filled {full}/{len(games)}  died {died}  moves/game {moves.mean():8,.0f}  "
+          f"decision p50 {np.percentile(lat, 50):6.1f} us  p99 {np.percentile(lat, 99):6.1f} us  "
+          f"max {lat.max():7.1f} us  ({seconds:.1f} s)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    max_moves = 200000
+
+    for name in ("bfs", "hamiltonian"):
+        start = time.perf_counter()
+        results = [play_bot(seed, max_moves, name) for seed in range(n)]
+        report(name, [g for g, _ in results], [t for _, lat in results for t in lat], time.perf_counter() - start)
+
+    planner = HamiltonianPlanner()
+    start = time.perf_counter()
+    results = [play_hamiltonian(seed, max_moves, planner) for seed in range(n)]
+    report("cycle only", [g for g, _ in results], [t for _, lat in results for t in lat], time.perf_counter() - start)
@@ -0,0 +1,95 @@
+"""
+Searches per second of the snake pathfinders on full 21x15 boards at
+several occupancies: SnakeBot's old dict-and-deque BFS, GridPathfinder's
+BFS and A*, and the tail-reachable check on snakes of about that length.
+Every search goes from a random free cell to another.
+
+    python bench_pathfinder.py [searches per occupancy]
+"""
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+import engine_snake as engine
+from pathfinder import GridPathfinder
+
+OCCUPANCIES = (0.0, 0.1, 0.3, 0.5, 0.7)
+
+
+def find_path_dict(start, target, obstacles, width=engine.WIDTH, height=engine.HEIGHT):
+    """The old SnakeBot.find_path: tuples, a visited dict and a deque per call."""
+    queue = deque()
+    queue.append(start)
+    visited = {start: None}
+    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            path = []
+            while current != start:
+                path.append(current)
+                current = visited[current]
+            return path[::-1]
+        for dx, dy in directions:
+            nx, ny = current[0] + dx, current[1] + dy
+            next_pos = (nx, ny)
+            if (0 <= nx < width and 0 <= ny < height and
+                    next_pos not in obstacles and next_pos not in visited):
+                visited[next_pos] = current
+                queue.append(next_pos)
+    return None
+
+
+def random_boards(occupancy, n, rng):
+    """n (blocked bytes, obstacle set, start, target) with start and target free."""
+    size, w = engine.WIDTH * engine.HEIGHT, engine.WIDTH
+    boards = []
+    for _ in range(n):
+        blocked = rng.random(size) < occupancy
+        start, target = rng.choice(size, 2, replace=False)
+        blocked[start] = blocked[target] = False
+        obstacles = {(int(c) % w, int(c) // w) for c in np.flatnonzero(blocked)}
+        boards.append((bytes(blocked.astype(np.uint8)), obstacles, int(start), int(target)))
+    return boards
+
+
+def snake_bodies(occupancy, n, rng):
+    """
+    n bodies of occupancy * 315 cells: random stretches of a snake winding
+    row by row over the board, the shape a long snake is forced into.
+    """
+    w, h = engine.WIDTH, engine.HEIGHT
+    winding = [y * w + (x if y % 2 == 0 else w - 1 - x) for y in range(h) for x in range(w)]
+    length = max(3, int(occupancy * w * h))
+    bodies = []
+    for _ in range(n):
+        start = int(rng.integers(len(winding) - length + 1))
+        body = winding[start:start + length]
+        bodies.append(body[::-1] if rng.random() < 0.5 else body)
+    return bodies
+
+
+def rate(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    finder = GridPathfinder()
+    w = engine.WIDTH
+    print(f"{'occupancy':>9} {'found':>6} {'dict BFS':>10} {'BFS':>10} {'A*':>10} {'tail check':>11}  searches/s")
+    for occupancy in OCCUPANCIES:
+        boards = random_boards(occupancy, n, rng)
+        found = sum(finder.find_path(s, t, b) is not None for b, _, s, t in boards) / n
+        old = rate(lambda x: find_path_dict((x[2] % w, x[2] // w), (x[3] % w, x[3] // w), x[1]), boards)
+        bfs = rate(lambda x: finder.find_path(x[2], x[3], x[0]), boards)
+        astar = rate(lambda x: finder.find_path(x[2], x[3], x[0], astar=True), boards)
+        bodies = snake_bodies(occupancy, n, rng)
+        tail = rate(finder.tail_reachable, bodies)
+        print(f"{occupancy:>9.0%} {found:>6.0%} {old:>10,.0f} {bfs:>10,.0f} {astar:>10,.0f} {tail:>11,.0f}")
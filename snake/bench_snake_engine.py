@@ -0,0 +1,90 @@
+"""
+Throughput of the snake simulator (engine_snake), its envs, and SnakeBot's
+planner played offline on it.
+
+    python bench_snake_engine.py [planner games]
+"""
+import sys
+import time
+
+import numpy as np
+
+import engine_snake as engine
+from snake_env import BatchedSnakeVecEnv, LocalSnakeEnv
+
+
+def bench_game(n_steps=200000):
+    """SnakeGame.step() calls per second, random actions, new game on death."""
+    rng = np.random.default_rng(0)
+    game = engine.SnakeGame(rng=rng)
+    actions = rng.integers(4, size=n_steps).tolist()
+    start = time.perf_counter()
+    for a in actions:
+        if game.step(a)[1]:
+            game.reset()
+    return n_steps / (time.perf_counter() - start)
+
+
+def bench_env(n_steps=100000):
+    """LocalSnakeEnv.step() calls per second, observation included."""
+    env = LocalSnakeEnv()
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(4, size=n_steps).tolist()
+    start = time.perf_counter()
+    for a in actions:
+        _, _, terminated, truncated, _ = env.step(a)
+        if terminated or truncated:
+            env.reset()
+    return n_steps / (time.perf_counter() - start)
+
+
+def bench_vec_env(num_envs, seconds=2.0):
+    env = BatchedSnakeVecEnv(num_envs=num_envs, seed=0)
+    env.reset()
+    actions = np.random.default_rng(0).integers(4, size=(64, num_envs))
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for a in actions:
+            env.step(a)
+        steps += len(actions)
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+ACTION_OF = {name: a for a, name in enumerate(engine.ACTION_NAMES)}
+
+
+def bench_planner(games, max_moves=5000):
+    """SnakeBot.choose_direction playing whole games on the simulator."""
+    from snake import SnakeBot
+
+    bot = SnakeBot.offline("bfs")
+    scores, decisions, elapsed = [], 0, 0.0
+    for seed in range(games):
+        game = engine.SnakeGame(rng=np.random.default_rng(seed))
+        bot.direction = "DOWN"
+        while not game.over and game.moves < max_moves:
+            w = game.width
+            snake = [(int(i) % w, int(i) // w) for i in game.cells()]
+            food = (game.food % w, game.food // w) if game.food >= 0 else None
+            bot.head = snake[0]
+            start = time.perf_counter()
+            direction = bot.choose_direction(snake, food)
+            elapsed += time.perf_counter() - start
+            decisions += 1
+            if not bot.is_opposite(direction):
+                bot.direction = direction
+            game.step(ACTION_OF[bot.direction])
+        scores.append(game.score)
+    return np.array(scores), decisions / elapsed, 1000 * elapsed / decisions
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"SnakeGame.step      {bench_game():>12,.0f} steps/s")
+    print(f"LocalSnakeEnv.step  {bench_env():>12,.0f} steps/s")
+    for n in (1, 64, 1024, 4096):
+        print(f"BatchedSnakeVecEnv N={n:>5}: {bench_vec_env(n):>12,.0f} env steps/s")
+    scores, rate, ms = bench_planner(games)
+    print(f"SnakeBot BFS planner, {games} games: mean score {scores.mean():.1f}, max {scores.max()}, "
+          f"{rate:,.0f} decisions/s ({ms:.3f} ms each)")
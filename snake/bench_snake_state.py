@@ -0,0 +1,60 @@
+"""
+Per-tick state latency of SnakeBot against the local snake page
+(local_pages/snake): scanning the class of every cell (before) vs applying
+the cell changes the in-page observer logged (after). Also checks on every
+tick that both agree on the snake and the food.
+
+    python bench_snake_state.py [ticks]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from local_pages import headless_chrome, page_url
+from snake import SnakeBot
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(f"{name:<24} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    # A slow tick so the full scan fits inside one
+    bot = SnakeBot(driver=headless_chrome(), url=page_url("snake", "?seed=1&tick=1000&countdown=0"))
+    scan_ms, tracked_ms = [], []
+    mismatches = games = 0
+    try:
+        bot.start_game()
+        for _ in range(ticks):
+            snake, food = bot.wait_for_tick()
+            waited = time.perf_counter()
+            bot.tracker.poll()
+            tracked_ms.append(1000 * (time.perf_counter() - waited))
+            start = time.perf_counter()
+            scanned, scanned_food = bot.get_game_state()
+            scan_ms.append(1000 * (time.perf_counter() - start))
+            if set(scanned) != set(snake) or scanned_food != food:
+                mismatches += 1
+                bot.tracker.resync(head=bot.head)
+            if bot.tracker.over:
+                games += 1
+                bot.driver.find_element("class name", "board").click()
+                bot.head, bot.direction = (10, 2), "DOWN"
+                bot.start_game()
+                continue
+            direction = bot.choose_direction(snake, food)
+            if not bot.is_opposite(direction):
+                bot.move(direction)
+    finally:
+        bot.driver.quit()
+
+    report("scan all cells", scan_ms)
+    report("observer poll", tracked_ms)
+    print(f"{ticks} ticks, {games} games over, {mismatches} ticks where the two disagreed")
@@ -0,0 +1,283 @@
+"""
+Snake as played on playsnake.org, in-process, so the bot's planner can be
+run and trained without a browser.
+
+Cells are flat indices y * width + x. The body is a ring buffer of cell
+indices next to a uint8 occupancy grid, so a move touches the new head and
+the old tail and nothing else. The rules follow the page (and
+local_pages/snake):
+
+    - one move per tick; an action that reverses onto the neck is ignored
+      and the snake keeps its direction
+    - eating the food grows the snake by one and scores 1; new food lands
+      on a uniformly random free cell
+    - the head may move into the cell the tail is leaving, unless the
+      snake is growing; the wall or any other body cell ends the game
+    - a new game starts with the snake on (10, 0)-(10, 2) heading down
+
+SnakeGame plays one game, SnakeBatch N games with NumPy arrays.
+"""
+import numpy as np
+
+WIDTH, HEIGHT = 21, 15
+
+# Same order as engine_2048; the opposite of action a is a ^ 1
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+ACTION_NAMES = ("UP", "DOWN", "LEFT", "RIGHT")
+VECTORS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+# Observation codes
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+_neighbour_tables = {}
+
+
+def neighbour_table(width=WIDTH, height=HEIGHT):
+    """(width * height, 4) int32: the cell each action leads to, -1 into a wall."""
+    key = (width, height)
+    if key not in _neighbour_tables:
+        x = np.tile(np.arange(width), height)
+        y = np.repeat(np.arange(height), width)
+        table = np.empty((width * height, 4), dtype=np.int32)
+        for action, (dx, dy) in enumerate(VECTORS):
+            nx, ny = x + dx, y + dy
+            inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            table[:, action] = np.where(inside, ny * width + nx, -1)
+        table.flags.writeable = False
+        _neighbour_tables[key] = table
+    return _neighbour_tables[key]
+
+
+def start_body(width=WIDTH):
+    """Starting body, head first: column width // 2, rows 2, 1, 0."""
+    column = width // 2
+    return [2 * width + column, width + column, column]
+
+
+def direction_between(width, a, b):
+    """The action that moves from cell a to the adjacent cell b, else None."""
+    d = b - a
+    if d == -width:
+        return UP
+    if d == width:
+        return DOWN
+    if d == -1 and b // width == a // width:
+        return LEFT
+    if d == 1 and b // width == a // width:
+        return RIGHT
+    return None
+
+
+class SnakeGame:
+    def __init__(self, width=WIDTH, height=HEIGHT, rng=None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.next_cell = neighbour_table(width, height).tolist()
+        self.grid = np.zeros(self.size, dtype=np.uint8)
+        self.body = np.zeros(self.size, dtype=np.int32)
+        self.reset()
+
+    def reset(self, body=None, food=None, direction=DOWN, score=0):
+        """
+        Start a game, by default the page's. `body` (flat cells, head first),
+        `food` and `direction` set up any other position, e.g. one read from
+        the page.
+        """
+        if body is None:
+            body = start_body(self.width)
+        self.grid[:] = 0
+        self.grid[body] = 1
+        # The ring holds the body tail to head; head indexes the head's slot
+        self.length = len(body)
+        self.body[:self.length] = body[::-1]
+        self.head = self.length - 1
+        self.direction = direction
+        self.score = score
+        self.over = False
+        self.moves = 0
+        if food is None:
+            self.place_food()
+        else:
+            self.food = food
+
+    @property
+    def head_cell(self):
+        return int(self.body[self.head])
+
+    @property
+    def tail_cell(self):
+        return int(self.body[(self.head - self.length + 1) % self.size])
+
+    def cells(self):
+        """The body as flat cells, head first."""
+        idx = (self.head - np.arange(self.length)) % self.size
+        return self.body[idx]
+
+    def place_food(self, food=None):
+        """Put the food on `food`, or on a random free cell. -1 if the board is full."""
+        if food is None:
+            food = -1
+            if self.length < self.size:
+                # Rejection sampling is O(1) while the board is mostly free
+                for _ in range(16):
+                    cell = int(self.rng.integers(self.size))
+                    if not self.grid[cell]:
+                        food = cell
+                        break
+                else:
+                    free = np.flatnonzero(self.grid == 0)
+                    food = int(free[self.rng.integers(len(free))])
+        self.food = food
+        return food
+
+    def safe_actions(self):
+        """The actions this tick that don't end the game (a reversal counts as going straight)."""
+        head = self.body[self.head]
+        tail = self.body[(self.head - self.length + 1) % self.size]
+        out = []
+        for action in ACTIONS:
+            cell = self.next_cell[head][self.direction if action ^ 1 == self.direction else action]
+            if cell >= 0 and (not self.grid[cell] or (cell == tail and cell != self.food)):
+                out.append(action)
+        return out
+
+    def step(self, action):
+        """
+        One tick. Returns (ate, over). After game over the state no longer
+        changes.
+        """
+        if self.over:
+            return False, True
+        action = int(action)
+        if action ^ 1 != self.direction:
+            self.direction = action
+        head = self.body[self.head]
+        cell = self.next_cell[head][self.direction]
+        ate = cell == self.food
+        tail_slot = (self.head - self.length + 1) % self.size
+        tail = self.body[tail_slot]
+        if cell < 0 or (self.grid[cell] and (ate or cell != tail)):
+            self.over = True
+            return False, True
+        if ate:
+            self.length += 1
+            self.score += 1
+        else:
+            self.grid[tail] = 0
+        self.head = (self.head + 1) % self.size
+        self.body[self.head] = cell
+        self.grid[cell] = 1
+        self.moves += 1
+        if ate:
+            self.place_food()
+        return ate, False
+
+    def observe(self, out=None):
+        """(height, width) uint8 of EMPTY/BODY/HEAD/FOOD."""
+        if out is None:
+            out = np.empty((self.height, self.width), dtype=np.uint8)
+        flat = out.reshape(-1)
+        flat[:] = self.grid
+        flat[self.body[self.head]] = HEAD
+        if self.food >= 0:
+            flat[self.food] = FOOD
+        return out
+
+
+class SnakeBatch:
+    """N independent games stepped together; finished games wait for reset(idx)."""
+
+    def __init__(self, n, width=WIDTH, height=HEIGHT, rng=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.next_cell = neighbour_table(width, height)
+        self.rows = np.arange(n)
+        self.grid = np.zeros((n, self.size), dtype=np.uint8)
+        self.body = np.zeros((n, self.size), dtype=np.int32)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.over = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def reset(self, idx=None):
+        """Start the page's opening position in games idx (all by default)."""
+        idx = self.rows if idx is None else np.asarray(idx)
+        body = start_body(self.width)
+        self.grid[idx] = 0
+        self.grid[idx[:, None], body] = 1
+        self.body[idx, :len(body)] = body[::-1]
+        self.length[idx] = len(body)
+        self.head[idx] = len(body) - 1
+        self.direction[idx] = DOWN
+        self.score[idx] = 0
+        self.over[idx] = False
+        self.place_food(idx)
+
+    def place_food(self, idx):
+        """Uniformly random free cells for games idx; -1 where the board is full."""
+        idx = np.asarray(idx)
+        self.food[idx] = -1
+        pending = idx[self.length[idx] < self.size]
+        for _ in range(16):
+            if not len(pending):
+                return
+            cells = self.rng.integers(self.size, size=len(pending))
+            free = self.grid[pending, cells] == 0
+            self.food[pending[free]] = cells[free]
+            pending = pending[~free]
+        for i in pending:
+            free = np.flatnonzero(self.grid[i] == 0)
+            self.food[i] = free[self.rng.integers(len(free))]
+
+    def step(self, actions):
+        """One tick of every game still running. Returns (ate, died) bool arrays."""
+        actions = np.asarray(actions, dtype=np.int64)
+        alive = ~self.over
+        turn = alive & ((actions ^ 1) != self.direction)
+        self.direction[turn] = actions[turn]
+
+        rows = self.rows
+        heads = self.body[rows, self.head]
+        cells = self.next_cell[heads, self.direction]
+        tails = self.body[rows, (self.head - self.length + 1) % self.size]
+        wall = cells < 0
+        # A full board has food -1, which a wall's -1 would match
+        eats = ~wall & (cells == self.food)
+        hit = ~wall & (self.grid[rows, np.where(wall, 0, cells)] == 1) & (eats | (cells != tails))
+        died = alive & (wall | hit)
+        moving = alive & ~died
+        ate = moving & eats
+
+        leave = np.flatnonzero(moving & ~ate)
+        self.grid[leave, tails[leave]] = 0
+        grow = np.flatnonzero(ate)
+        self.length[grow] += 1
+        self.score[grow] += 1
+        move = np.flatnonzero(moving)
+        self.head[move] = (self.head[move] + 1) % self.size
+        self.body[move, self.head[move]] = cells[move]
+        self.grid[move, cells[move]] = 1
+        self.over |= died
+        if len(grow):
+            self.place_food(grow)
+        return ate, died
+
+    def observe(self, out=None):
+        """(n, height, width) uint8 of EMPTY/BODY/HEAD/FOOD."""
+        if out is None:
+            out = np.empty((self.n, self.height, self.width), dtype=np.uint8)
+        flat = out.reshape(self.n, self.size)
+        np.copyto(flat, self.grid)
+        flat[self.rows, self.body[self.rows, self.head]] = HEAD
+        has_food = np.flatnonzero(self.food >= 0)
+        flat[has_food, self.food[has_food]] = FOOD
+        return out
@@ -0,0 +1,129 @@
+"""
+A snake planner that follows a fixed Hamiltonian cycle over the board and
+takes shortcuts along it when they are safe.
+
+A snake that only ever moves to the next cell of a cycle through every
+cell can't die: its body always fills the stretch of the cycle just
+behind the head. Shortcuts to a neighbour further along the cycle keep
+that true as long as the head lands before the tail with room to spare
+for growing, and they are only taken while the board is less than half
+full. Each decision looks at the head's four neighbours and compares
+their cycle positions, so it takes the same few microseconds at any snake
+length.
+
+21x15 has an odd number of cells, and a grid graph is bipartite, so it
+has no Hamiltonian cycle. The cycle here leaves out the top-left corner
+and is laid out so that the corner's two neighbours are two steps apart
+on it, with (1, 1) in between. When the food is in the corner the snake
+goes through it instead of (1, 1); both count as the same cycle position,
+so the safety rule doesn't change.
+"""
+from engine_snake import HEIGHT, WIDTH, neighbour_table
+
+
+def hamiltonian_cycle(width=WIDTH, height=HEIGHT):
+    """
+    The cycle as a list of flat cells, plus the cell it leaves out (the
+    corner 0 when width * height is odd, else None). On odd boards the
+    cycle runs ..., (0, 1), (1, 1), (1, 0), ... around the corner.
+    """
+    if width < 2 or height < 2:
+        raise ValueError("the board needs at least 2 rows and 2 columns")
+
+    def cell(x, y):
+        return y * width + x
+
+    if height % 2 == 0:
+        # Along the top row, snake back and forth over columns 1.., then
+        # up column 0
+        cycle = [cell(x, 0) for x in range(width)]
+        for y in range(1, height):
+            xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+            cycle.extend(cell(x, y) for x in xs)
+        cycle.extend(cell(0, y) for y in range(height - 1, 0, -1))
+        return cycle, None
+    if width % 2 == 0:
+        transposed, _ = hamiltonian_cycle(height, width)
+        return [(c % height) * width + c // height for c in transposed], None
+    if width < 3 or height < 3:
+        raise ValueError("odd boards need at least 3 rows and 3 columns")
+    # Top row without the corner, then columns width-1..2 up and down over
+    # rows 1.., then columns 1 and 0 back and forth up to (1, 1)
+    cycle = [cell(x, 0) for x in range(1, width)]
+    for i, x in enumerate(range(width - 1, 1, -1)):
+        ys = range(1, height) if i % 2 == 0 else range(height - 1, 0, -1)
+        cycle.extend(cell(x, y) for y in ys)
+    for y in range(height - 1, 0, -1):
+        cycle.extend((cell(1, y), cell(0, y)) if (height - 1 - y) % 2 == 0 else (cell(0, y), cell(1, y)))
+    return cycle, 0
+
+
+class HamiltonianPlanner:
+    """
+    decide() picks the next cell for a snake given its head, tail, length,
+    the food and the occupied cells (anything indexable by flat cell).
+
+    :param buffer: cells of slack kept between a shortcut and the tail
+    :param max_fill: no shortcuts once this share of the board is snake
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, buffer=3, max_fill=0.5):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.buffer = buffer
+        self.max_fill = max_fill
+        self.cycle, self.skipped = hamiltonian_cycle(width, height)
+        n = self.cycles = len(self.cycle)
+        # Cycle position of every cell, and the cell after it on the cycle
+        self.position = [0] * self.size
+        self.next_cell = [0] * self.size
+        for i, c in enumerate(self.cycle):
+            self.position[c] = i
+            self.next_cell[c] = self.cycle[(i + 1) % n]
+        self.neighbours = [[c for c in row if c >= 0] for row in neighbour_table(width, height).tolist()]
+        if self.skipped is not None:
+            # The corner stands in for (1, 1), between its two neighbours
+            self.corner_in = width       # (0, 1)
+            self.corner_out = 1          # (1, 0)
+            self.position[self.skipped] = self.position[width + 1]
+            self.next_cell[self.skipped] = self.corner_out
+        self.aligned = 0
+
+    def reset(self):
+        """Call at the start of each game."""
+        self.aligned = 0
+
+    def decide(self, head, tail, length, food, blocked):
+        """
+        The cell to move the head to. Shortcuts wait until the planner's own
+        moves have laid out the whole body along the cycle.
+        """
+        position, n = self.position, self.cycles
+        here = position[head]
+        step = self.next_cell[head]
+        if food == self.skipped and food >= 0 and head == self.corner_in:
+            step = food
+
+        if self.aligned >= length and length < self.max_fill * self.size and food >= 0:
+            # Food in the corner is reached from the cell before it
+            target = self.corner_in if food == self.skipped else food
+            to_tail = (position[tail] - here) % n
+            to_food = (position[target] - here) % n
+            # Land at most on the food, and far enough before the tail that
+            # eating can't close the gap
+            reach = min(to_food, to_tail - 2 - self.buffer)
+            best = 1
+            for c in self.neighbours[head]:
+                if c == self.skipped or blocked[c]:
+                    continue
+                d = (position[c] - here) % n
+                if best < d <= reach:
+                    best, step = d, c
+
+        if blocked[step] and step != tail:
+            # Off the cycle (e.g. picked up mid-game): wait for a clean lap
+            self.aligned = 0
+            return None
+        self.aligned += 1
+        return step
@@ -0,0 +1,152 @@
+"""
+Checks engine_snake against the page: record SnakeBot's sessions in the
+browser, then replay them through the simulator and report every tick
+where the two disagree.
+
+    python parity_snake.py record session.jsonl [ticks] [url]
+    python parity_snake.py replay session.jsonl [more.jsonl ...]
+
+A recording is one JSON object per line: {"start": [cells, head first],
+"food": ..., "score": ...} when a game starts, then the raw cell changes of
+each SnakeTracker poll ({"events", "food", "score", "over"}). The url
+defaults to the local copy of the page (local_pages/snake); the live site
+works too.
+
+The replay takes each head the page added as one tick, moves the simulator
+the same way, feeds it the food the page placed, and checks the tail it
+drops, the score, and that the game ends exactly where the page's did.
+"""
+import json
+import os
+import sys
+from collections import Counter
+
+import engine_snake as engine
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+
+
+def record(path, ticks, url=None):
+    from local_pages import headless_chrome, page_url
+    from snake import SnakeBot
+
+    bot = SnakeBot(driver=headless_chrome(), url=url or page_url("snake", "?seed=1&tick=100&countdown=0"))
+    idle = 0
+    try:
+        with open(path, "w") as f:
+            def start():
+                bot.head, bot.direction = (10, 2), "DOWN"
+                bot.start_game()
+                t = bot.tracker
+                f.write(json.dumps({"start": [int(i) for i in t.segments], "food": int(t.food), "score": t.score}) + "\n")
+
+            start()
+            for _ in range(ticks):
+                snake, food = bot.wait_for_tick()
+                changes = bot.tracker.changes
+                f.write(json.dumps(changes) + "\n")
+                # The live site has no game-over marker; a board that stops
+                # changing is as good
+                idle = 0 if changes["events"] else idle + 1
+                if changes["over"] or idle >= 4:
+                    bot.driver.find_element("class name", "board").click()
+                    start()
+                    idle = 0
+                    continue
+                direction = bot.choose_direction(snake, food)
+                if not bot.is_opposite(direction):
+                    bot.move(direction)
+    finally:
+        bot.driver.quit()
+
+
+def replay(records, width=engine.WIDTH, height=engine.HEIGHT, show=10):
+    """Replay one recording; returns (counts, list of mismatch descriptions)."""
+    game = engine.SnakeGame(width, height)
+    counts = Counter()
+    mismatches = []
+    synced = False
+
+    def mismatch(kind, detail):
+        counts[kind] += 1
+        mismatches.append(f"game {counts['games']} tick {counts['ticks']}: {kind} {detail}")
+
+    for rec in records:
+        if "start" in rec:
+            body = rec["start"]
+            direction = engine.direction_between(width, body[1], body[0]) if len(body) > 1 else engine.DOWN
+            game.reset(body=body, food=rec["food"], direction=direction, score=rec["score"])
+            counts["games"] += 1
+            synced = True
+            continue
+        if not synced:
+            continue
+        removed = []
+        for event in rec["events"]:
+            if event < 0:
+                removed.append(-event - 1)
+                continue
+            cell = event - 1
+            action = engine.direction_between(width, game.head_cell, cell)
+            if action is None:
+                mismatch("jump", f"head {game.head_cell} -> {cell}")
+                synced = False
+                break
+            tail = game.tail_cell
+            ate, over = game.step(action)
+            counts["ticks"] += 1
+            if ate:
+                counts["food"] += 1
+                # The food is random on the page; take the cell it chose
+                game.place_food(rec["food"])
+            if over:
+                mismatch("died", f"moving {engine.ACTION_NAMES[action]} into {cell}")
+                synced = False
+                break
+            if removed != ([] if ate else [tail]):
+                mismatch("tail", f"page removed {removed}, simulator {[] if ate else [tail]}")
+            removed = []
+        if not synced:
+            continue
+        if removed:
+            mismatch("tail", f"page removed {removed} without a move")
+        if game.score != rec["score"]:
+            mismatch("score", f"page {rec['score']}, simulator {game.score}")
+            game.score = rec["score"]
+        if game.food != rec["food"]:
+            mismatch("food", f"page {rec['food']}, simulator {game.food}")
+            game.food = rec["food"]
+        if rec["over"]:
+            # The page died this tick: some move it could have made must kill
+            allowed = [a for a in engine.ACTIONS if a ^ 1 != game.direction]
+            if set(allowed) <= set(game.safe_actions()):
+                mismatch("alive", "page ended the game, every move is safe in the simulator")
+            counts["deaths"] += 1
+            synced = False
+    return counts, mismatches[:show]
+
+
+def load(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("record", "replay"):
+        print(__doc__)
+        sys.exit(2)
+    if sys.argv[1] == "record":
+        ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+        record(sys.argv[2], ticks, sys.argv[4] if len(sys.argv) > 4 else None)
+        sys.exit(0)
+
+    failed = False
+    for path in sys.argv[2:]:
+        counts, shown = replay(load(path))
+        bad = sum(v for k, v in counts.items() if k not in ("games", "ticks", "food", "deaths"))
+        print(f"{path}: {counts['games']} games, {counts['ticks']} ticks, {counts['food']} food, "
+              f"{counts['deaths']} deaths, {bad} mismatches")
+        for line in shown:
+            print("  " + line)
+        failed |= bad > 0
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,157 @@
+"""
+Shortest paths on the snake grid for SnakeBot's planner.
+
+Cells are flat indices y * width + x (as in engine_snake and
+SnakeTracker). A GridPathfinder owns its neighbour table, queue, parent
+and visited arrays and reuses them on every search: a cell counts as
+visited when its stamp equals the current generation, so starting a new
+search is one increment instead of clearing or allocating anything.
+
+`blocked` is anything indexable by cell that is truthy where the snake
+is, e.g. SnakeTracker.occupied, SnakeGame.grid or a bytearray. NumPy
+arrays are copied to bytes first, since indexing them one cell at a time
+is slow.
+
+    finder = GridPathfinder(21, 15)
+    path = finder.find_path(head, food, blocked)          # BFS
+    path = finder.find_path(head, food, blocked, astar=True)
+    safe = finder.tail_reachable(body)                    # body head first
+"""
+import heapq
+
+import numpy as np
+
+from engine_snake import HEIGHT, WIDTH, neighbour_table
+
+
+class GridPathfinder:
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        # Neighbours of each cell without the walls, in UP, DOWN, LEFT, RIGHT order
+        self.neighbours = [[c for c in row if c >= 0] for row in neighbour_table(width, height).tolist()]
+        self.stamp = [0] * self.size
+        self.parent = [0] * self.size
+        self.depth = [0] * self.size
+        self.queue = [0] * self.size
+        self.free_at = [0] * self.size
+        self.body_stamp = [0] * self.size
+        self.generation = 0
+        self.searches = 0
+
+    def _next_generation(self):
+        self.generation += 1
+        self.searches += 1
+        return self.generation
+
+    @staticmethod
+    def _blocked(blocked):
+        return bytes(blocked) if isinstance(blocked, np.ndarray) else blocked
+
+    def _trace(self, start, target):
+        path = []
+        parent = self.parent
+        cell = target
+        while cell != start:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def find_path(self, start, target, blocked, astar=False):
+        """
+        Shortest path from start to target around the blocked cells, as the
+        cells after start up to and including target, or None. The start
+        cell may be blocked (it is the head).
+        """
+        if target is None or target < 0:
+            return None
+        blocked = self._blocked(blocked)
+        if astar:
+            return self._astar(start, target, blocked)
+        gen = self._next_generation()
+        stamp, parent, queue, neighbours = self.stamp, self.parent, self.queue, self.neighbours
+        stamp[start] = gen
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            for nxt in neighbours[cell]:
+                if stamp[nxt] != gen and not blocked[nxt]:
+                    stamp[nxt] = gen
+                    parent[nxt] = cell
+                    if nxt == target:
+                        return self._trace(start, target)
+                    queue[write] = nxt
+                    write += 1
+        return None
+
+    def _astar(self, start, target, blocked):
+        gen = self._next_generation()
+        stamp, parent, cost, neighbours = self.stamp, self.parent, self.depth, self.neighbours
+        w = self.width
+        tx, ty = target % w, target // w
+        stamp[start] = gen
+        cost[start] = 0
+        # (f, -g, cell): ties go to the deeper node, which heads straight on
+        heap = [(abs(start % w - tx) + abs(start // w - ty), 0, start)]
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            g = -g
+            if cell == target:
+                return self._trace(start, target)
+            if g > cost[cell]:
+                continue  # stale entry
+            g += 1
+            for nxt in neighbours[cell]:
+                if blocked[nxt]:
+                    continue
+                if stamp[nxt] != gen or g < cost[nxt]:
+                    stamp[nxt] = gen
+                    cost[nxt] = g
+                    parent[nxt] = cell
+                    heapq.heappush(heap, (g + abs(nxt % w - tx) + abs(nxt // w - ty), -g, nxt))
+        return None
+
+    def tail_reachable(self, body, grow=0):
+        """
+        Whether the head can still reach the tail, counting the body as it
+        moves away: the segment k places from the tail is gone after k + 1
+        moves (k + 1 + grow while the snake is still growing by `grow`). A
+        snake that can follow its tail can't trap itself yet.
+
+        :param body: the snake's cells, head first
+        """
+        length = len(body)
+        if length < 2:
+            return True
+        gen = self._next_generation()
+        stamp, depth, queue, neighbours = self.stamp, self.depth, self.queue, self.neighbours
+        # free_at only counts where body_stamp marks a body cell of this search
+        free_at, body_stamp = self.free_at, self.body_stamp
+        for i, cell in enumerate(body):
+            free_at[cell] = length - i + grow
+            body_stamp[cell] = gen
+        head, tail = body[0], body[-1]
+        stamp[head] = gen
+        depth[head] = 0
+        queue[0] = head
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            d = depth[cell] + 1
+            for nxt in neighbours[cell]:
+                if stamp[nxt] == gen:
+                    continue
+                if body_stamp[nxt] == gen and free_at[nxt] > d:
+                    continue  # still under the body when we'd get there
+                if nxt == tail:
+                    return True
+                stamp[nxt] = gen
+                depth[nxt] = d
+                queue[write] = nxt
+                write += 1
+        return False
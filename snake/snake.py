@@ -3,14 +3,39 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from collections import deque
-import time
+
+from hamiltonian import HamiltonianPlanner
+from pathfinder import GridPathfinder
+from snake_state import SnakeTracker
+
+GAME_URL = "https://playsnake.org/"
+
+# "bfs": shortest path to the food, else the first safe direction.
+# "hamiltonian": follow a cycle over the board, with safe shortcuts
+PLANNER = "hamiltonian"
 
 class SnakeBot:
-    def __init__(self):
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://playsnake.org/")
-        
+    def __init__(self, driver=None, url=GAME_URL, planner=PLANNER):
+        self.driver = driver or webdriver.Chrome()
+        self.driver.get(url)
+        self._setup(planner)
+
+        # Snake and food, updated from the cells the page changes each tick
+        self.tracker = SnakeTracker(self.driver, self.grid_width, self.grid_height)
+
+    @classmethod
+    def offline(cls, planner=PLANNER):
+        """
+        A bot without a browser, for running choose_direction on the
+        simulator (see bench_snake_engine.py).
+        """
+        bot = cls.__new__(cls)
+        bot.driver = None
+        bot.tracker = None
+        bot._setup(planner)
+        return bot
+
+    def _setup(self, planner):
         # Game grid dimensions
         self.grid_width = 21
         self.grid_height = 15
@@ -18,7 +43,11 @@ class SnakeBot:
         # Initialize tracking variables
         self.head = (10, 2)
         self.direction = "DOWN"
-        self.last_score = 0
+
+        self.pathfinder = GridPathfinder(self.grid_width, self.grid_height)
+        self.hamiltonian = None
+        if planner == "hamiltonian":
+            self.hamiltonian = HamiltonianPlanner(self.grid_width, self.grid_height)
 
     def start_game(self):
         # Select Python level (hardest)
@@ -32,7 +61,23 @@ class SnakeBot:
             EC.presence_of_element_located((By.CLASS_NAME, "countdown"))
         )
 
+        # One full scan at the start, then only the cells that change
+        self.tracker.install()
+        self.tracker.resync(head=self.head)
+        if self.hamiltonian is not None:
+            self.hamiltonian.reset()
+
+    def wait_for_tick(self, timeout=0.5):
+        """
+        Wait for the page's next tick and return (snake, food), with the
+        snake's segments head first. Replaces scanning every cell.
+        """
+        self.tracker.wait(timeout)
+        self.head = self.tracker.head or self.head
+        return self.tracker.snake, self.tracker.food_xy
+
     def get_game_state(self):
+        """Full rescan of every cell's class; slow, kept for comparison."""
         cells = self.driver.find_elements(By.CLASS_NAME, "cell")
         snake = []
         food = None
@@ -50,34 +95,21 @@ class SnakeBot:
         return snake, food
 
     def find_path(self, start, target, obstacles):
-        queue = deque()
-        queue.append(start)
-        visited = {start: None}
-        directions = [(0, -1, "UP"), (0, 1, "DOWN"), 
-                     (-1, 0, "LEFT"), (1, 0, "RIGHT")]
-
-        while queue:
-            current = queue.popleft()
-            if current == target:
-                path = []
-                while current != start:
-                    path.append(current)
-                    current = visited[current]
-                return path[::-1]
-            
-            for dx, dy, dir_name in directions:
-                nx, ny = current[0] + dx, current[1] + dy
-                next_pos = (nx, ny)
-                
-                if (0 <= nx < self.grid_width and 
-                    0 <= ny < self.grid_height and 
-                    next_pos not in obstacles and 
-                    next_pos not in visited):
-                    
-                    visited[next_pos] = current
-                    queue.append(next_pos)
-        
-        return None  # No path found
+        """
+        Shortest path from start to target around the obstacles, as the
+        (x, y) cells after start, or None. The search itself runs on flat
+        cell indices in the reusable GridPathfinder.
+        """
+        if target is None:
+            return None
+        w = self.grid_width
+        blocked = bytearray(w * self.grid_height)
+        for x, y in obstacles:
+            blocked[y * w + x] = 1
+        path = self.pathfinder.find_path(start[1] * w + start[0], target[1] * w + target[0], blocked)
+        if path is None:
+            return None
+        return [(c % w, c // w) for c in path]
 
     def get_safe_direction(self, obstacles):
         directions = []
@@ -114,67 +146,81 @@ class SnakeBot:
         self.driver.find_element(By.TAG_NAME, "body").send_keys(key_mapping[direction])
         self.direction = direction
 
-    def update_head_position(self):
-        dx, dy = 0, 0
-        if self.direction == "UP":
-            dy = -1
-        elif self.direction == "DOWN":
-            dy = 1
-        elif self.direction == "LEFT":
-            dx = -1
-        elif self.direction == "RIGHT":
-            dx = 1
+    def choose_direction(self, snake, food, blocked=None):
+        """
+        The planner: shortest path to the food, else any safe direction.
+        Needs only self.head, self.direction and the grid size, so it runs
+        on engine_snake as well as on the page.
+
+        With the Hamiltonian planner the next cell comes from the cycle
+        instead; `blocked` is the occupancy by flat cell if already known
+        (SnakeTracker.occupied), else it is built from `snake` (head first).
+        """
+        if self.hamiltonian is not None:
+            new_dir = self.cycle_direction(snake, food, blocked)
+            if new_dir is not None:
+                return new_dir
+
+        obstacles = set(snake)
         
-        self.head = (self.head[0] + dx, self.head[1] + dy)
+        # Find path to food
+        path = self.find_path(self.head, food, obstacles)
+        
+        if path:
+            next_step = path[0]
+            dx = next_step[0] - self.head[0]
+            dy = next_step[1] - self.head[1]
+        
+            if dx == 1:
+                new_dir = "RIGHT"
+            elif dx == -1:
+                new_dir = "LEFT"
+            elif dy == 1:
+                new_dir = "DOWN"
+            else:
+                new_dir = "UP"
+        else:
+            # Find safe move if no path to food
+            new_dir = self.get_safe_direction(obstacles)
+            if not new_dir:
+                new_dir = self.direction  # Continue current direction
+        return new_dir
+
+    def cycle_direction(self, snake, food, blocked=None):
+        """The Hamiltonian planner's direction, or None while it is off its cycle."""
+        w = self.grid_width
+        if blocked is None:
+            blocked = bytearray(w * self.grid_height)
+            for x, y in snake:
+                blocked[y * w + x] = 1
+        head = self.head[1] * w + self.head[0]
+        tail = snake[-1][1] * w + snake[-1][0]
+        food = food[1] * w + food[0] if food else -1
+        cell = self.hamiltonian.decide(head, tail, len(snake), food, blocked)
+        if cell is None:
+            return None
+        return {-w: "UP", w: "DOWN", -1: "LEFT", 1: "RIGHT"}[cell - head]
 
     def play(self):
         self.start_game()
         
         while True:
-            snake, food = self.get_game_state()
-            current_score = int(self.driver.find_element(By.CLASS_NAME, "score").text)
-            
-            # Check if game over
-            if current_score == self.last_score:
-                print("Game Over - Restarting...")
+            snake, food = self.wait_for_tick()
+
+            # The board gets "game-over" when the snake dies
+            if self.tracker.over:
+                print(f"Game Over (score {self.tracker.score}) - Restarting...")
                 self.driver.find_element(By.CLASS_NAME, "board").click()
-                self.start_game()
                 self.head = (10, 2)
                 self.direction = "DOWN"
-                self.last_score = 0
+                self.start_game()
                 continue
-            
-            self.last_score = current_score
-            obstacles = set(snake)
-            
-            # Find path to food
-            path = self.find_path(self.head, food, obstacles)
-            
-            if path:
-                next_step = path[0]
-                dx = next_step[0] - self.head[0]
-                dy = next_step[1] - self.head[1]
-                
-                if dx == 1:
-                    new_dir = "RIGHT"
-                elif dx == -1:
-                    new_dir = "LEFT"
-                elif dy == 1:
-                    new_dir = "DOWN"
-                else:
-                    new_dir = "UP"
-            else:
-                # Find safe move if no path to food
-                new_dir = self.get_safe_direction(obstacles)
-                if not new_dir:
-                    new_dir = self.direction  # Continue current direction
+
+            new_dir = self.choose_direction(snake, food, self.tracker.occupied)
 
             # Prevent 180-degree turns
             if not self.is_opposite(new_dir):
                 self.move(new_dir)
-                self.update_head_position()
-            
-            time.sleep(0.05)  # Adjust based on game speed
 
 if __name__ == "__main__":
     bot = SnakeBot()
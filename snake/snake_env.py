@@ -0,0 +1,141 @@
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+import engine_snake as engine
+
+
+def _spaces(width, height):
+    observation_space = gym.spaces.Box(low=0, high=engine.FOOD, shape=(height, width), dtype=np.uint8)
+    return observation_space, gym.spaces.Discrete(4)
+
+
+class LocalSnakeEnv(gym.Env):
+    """
+    Snake on the in-process engine (engine_snake), with the page's grid
+    and rules.
+
+    Observation: (height, width) uint8 grid of EMPTY/BODY/HEAD/FOOD.
+    Actions: UP, DOWN, LEFT, RIGHT (engine_snake order); reversing is
+    ignored like on the page.
+    Reward: +1 for eating, -1 for dying, 0 otherwise. A game that goes
+    max_idle moves without eating is truncated, so circling forever ends.
+    """
+    metadata = {"render_modes": ["human"]}
+
+    def __init__(self, width=engine.WIDTH, height=engine.HEIGHT, max_idle=None):
+        super().__init__()
+        self.observation_space, self.action_space = _spaces(width, height)
+        self.width = width
+        self.height = height
+        self.max_idle = max_idle or width * height
+        self.game = None
+        self.idle = 0
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        if self.game is None:
+            self.game = engine.SnakeGame(self.width, self.height, self.np_random)
+        else:
+            self.game.rng = self.np_random
+            self.game.reset()
+        self.idle = 0
+        return self.game.observe(), {}
+
+    def step(self, action):
+        ate, over = self.game.step(int(action))
+        self.idle = 0 if ate else self.idle + 1
+        reward = -1.0 if over else float(ate)
+        truncated = not over and self.idle >= self.max_idle
+        return self.game.observe(), reward, over, truncated, {"score": self.game.score}
+
+    def render(self):
+        print(self.game.observe())
+
+
+class BatchedSnakeVecEnv(VecEnv):
+    """
+    N games of snake stepped together on engine_snake.SnakeBatch. Implements
+    the stable_baselines3 VecEnv interface, so it replaces
+    DummyVecEnv([LocalSnakeEnv] * N) with the same spaces and rewards.
+    Finished games are reset automatically; the final grid is in
+    infos[i]["terminal_observation"] as SB3 expects.
+    """
+    metadata = {"render_modes": ["human"]}
+
+    def __init__(self, num_envs=1024, seed=None, width=engine.WIDTH, height=engine.HEIGHT, max_idle=None):
+        observation_space, action_space = _spaces(width, height)
+        self.render_mode = None
+        self.max_idle = max_idle or width * height
+        self.rng = np.random.default_rng(seed)
+        self.games = engine.SnakeBatch(num_envs, width, height, self.rng)
+        self.idle = np.zeros(num_envs, dtype=np.int64)
+        self.actions = None
+        super().__init__(num_envs, observation_space, action_space)
+
+    def reset(self):
+        # VecEnv.seed() stores one seed per env; one generator drives the batch
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+            self.games.rng = self.rng
+        self._reset_seeds()
+        self._reset_options()
+
+        self.games.reset()
+        self.idle[:] = 0
+        return self.games.observe()
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        games = self.games
+        ate, died = games.step(self.actions)
+        self.idle += 1
+        self.idle[ate] = 0
+        truncated = ~died & (self.idle >= self.max_idle)
+        dones = died | truncated
+        rewards = ate.astype(np.float32) - died.astype(np.float32)
+        scores = games.score.copy()
+
+        infos = [{} for _ in range(self.num_envs)]
+        done_idx = np.flatnonzero(dones)
+        if len(done_idx):
+            terminal = games.observe()[done_idx]
+            for i, final in zip(done_idx, terminal):
+                infos[i]["terminal_observation"] = final
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+                infos[i]["score"] = int(scores[i])
+            games.reset(done_idx)
+            self.idle[done_idx] = 0
+
+        return games.observe(), rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        # All games share this one object, so every index sees the same value
+        value = getattr(self, attr_name)
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "render":
+            return [self.render_board(i) for i in self._indices(indices)]
+        raise AttributeError(f"BatchedSnakeVecEnv has no per-env method {method_name!r}")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
+
+    def render_board(self, index=0):
+        print(self.games.observe()[index])
@@ -0,0 +1,234 @@
+"""
+Incremental snake state from the page, instead of reading the class of all
+21x15 cells every tick.
+
+install() puts a MutationObserver on the board's cells. It logs each cell
+that gains or loses "snake", in the order the page changes them, and keeps
+track of the food cell. poll() fetches and clears that log in one
+execute_script call, and wait() does the same with an async script that
+returns as soon as the next tick has changed something.
+
+A tick adds the new head and, unless the snake ate, removes the tail, so
+the log replays onto a deque of segments (head first) and a NumPy
+occupancy grid without looking at the rest of the board:
+
+    tracker = SnakeTracker(driver)
+    tracker.install()
+    tracker.resync(head=(10, 2))
+    while True:
+        tracker.wait()
+        head, food = tracker.head, tracker.food
+"""
+from collections import deque
+
+import numpy as np
+
+INSTALL_JS = """
+var cells = document.getElementsByClassName("cell");
+if (!cells.length) return false;
+var old = window.__snakeWatch;
+if (old) old.observer.disconnect();
+var n = cells.length;
+var watch = {events: [], snake: new Uint8Array(n), food: -1, index: new Map(), waiter: null};
+for (var i = 0; i < n; i++) {
+  watch.index.set(cells[i], i);
+  if (cells[i].classList.contains("snake")) watch.snake[i] = 1;
+  if (cells[i].classList.contains("food")) watch.food = i;
+}
+function hasClass(value, name) {
+  return (" " + value + " ").indexOf(" " + name + " ") >= 0;
+}
+// +(i + 1) when cell i gains "snake", -(i + 1) when it loses it. Records
+// arrive after the page's task has finished, so a cell's class right after
+// each change is the next record's oldValue, or its class now for the last.
+watch.handle = function (records) {
+  var after = new Map(), values = new Array(records.length);
+  for (var r = records.length - 1; r >= 0; r--) {
+    var target = records[r].target;
+    values[r] = after.has(target) ? after.get(target) : target.className;
+    after.set(target, records[r].oldValue || "");
+  }
+  for (var r = 0; r < records.length; r++) {
+    var i = watch.index.get(records[r].target);
+    if (i === undefined) continue;
+    var snake = hasClass(values[r], "snake") ? 1 : 0;
+    if (snake !== watch.snake[i]) {
+      watch.snake[i] = snake;
+      watch.events.push(snake ? i + 1 : -(i + 1));
+    }
+    if (hasClass(values[r], "food")) {
+      watch.food = i;
+    } else if (watch.food === i) {
+      watch.food = -1;
+    }
+  }
+  if (watch.waiter && watch.events.length) {
+    var done = watch.waiter;
+    watch.waiter = null;
+    done();
+  }
+};
+watch.observer = new MutationObserver(watch.handle);
+for (var i = 0; i < n; i++) {
+  watch.observer.observe(cells[i], {attributes: true, attributeFilter: ["class"], attributeOldValue: true});
+}
+watch.take = function () {
+  watch.handle(watch.observer.takeRecords());
+  var score = document.querySelector(".score");
+  var out = {
+    events: watch.events,
+    food: watch.food,
+    score: score ? parseInt(score.textContent, 10) || 0 : 0,
+    over: !!document.querySelector(".game-over")
+  };
+  watch.events = [];
+  return out;
+};
+window.__snakeWatch = watch;
+return true;
+"""
+
+POLL_JS = """
+var watch = window.__snakeWatch;
+return watch ? watch.take() : null;
+"""
+
+WAIT_JS = """
+var done = arguments[arguments.length - 1];
+var watch = window.__snakeWatch;
+if (!watch) { done(null); return; }
+watch.handle(watch.observer.takeRecords());
+if (watch.events.length) { done(watch.take()); return; }
+var timer = setTimeout(function () { watch.waiter = null; done(watch.take()); }, arguments[0]);
+watch.waiter = function () { clearTimeout(timer); done(watch.take()); };
+"""
+
+SCAN_JS = """
+var cells = document.getElementsByClassName("cell");
+var snake = [], food = -1;
+for (var i = 0; i < cells.length; i++) {
+  if (cells[i].classList.contains("snake")) snake.push(i);
+  if (cells[i].classList.contains("food")) food = i;
+}
+var score = document.querySelector(".score");
+return {snake: snake, food: food, score: score ? parseInt(score.textContent, 10) || 0 : 0,
+        over: !!document.querySelector(".game-over")};
+"""
+
+
+class SnakeTracker:
+    def __init__(self, driver, width=21, height=15):
+        self.driver = driver
+        self.width = width
+        self.height = height
+        # Occupancy by flat index y * width + x; grid is the (height, width) view
+        self.occupied = np.zeros(width * height, dtype=np.uint8)
+        self.grid = self.occupied.reshape(height, width)
+        self.segments = deque()  # flat indices, head first
+        self.food = -1
+        self.score = 0
+        self.over = False
+        self.resyncs = 0
+        # The raw log of the last poll, for recording sessions
+        self.changes = None
+
+    def install(self):
+        """Install the cell observer; call again after a reload. False if the page has no cells."""
+        return self.driver.execute_script(INSTALL_JS)
+
+    def xy(self, index):
+        return index % self.width, index // self.width
+
+    @property
+    def head(self):
+        return self.xy(self.segments[0]) if self.segments else None
+
+    @property
+    def snake(self):
+        """The segments as (x, y), head first."""
+        w = self.width
+        return [(i % w, i // w) for i in self.segments]
+
+    @property
+    def food_xy(self):
+        return self.xy(self.food) if self.food >= 0 else None
+
+    def poll(self):
+        """Apply the changes since the last poll. Returns the number of cell changes."""
+        return self._update(self.driver.execute_script(POLL_JS))
+
+    def wait(self, timeout=0.5):
+        """Like poll(), but first wait up to `timeout` s for the page to change a cell."""
+        return self._update(self.driver.execute_async_script(WAIT_JS, 1000 * timeout))
+
+    def _update(self, changes):
+        if changes is None:
+            # The page was reloaded under us
+            self.install()
+            self.resync()
+            return 0
+        self.changes = changes
+        self.food = changes["food"]
+        self.score = changes["score"]
+        self.over = changes["over"]
+        segments, occupied = self.segments, self.occupied
+        for event in changes["events"]:
+            if event > 0:
+                index = event - 1
+                segments.appendleft(index)
+                occupied[index] = 1
+            else:
+                index = -event - 1
+                occupied[index] = 0
+                if segments and segments[-1] == index:
+                    segments.pop()
+                elif index in segments:
+                    # Not a tail move (e.g. the board being cleared)
+                    segments.remove(index)
+        return len(changes["events"])
+
+    def resync(self, head=None):
+        """
+        Rebuild the state from a full scan, e.g. at the start of a game. The
+        scan only says which cells are snake, so the segments are ordered by
+        walking along the body from `head` (x, y), or from one of its ends.
+        """
+        state = self.driver.execute_script(SCAN_JS)
+        self.food = state["food"]
+        self.score = state["score"]
+        self.over = state["over"]
+        self.occupied[:] = 0
+        self.occupied[state["snake"]] = 1
+        self.segments = deque(self._order(set(state["snake"]), head))
+        self.resyncs += 1
+
+    def _order(self, cells, head):
+        if not cells:
+            return []
+        w = self.width
+
+        def neighbours(i):
+            x = i % w
+            out = [i - w, i + w]
+            if x > 0:
+                out.append(i - 1)
+            if x < w - 1:
+                out.append(i + 1)
+            return [j for j in out if j in cells]
+
+        start = None
+        if head is not None:
+            start = head[1] * w + head[0]
+        if start not in cells:
+            ends = [i for i in cells if len(neighbours(i)) <= 1]
+            start = ends[0] if ends else min(cells)
+        order, seen = [start], {start}
+        while True:
+            nxt = [j for j in neighbours(order[-1]) if j not in seen]
+            if not nxt:
+                break
+            order.append(nxt[0])
+            seen.add(nxt[0])
+        # Cells the walk couldn't reach still count as body
+        order.extend(i for i in cells if i not in seen)
+        return order
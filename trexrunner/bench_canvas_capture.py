@@ -0,0 +1,63 @@
+"""
+Per-frame latency of ChromeDinoBot against the local T-Rex runner
+(local_pages/trex): what a tick used to cost (a full-page screenshot for
+is_game_over and another for see_obstacle) vs one getImageData read of the
+two regions both checks share. Also checks that both reads see the same
+pixels on the title screen, where nothing moves.
+
+    python bench_canvas_capture.py [frames]
+"""
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from local_pages import headless_chrome, page_url
+from trex import ChromeDinoBot
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(f"{name:<28} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+def time_frames(bot, frames, read):
+    samples = []
+    for _ in range(frames):
+        if bot.is_game_over(bot.capture.grab()):
+            bot.start_game()
+        start = time.perf_counter()
+        read()
+        samples.append(1000 * (time.perf_counter() - start))
+    return samples
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    bot = ChromeDinoBot(driver=headless_chrome(), url=page_url("trex", "?seed=1"))
+    try:
+        # Title screen: both paths should see the same pixels
+        direct = bot.capture.grab()
+        shot = bot.capture.from_image(bot._get_canvas_screenshot())
+        for name in direct:
+            diff = np.abs(direct[name].astype(int) - shot[name].astype(int)).max()
+            print(f"{name}: max gray difference {diff}")
+
+        bot.start_game()
+
+        def screenshots():
+            bot.capture.from_image(bot._get_canvas_screenshot())
+            bot.capture.from_image(bot._get_canvas_screenshot())
+
+        report("2 screenshots (before)", time_frames(bot, frames, screenshots))
+        report("1 getImageData (after)", time_frames(bot, frames, bot.capture_frame))
+        size = sum(w * h for _, _, w, h in bot.capture.regions.values())
+        print(f"{size} bytes per frame")
+    finally:
+        bot.driver.quit()
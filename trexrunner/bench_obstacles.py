@@ -0,0 +1,139 @@
+"""
+Obstacle detection and survival for ChromeDinoBot, offline on engine_trex
+(the local runner's rules and course, no browser).
+
+Each run is played tick by tick: render the canvas, decide, press keys a
+frame later, advance the rest of the tick. Three deciders are compared:
+
+    box     the old see_obstacle: jump when anything dark is in x 50-80,
+            y 90-110 (which the T-Rex itself overlaps)
+    fixed   jump (or duck) when the nearest obstacle is within 60 px
+    pilot   obstacles.DinoPilot: speed from the frame history, jump at
+            the last tick that still clears
+
+The pilot's look-ahead frames are recorded and replayed to time detection:
+the old per-pixel loop over its 30x20 box against find_obstacle on the
+300x86 strip, and find_obstacle's x against the engine's.
+
+    python bench_obstacles.py [runs] [tick_ms] [--save frames.npz]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from canvas_capture import DARK
+from engine_trex import DINO_HEIGHT, DINO_WIDTH, DINO_X, DUCK_HEIGHT, FPS, GROUND, RunnerGame
+from obstacles import DROP, DUCK, JUMP, LOOKAHEAD, SLACK, DinoPilot, find_obstacle
+
+MAX_FRAMES = 300 * FPS
+LX, LY, LW, LH = LOOKAHEAD
+
+
+def old_see_obstacle(box):
+    # The old loop over x 50-80, y 90-110, one pixel at a time (getpixel on
+    # the screenshot before)
+    for x in range(30):
+        for y in range(20):
+            if box.item(y, x) < DARK:
+                return True
+    return False
+
+
+def fixed_decide(obstacle):
+    if obstacle is None:
+        return None
+    x, width, top, bottom = obstacle
+    if bottom <= GROUND - DINO_HEIGHT + SLACK or x - (DINO_X + DINO_WIDTH) > 60:
+        return None
+    return DUCK if bottom <= GROUND - DUCK_HEIGHT + SLACK else JUMP
+
+
+def play(seed, decider, tick_frames, record=None):
+    """One run; returns (score, frames survived)."""
+    game = RunnerGame(seed=seed)
+    pilot = DinoPilot(tick=tick_frames / FPS, latency=1 / FPS)
+    holding = False
+    while not game.crashed and game.frames < MAX_FRAMES:
+        canvas = game.render()
+        region = canvas[LY:LY + LH, LX:LX + LW]
+        if decider == "box":
+            action = JUMP if old_see_obstacle(canvas[90:110, 50:80]) else None
+        else:
+            obstacle = find_obstacle(region)
+            if decider == "fixed":
+                action = fixed_decide(obstacle)
+            else:
+                action = pilot.decide(game.frames / FPS, obstacle)
+            if record is not None:
+                # Where the page draws the nearest obstacle that reaches the strip
+                truth = min((round(o.x) for o in game.obstacles if round(o.x) + o.width > LX), default=-1)
+                record.append((region.copy(), canvas[90:110, 50:80].copy(), truth))
+        game.step(1)  # the key lands a frame after the read
+        if action == JUMP:
+            game.jump()
+        elif action == DROP:
+            game.duck(True)
+            game.duck(False)
+        if (action == DUCK) != holding:
+            holding = action == DUCK
+            game.duck(holding)
+        game.step(tick_frames - 1)
+    return game.score, game.frames
+
+
+def time_per_frame(fn, items, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return 1e6 * best
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    runs = int(args[0]) if args else 20
+    tick_frames = max(2, round(float(args[1]) * FPS / 1000)) if len(args) > 1 else 3
+    print(f"{runs} runs per decider, a decision every {tick_frames} frames "
+          f"({1000 * tick_frames / FPS:.0f} ms), capped at {MAX_FRAMES // FPS} s\n")
+
+    recorded = []
+    for decider in ("box", "fixed", "pilot"):
+        scores = []
+        for seed in range(runs):
+            score, _ = play(seed, decider, tick_frames, recorded if decider == "pilot" else None)
+            scores.append(score)
+        print(f"{decider:<6} score mean {statistics.mean(scores):7.0f}  median {statistics.median(scores):7.0f}  "
+              f"max {max(scores):6d}")
+
+    regions = [r for r, _, _ in recorded]
+    boxes = [b for _, b, _ in recorded]
+    print(f"\nreplaying {len(recorded)} recorded frames")
+    # The T-Rex stands in the old box, so the loop stops after a few pixels;
+    # with the box clear it reads all 600
+    print(f"old loop, 30x20 box         {time_per_frame(old_see_obstacle, boxes):6.1f} us/frame")
+    clear = [np.full_like(b, 255) for b in boxes[:1000]]
+    print(f"old loop, 30x20 box clear   {time_per_frame(old_see_obstacle, clear):6.1f} us/frame")
+    print(f"find_obstacle, 300x86 strip {time_per_frame(find_obstacle, regions):6.1f} us/frame")
+
+    errors, missed, false = [], 0, 0
+    for region, _, truth in recorded:
+        found = find_obstacle(region)
+        if truth < 0:
+            false += found is not None
+        elif truth >= LX + LW:
+            continue
+        elif found is None:
+            missed += 1
+        else:
+            errors.append(abs(found[0] - max(truth, LX)))
+    print(f"x error {statistics.mean(errors):.2f} px mean, {max(errors)} max; "
+          f"{missed} missed, {false} false detections")
+
+    if "--save" in sys.argv:
+        path = sys.argv[sys.argv.index("--save") + 1]
+        np.savez_compressed(path, regions=np.stack(regions), truth=np.array([t for _, _, t in recorded]))
+        print(f"saved {path}")
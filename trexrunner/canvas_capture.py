@@ -0,0 +1,100 @@
+"""
+Reads rectangles of a <canvas> straight from the page with getImageData,
+instead of screenshotting the whole window and cropping it with PIL.
+
+All rectangles come back from one execute_script call as a single
+base64 string of grayscale bytes (one per CSS pixel, the canvas composited
+over a white page like a screenshot would show it). The decoded bytes are
+wrapped with np.frombuffer and each rectangle is a (height, width) view
+into them, so nothing is copied after the decode:
+
+    capture = CanvasCapture(driver, {"ahead": (100, 90, 120, 50)})
+    frame = capture.grab()
+    dark = frame["ahead"] < DARK
+
+grab() returns None when the canvas can't be read (no 2D context, or
+tainted by cross-origin images); from_image() turns a screenshot crop into
+the same frame so callers can fall back to it.
+"""
+import base64
+
+import numpy as np
+
+# A pixel darker than this counts as drawn on. The runner draws in #535353
+# (gray 83), which the old sum(R, G, B) < 200 check (gray < 67) missed
+DARK = 128
+
+CAPTURE_JS = """
+var canvas = document.querySelector(arguments[0]);
+var rects = arguments[1];
+if (!canvas || !canvas.getContext) return null;
+var ctx = canvas.getContext("2d");
+if (!ctx) return null;
+// Canvas pixels per CSS pixel (devicePixelRatio scaling)
+var scale = canvas.width / (canvas.clientWidth || canvas.width);
+var total = 0;
+for (var r = 0; r < rects.length; r++) total += rects[r][2] * rects[r][3];
+var out = new Uint8Array(total), k = 0;
+try {
+  for (var r = 0; r < rects.length; r++) {
+    var x = rects[r][0], y = rects[r][1], w = rects[r][2], h = rects[r][3];
+    var sw = Math.max(1, Math.round(w * scale)), sh = Math.max(1, Math.round(h * scale));
+    var data = ctx.getImageData(Math.round(x * scale), Math.round(y * scale), sw, sh).data;
+    for (var j = 0; j < h; j++) {
+      var row = Math.min(sh - 1, Math.floor(j * scale)) * sw;
+      for (var i = 0; i < w; i++) {
+        var p = (row + Math.min(sw - 1, Math.floor(i * scale))) * 4;
+        var luma = (data[p] * 77 + data[p + 1] * 150 + data[p + 2] * 29) >> 8;
+        // Over a white page: transparent pixels are white
+        out[k++] = 255 - ((data[p + 3] * (255 - luma) + 127) / 255 | 0);
+      }
+    }
+  }
+} catch (e) {
+  return null;  // tainted canvas
+}
+var s = "";
+for (var i = 0; i < out.length; i += 0x8000) {
+  s += String.fromCharCode.apply(null, out.subarray(i, i + 0x8000));
+}
+return btoa(s);
+"""
+
+
+class CanvasCapture:
+    def __init__(self, driver, regions, selector=".runner-canvas"):
+        """
+        :param regions: name -> (x, y, width, height) in CSS pixels of the canvas
+        :param selector: CSS selector of the canvas
+        """
+        self.driver = driver
+        self.selector = selector
+        self.regions = dict(regions)
+        self._rects = [list(map(int, r)) for r in self.regions.values()]
+        self.frames = 0
+
+    def _split(self, buf):
+        frame, offset = {}, 0
+        for name, (x, y, w, h) in self.regions.items():
+            frame[name] = buf[offset:offset + w * h].reshape(h, w)
+            offset += w * h
+        return frame
+
+    def grab(self):
+        """One frame: name -> (height, width) uint8 grayscale view, or None."""
+        data = self.driver.execute_script(CAPTURE_JS, self.selector, self._rects)
+        if data is None:
+            return None
+        self.frames += 1
+        return self._split(np.frombuffer(base64.b64decode(data), dtype=np.uint8))
+
+    def from_image(self, image):
+        """The same frame from a PIL image of the canvas (e.g. a screenshot crop)."""
+        gray = np.asarray(image.convert("L"))
+        frame = {}
+        for name, (x, y, w, h) in self.regions.items():
+            region = np.full((h, w), 255, dtype=np.uint8)
+            part = gray[y:y + h, x:x + w]
+            region[:part.shape[0], :part.shape[1]] = part
+            frame[name] = region
+        return frame
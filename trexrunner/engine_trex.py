@@ -0,0 +1,174 @@
+"""
+The T-Rex runner as played on local_pages/trex, in-process, so
+ChromeDinoBot's detection and timing can be run on frames without a
+browser.
+
+RunnerGame follows the page's rules and seeded course (the same mulberry32
+stream, so ?seed=N and RunnerGame(seed=N) lay out the same obstacles when
+stepped the same number of frames). render() draws the canvas the way
+CanvasCapture reads it: one gray byte per CSS pixel, 255 for the
+background and 83 (#535353) for everything drawn. "GAME OVER" and the
+distance are drawn as one block per character.
+
+    game = RunnerGame(seed=1)
+    game.jump()
+    crashed = game.step(frames=3)
+    canvas = game.render()          # (150, 600) uint8
+"""
+import numpy as np
+
+WIDTH, HEIGHT, GROUND = 600, 150, 140
+FPS = 60
+SPEED, MAX_SPEED, ACCELERATION = 6, 13, 0.001
+GRAVITY, JUMP_VELOCITY, DROP_VELOCITY = 0.6, -10, -5
+
+DINO_X, DINO_WIDTH, DINO_HEIGHT = 50, 44, 47
+DUCK_WIDTH, DUCK_HEIGHT = 59, 25
+
+BACKGROUND, INK = 255, 83
+
+# name, width, height, top edges, minimum speed, gap coefficient
+TYPES = (
+    ("cactus-small", 17, 35, (105,), 0, 120),
+    ("cactus-large", 25, 50, (90,), 0, 120),
+    ("pterodactyl", 46, 40, (100, 75, 50), 8.5, 150),
+)
+
+_M32 = 0xFFFFFFFF
+
+
+def mulberry32(seed):
+    """The page's seeded Math.random replacement."""
+    a = seed & _M32
+
+    def random():
+        nonlocal a
+        a = (a + 0x6D2B79F5) & _M32
+        t = a
+        t = ((t ^ (t >> 15)) * (t | 1)) & _M32
+        t ^= (t + ((t ^ (t >> 7)) * (t | 61))) & _M32
+        return ((t ^ (t >> 14)) & _M32) / 4294967296
+
+    return random
+
+
+class Obstacle:
+    __slots__ = ("type", "x", "y", "width", "height", "gap")
+
+    def __init__(self, type, x, y, width, height, gap):
+        self.type = type
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.gap = gap
+
+
+class RunnerGame:
+    def __init__(self, seed=None):
+        self.random = mulberry32(seed) if seed is not None else np.random.default_rng().random
+        self.canvas = np.empty((HEIGHT, WIDTH), dtype=np.uint8)
+        self.reset()
+
+    def reset(self):
+        """A new run on the course's next stretch, like SPACE after a crash."""
+        self.y = GROUND - DINO_HEIGHT
+        self.velocity = 0.0
+        self.jumping = False
+        self.ducking = False
+        self.obstacles = []
+        self.speed = SPEED
+        self.distance = 0.0
+        self.crashed = False
+        self.frames = 0
+
+    @property
+    def score(self):
+        """The distance the page shows."""
+        return int(self.distance * 0.025)
+
+    def jump(self):
+        if not self.jumping and not self.crashed:
+            self.jumping = True
+            self.velocity = JUMP_VELOCITY
+
+    def duck(self, ducking=True):
+        """DOWN pressed (True) or released (False)."""
+        if ducking and self.jumping:
+            self.velocity = max(self.velocity, -DROP_VELOCITY)
+        else:
+            self.ducking = ducking
+
+    def _add_obstacle(self):
+        random = self.random
+        options = [t for t in TYPES if self.speed >= t[4]]
+        name, width, height, tops, _, gap = options[int(random() * len(options))]
+        count = 1 if name == "pterodactyl" else 1 + int(random() * min(3, self.speed / 4))
+        y = tops[int(random() * len(tops))]
+        width *= count
+        gap = round(width * self.speed + gap * 0.6 + random() * gap * 0.9)
+        self.obstacles.append(Obstacle(name, WIDTH, y, width, height, gap))
+
+    def dino_box(self):
+        """(x, y, width, height) of the T-Rex."""
+        if self.ducking and not self.jumping:
+            return DINO_X, GROUND - DUCK_HEIGHT, DUCK_WIDTH, DUCK_HEIGHT
+        return DINO_X, self.y, DINO_WIDTH, DINO_HEIGHT
+
+    def step(self, frames=1):
+        """
+        Advance `frames` 60 Hz frames (fractions allowed, like a late
+        requestAnimationFrame). Returns whether the T-Rex has crashed.
+        """
+        if self.crashed:
+            return True
+        self.frames += frames
+        self.distance += self.speed * frames
+        if self.speed < MAX_SPEED:
+            self.speed = min(MAX_SPEED, self.speed + ACCELERATION * frames)
+
+        if self.jumping:
+            self.y += self.velocity * frames
+            self.velocity += GRAVITY * frames
+            if self.y >= GROUND - DINO_HEIGHT:
+                self.y = GROUND - DINO_HEIGHT
+                self.velocity = 0.0
+                self.jumping = False
+
+        for o in self.obstacles:
+            o.x -= self.speed * frames
+        self.obstacles = [o for o in self.obstacles if o.x + o.width > 0]
+        last = self.obstacles[-1] if self.obstacles else None
+        if last is None or WIDTH - (last.x + last.width) > last.gap:
+            self._add_obstacle()
+
+        x, y, w, h = self.dino_box()
+        for o in self.obstacles:
+            # The page's hit test, with its 4 px of slack
+            if x + 4 < o.x + o.width and o.x + 4 < x + w and y + 4 < o.y + o.height and o.y + 4 < y + h:
+                self.crashed = True
+                break
+        return self.crashed
+
+    def render(self):
+        """The canvas as the page draws it, (150, 600) uint8 gray. Reused between calls."""
+        c = self.canvas
+        c.fill(BACKGROUND)
+        c[GROUND - 2] = INK
+        x, y, w, h = self.dino_box()
+        y = int(round(y))
+        c[max(0, y):y + h, x:x + w] = INK
+        c[y + 6:y + 10, x + w - 14:x + w - 10] = BACKGROUND
+        for o in self.obstacles:
+            ox = int(round(o.x))
+            c[o.y:o.y + o.height, max(0, ox):max(0, ox + o.width)] = INK
+        self._text(("00000" + str(self.score))[-5:], 550, 2, 12)
+        if self.crashed:
+            self._text("G A M E  O V E R", 204, 11, 15)
+        return c
+
+    def _text(self, text, x, y, size):
+        for k, ch in enumerate(text):
+            if ch != " ":
+                left = int(x + k * size * 0.6)
+                self.canvas[y + 2:y + 2 + int(size * 0.75), left:left + size // 2] = INK
@@ -0,0 +1,209 @@
+"""
+Obstacle detection and jump timing for ChromeDinoBot.
+
+find_obstacle() thresholds a look-ahead strip of the canvas (a NumPy
+array from CanvasCapture, or engine_trex's render) in one operation and
+returns the nearest obstacle's box. ObstacleTracker follows that
+obstacle's x over the last few frames in a ring buffer to estimate the
+game's speed, which climbs from 6 to 13 px per frame over a run.
+DinoPilot turns the box and the speed into a time to contact, and jumps,
+ducks or drops the last tick before it would be too late:
+
+    pilot = DinoPilot(tick=0.05)
+    action = pilot.decide(time.perf_counter(), find_obstacle(frame["ahead"]))
+
+Times passed in are seconds; everything inside is in 60 Hz frames and
+canvas pixels, the units the runner moves in.
+"""
+import math
+
+import numpy as np
+
+from canvas_capture import DARK
+from engine_trex import (ACCELERATION, DINO_HEIGHT, DINO_WIDTH, DINO_X, DROP_VELOCITY, DUCK_HEIGHT, FPS,
+                         GRAVITY, GROUND, JUMP_VELOCITY, SPEED)
+
+# x, y, width, height: right of the ducking T-Rex (x 50-108), from the
+# highest pterodactyl down to just above the ground line
+LOOKAHEAD = (110, 50, 300, 86)
+
+JUMP, DUCK, DROP = "jump", "duck", "drop"
+
+# The page only counts a hit with more than 4 px of overlap
+SLACK = 4
+# Frames from take-off back to the ground
+AIRTIME = 2 * (-JUMP_VELOCITY + GRAVITY / 2) / GRAVITY
+
+
+def find_obstacle(region, left=LOOKAHEAD[0], top=LOOKAHEAD[1]):
+    """
+    The nearest obstacle in a look-ahead region as (x, width, top, bottom)
+    in canvas pixels, or None. Obstacles that touch (a row of cacti) come
+    back as one.
+    """
+    dark = region < DARK
+    columns = dark.any(axis=0)
+    x0 = int(columns.argmax())
+    if not columns[x0]:
+        return None
+    run = columns[x0:]
+    x1 = x0 + (len(run) if run.all() else int(run.argmin()))
+    rows = dark[:, x0:x1].any(axis=1)
+    y0 = int(rows.argmax())
+    y1 = len(rows) - int(rows[::-1].argmax())
+    return left + x0, x1 - x0, top + y0, top + y1
+
+
+class ObstacleTracker:
+    """
+    Speed in px per frame from the nearest obstacle's x over the last
+    `history` observations. A new obstacle taking the lead starts a new
+    history; the speed estimate carries over.
+    """
+
+    def __init__(self, history=8, left=LOOKAHEAD[0]):
+        self.left = left
+        self.times = np.zeros(history)
+        self.xs = np.zeros(history)
+        self.index = 0
+        self.count = 0
+        self.speed = float(SPEED)
+        self.estimated_at = None
+
+    def reset(self):
+        self.count = 0
+        self.speed = float(SPEED)
+        self.estimated_at = None
+
+    def update(self, now, obstacle):
+        """Record the obstacle seen at frame `now` and return the speed estimate."""
+        n = len(self.xs)
+        if obstacle is None or obstacle[0] <= self.left:
+            # Nothing to follow, or cut off by the left edge of the strip
+            if obstacle is None:
+                self.count = 0
+            return self.predicted(now)
+        x = obstacle[0]
+        if self.count and x > self.xs[(self.index - 1) % n] + 2:
+            self.count = 0  # a new obstacle is the nearest
+        self.times[self.index] = now
+        self.xs[self.index] = x
+        self.index = (self.index + 1) % n
+        self.count = min(self.count + 1, n)
+        if self.count >= 2:
+            oldest = (self.index - self.count) % n
+            elapsed = now - self.times[oldest]
+            if elapsed > 0:
+                self.speed = (self.xs[oldest] - x) / elapsed
+                self.estimated_at = now
+        return self.predicted(now)
+
+    def predicted(self, now):
+        """The estimate carried forward: the game keeps accelerating between estimates."""
+        if self.estimated_at is None:
+            return self.speed
+        return self.speed + ACCELERATION * (now - self.estimated_at)
+
+
+def _rise(need):
+    """Frames after take-off during which the T-Rex is at least `need` px up, or None."""
+    v, g = -JUMP_VELOCITY + GRAVITY / 2, GRAVITY / 2
+    disc = v * v - 4 * g * need
+    if disc < 0:
+        return None
+    root = math.sqrt(disc)
+    return (v - root) / (2 * g), (v + root) / (2 * g)
+
+
+class DinoPilot:
+    """
+    decide(t, obstacle) returns JUMP, DUCK (hold DOWN), DROP (tap DOWN to
+    fall faster) or None (release DOWN, otherwise nothing).
+
+    :param tick: expected seconds between decide() calls, refined as they come
+    :param latency: seconds between reading a frame and the key reaching the game
+    """
+
+    def __init__(self, tick=0.05, latency=0.0, history=8):
+        self.tracker = ObstacleTracker(history)
+        self.initial_tick = tick * FPS
+        self.latency = latency * FPS
+        self.reset()
+
+    def reset(self):
+        """Call at the start of each run."""
+        self.tracker.reset()
+        self.tick = self.initial_tick
+        self.last = None
+        self.jumped_at = None
+        self.landing = -math.inf
+        self.clear_at = -math.inf
+        self.need = 0
+        self.duck_until = -math.inf
+        self.dropped = False
+
+    def decide(self, t, obstacle):
+        now = t * FPS
+        if self.last is not None and now > self.last:
+            self.tick += 0.2 * (now - self.last - self.tick)
+        self.last = now
+        speed = max(self.tracker.update(now, obstacle), 1.0)
+        # Act now if the next tick's keys would land too late; the page
+        # moves in whole frames, so keep one more in hand
+        lead = self.tick + self.latency + 1
+
+        if now < self.landing:
+            if not self.dropped and (now + self.latency >= self.clear_at or self._drop_height(now) >= self.need):
+                # Past the obstacle, or still over it until it has gone by
+                # if we come down now: come down, to be ready for the next one
+                self.dropped = True
+                self.landing = now + self.latency + self._fall(now)
+                return DROP
+            return None
+        if now < self.duck_until:
+            return DUCK
+        if obstacle is None:
+            return None
+
+        x, width, top, bottom = obstacle
+        if bottom <= GROUND - DINO_HEIGHT + SLACK:
+            return None  # flies over the T-Rex's head
+        contact = (x - (DINO_X + DINO_WIDTH - SLACK)) / speed
+        clear = (x + width - (DINO_X + SLACK)) / speed
+        if bottom <= GROUND - DUCK_HEIGHT + SLACK:
+            if contact < lead:
+                self.duck_until = now + clear + 1
+                return DUCK
+            return None
+
+        window = _rise(GROUND - SLACK - top)
+        if window is None:
+            return None  # too tall to jump; nothing on the course is
+        if contact - window[0] < lead:
+            self.jumped_at = now + self.latency
+            self.landing = self.jumped_at + AIRTIME
+            self.clear_at = now + clear
+            self.need = GROUND - SLACK - top
+            self.dropped = False
+            return JUMP
+        return None
+
+    def _after_drop(self, now):
+        # Height and downward velocity when a DOWN sent now lands, k frames
+        # into the jump; DOWN makes the velocity at least DROP_VELOCITY down
+        k = now + self.latency - self.jumped_at
+        v0, g = -JUMP_VELOCITY, GRAVITY
+        height = max(0.0, v0 * k - g * k * (k - 1) / 2)
+        return height, max(g * k - v0, -DROP_VELOCITY)
+
+    def _fall(self, now):
+        """Frames from the DOWN landing back to the ground (s frames fall down * s + g * s * (s - 1) / 2)."""
+        height, down = self._after_drop(now)
+        b = down - GRAVITY / 2
+        return (-b + math.sqrt(b * b + 2 * GRAVITY * height)) / GRAVITY
+
+    def _drop_height(self, now):
+        """Height when the obstacle clears the T-Rex, if DOWN is sent now."""
+        height, down = self._after_drop(now)
+        s = max(0.0, self.clear_at - now - self.latency)
+        return height - down * s - GRAVITY * s * (s - 1) / 2
@@ -0,0 +1,132 @@
+"""
+Records ChromeDinoBot's ticks to a frame store (RL/frame_store.py) and
+replays them through its detectors without a browser, for reproducible
+frames-per-second and accuracy numbers after any perception change.
+
+    python replay_dino.py record runs/live [games] [url]
+    python replay_dino.py simulate runs/sim [games] [tick_ms]
+    python replay_dino.py replay runs/live [runs/sim ...]
+
+record plays in Chrome (the local runner by default) and labels each tick
+with whether the bot saw GAME OVER. simulate plays engine_trex with the
+bot's own checks and pilot, and also labels the x of the nearest obstacle
+in the look-ahead strip as the page would draw it. replay runs
+is_game_over and see_obstacle over every frame, times them, and scores
+them against whatever labels the store has.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from engine_trex import FPS, RunnerGame
+from obstacles import DROP, DUCK, JUMP
+from trex import ChromeDinoBot
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from frame_store import FrameReader, FrameWriter, replay
+
+
+def record(path, games, url=None):
+    from local_pages import headless_chrome, page_url
+
+    bot = ChromeDinoBot(driver=headless_chrome(), url=url or page_url("trex", "?seed=1"))
+    bot.start_recording(path)
+    try:
+        for game in range(games):
+            bot.start_game()
+            ticks = bot.run_game()
+            print(f"game {game + 1}: {ticks} ticks")
+    finally:
+        bot.recorder.close()
+        bot.driver.quit()
+
+
+def simulate(path, games, tick_frames=3, max_frames=120 * FPS):
+    bot = ChromeDinoBot.offline()
+    regions = bot.capture.regions
+    left, right = bot.check_x_start, bot.check_x_end
+    with FrameWriter(path, regions, keys=(JUMP, DUCK, DROP), labels=("game_over", "obstacle_x")) as writer:
+        for seed in range(games):
+            game = RunnerGame(seed=seed)
+            bot.pilot.reset()
+            holding = False
+            while game.frames < max_frames:
+                canvas = game.render()
+                frame = {name: canvas[y:y + h, x:x + w] for name, (x, y, w, h) in regions.items()}
+                visible = [round(o.x) for o in game.obstacles if left < round(o.x) + o.width and round(o.x) < right]
+                truth = max(min(visible), left) if visible else np.nan
+                t = game.frames / FPS
+                if game.crashed:
+                    writer.add(t, frame, labels=(1, truth))
+                    break
+                action = bot.pilot.decide(t, bot.see_obstacle(frame))
+                writer.add(t, frame, keys=(action,) if action else (), labels=(0, truth))
+                game.step(1)
+                if action == JUMP:
+                    game.jump()
+                elif action == DROP:
+                    game.duck(True)
+                    game.duck(False)
+                if (action == DUCK) != holding:
+                    holding = action == DUCK
+                    game.duck(holding)
+                game.step(tick_frames - 1)
+            print(f"seed {seed}: score {game.score}, {'crashed' if game.crashed else 'capped'}")
+
+
+def report(path):
+    reader = FrameReader(path)
+    bot = ChromeDinoBot.offline()
+    size = sum(os.path.getsize(os.path.join(path, f)) for f in ("ticks.bin", "chunks.bin", "frames.bin"))
+    print(f"{path}: {len(reader)} ticks, {size / 1e6:.1f} MB "
+          f"({size / max(1, len(reader)):.0f} bytes per tick, {reader.frame_size} raw)")
+    results = replay(reader, {"is_game_over": bot.is_game_over, "see_obstacle": bot.see_obstacle})
+    for name, (_, fps) in results.items():
+        print(f"  {name:<14} {fps:10.0f} frames/s")
+
+    over = np.array(results["is_game_over"][0])
+    if "game_over" in reader.labels:
+        label = reader.label("game_over") == 1
+        print(f"  is_game_over: {int((over & label).sum())}/{int(label.sum())} game overs found, "
+              f"{int((over & ~label).sum())} false")
+    if "obstacle_x" in reader.labels:
+        truth = reader.label("obstacle_x")
+        found = results["see_obstacle"][0]
+        x = np.array([np.nan if o is None else o[0] for o in found])
+        seen, labelled = ~np.isnan(x), ~np.isnan(truth)
+        exact = np.abs(x[seen & labelled] - truth[seen & labelled]) <= 1
+        print(f"  see_obstacle: x within 1 px on {int(exact.sum())}/{int(labelled.sum())} frames, "
+              f"{int((labelled & ~seen).sum())} missed, {int((seen & ~labelled).sum())} false")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="replay_dino", description="Record and replay ChromeDinoBot's frames.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="play in Chrome and record every tick")
+    rec.add_argument("path")
+    rec.add_argument("games", type=int, nargs="?", default=3)
+    rec.add_argument("url", nargs="?", default=None, help="runner page (the local one by default)")
+
+    sim = sub.add_parser("simulate", help="play engine_trex and record labelled ticks")
+    sim.add_argument("path")
+    sim.add_argument("games", type=int, nargs="?", default=5)
+    sim.add_argument("tick_ms", type=float, nargs="?", default=50.0)
+
+    rep = sub.add_parser("replay", help="time and score the detectors on recorded stores")
+    rep.add_argument("paths", nargs="+")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.path, args.games, args.url)
+    elif args.command == "simulate":
+        simulate(args.path, args.games, max(2, round(args.tick_ms * FPS / 1000)))
+    else:
+        for path in args.paths:
+            report(path)
+
+
+if __name__ == "__main__":
+    main()
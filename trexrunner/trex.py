@@ -1,32 +1,85 @@
+import os
+import sys
 import time
 from io import BytesIO
 
 from selenium import webdriver
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from PIL import Image
+
+from canvas_capture import DARK, CanvasCapture
+from obstacles import DROP, DUCK, JUMP, LOOKAHEAD, DinoPilot, find_obstacle
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RL"))
+from frame_store import FrameWriter
+
+GAME_URL = "https://trex-runner.com/"
 
 class ChromeDinoBot:
-    def __init__(self):
+    def __init__(self, driver=None, url=GAME_URL):
         # Launch the Chrome browser
-        self.driver = webdriver.Chrome()
+        self.driver = driver or webdriver.Chrome()
         # Go to a T-Rex game clone that runs in HTML/Canvas
-        self.driver.get("https://trex-runner.com/")  
+        self.driver.get(url)
         time.sleep(2)
 
         # Grab the canvas element where the game is drawn
         self.canvas = self.driver.find_element(By.CLASS_NAME, "runner-canvas")
+        self._setup()
+
+    @classmethod
+    def offline(cls):
+        """
+        A bot without a browser, for running is_game_over and see_obstacle
+        on recorded frames (see replay_dino.py).
+        """
+        bot = cls.__new__(cls)
+        bot.driver = None
+        bot._setup()
+        return bot
 
+    def _setup(self):
         # Dimensions – from the site’s runner-canvas (600x150 typically)
         self.WIDTH = 600
         self.HEIGHT = 150
 
-        # Where to look for obstacles, relative to T-Rex’s likely position
-        # For example, look ahead in a rectangle x=[50..80], y=[90..110]
-        self.check_x_start = 50
-        self.check_x_end = 80
-        self.check_y_start = 90
-        self.check_y_end = 110
+        # Where to look for obstacles: a strip ahead of the T-Rex (x 50-94,
+        # 108 ducking), x=[110..410], y=[50..136]
+        x, y, w, h = LOOKAHEAD
+        self.check_x_start = x
+        self.check_x_end = x + w
+        self.check_y_start = y
+        self.check_y_end = y + h
+
+        # Where "GAME OVER" is drawn, and how many dark pixels in it mean
+        # it's there (the text has a few hundred)
+        self.game_over_box = (204, 13, 192, 12)
+        self.game_over_pixels = 40
+
+        # Both regions are read from the canvas in one call per tick
+        self.capture = CanvasCapture(self.driver, {
+            "obstacle": (self.check_x_start, self.check_y_start,
+                         self.check_x_end - self.check_x_start,
+                         self.check_y_end - self.check_y_start),
+            "game_over": self.game_over_box,
+        })
+
+        # Seconds between ticks, and the pilot that times jumps and ducks
+        # from the obstacle's distance and the game's speed
+        self.tick = 0.02
+        self.pilot = DinoPilot(tick=self.tick + 0.03, latency=0.01)
+        self.ducking = False
+        self.recorder = None
+
+    def start_recording(self, path):
+        """
+        Record every tick from now on (the frame, its time, the keys sent
+        and whether it showed GAME OVER) to the frame store at `path`, see
+        RL/frame_store.py.
+        """
+        self.recorder = FrameWriter(path, self.capture.regions, keys=(JUMP, DUCK, DROP), labels=("game_over",))
+        return self.recorder
 
     def start_game(self):
         """
@@ -36,34 +89,26 @@ class ChromeDinoBot:
         body_elem.send_keys(Keys.SPACE)
         time.sleep(1)
 
-    def is_game_over(self):
-        """
-        The game sets the 'class' on the canvas or runner
-        or changes the T-Rex sprite to 'dead' if you lose.
-        Checking a quick way to see if T-Rex is dead:
-        - Sometimes the page adds a 'crashed' class to the body or canvas
-        - We can also do a pixel check (if T-Rex sprite changes).
-        Here, we do a pixel check in an area where the 'GAME OVER' text appears.
-        """
-        screenshot = self._get_canvas_screenshot()
-        # 'GAME OVER' text often appears around top center, 
-        # let's check a small region in the top middle
-        # If it's black text on white background, we can detect difference
-        # In the actual clone site, it might say "HI 00000" as well. We'll just do a rough check:
-        # If we see a large patch of black, it's likely the game over text.
-        # This is just an example check; you can do more robust checks as needed.
-        # We'll just sample a pixel in the region [280, 22].
-        sample_x = 280
-        sample_y = 22
-
-        if sample_x < screenshot.width and sample_y < screenshot.height:
-            pixel = screenshot.getpixel((sample_x, sample_y))
-            # pixel is (R, G, B)
-            # If it's fairly dark, we assume "GAME OVER" text
-            if sum(pixel) < 200:  # a rough threshold for "dark"
-                return True
-
-        return False
+    def capture_frame(self):
+        """
+        The regions is_game_over and see_obstacle look at, as grayscale
+        NumPy arrays, from one getImageData call. Falls back to a
+        screenshot if the canvas can't be read.
+        """
+        frame = self.capture.grab()
+        if frame is None:
+            frame = self.capture.from_image(self._get_canvas_screenshot())
+        return frame
+
+    def is_game_over(self, frame=None):
+        """
+        Whether "GAME OVER" is drawn at the top middle of the canvas: enough
+        dark pixels in the box around the text. Pass the tick's frame from
+        capture_frame() to avoid reading the canvas again.
+        """
+        if frame is None:
+            frame = self.capture_frame()
+        return int((frame["game_over"] < DARK).sum()) >= self.game_over_pixels
 
     def jump(self):
         """
@@ -74,39 +119,45 @@ class ChromeDinoBot:
 
     def duck(self, ducking=True):
         """
-        Press or release the DOWN arrow key to duck.
-        (You might or might not use this, depending on obstacles.)
+        Press (and hold) or release the DOWN arrow key to duck. The T-Rex
+        stays down until it is released.
         """
-        body_elem = self.driver.find_element(By.TAG_NAME, "body")
+        actions = ActionChains(self.driver)
         if ducking:
-            body_elem.send_keys(Keys.ARROW_DOWN)
+            actions.key_down(Keys.ARROW_DOWN)
         else:
-            # There's no direct "release key" in Selenium, 
-            # so we typically just do a short press or rely on game logic.
-            pass
+            actions.key_up(Keys.ARROW_DOWN)
+        actions.perform()
+        self.ducking = ducking
 
-    def see_obstacle(self):
+    def drop(self):
         """
-        Returns True if there is a dark pixel in the region where 
-        obstacles appear in front of T-Rex.
+        Tap the DOWN arrow key: in the air, the T-Rex falls faster.
         """
-        screenshot = self._get_canvas_screenshot()
+        body_elem = self.driver.find_element(By.TAG_NAME, "body")
+        body_elem.send_keys(Keys.ARROW_DOWN)
 
+    def see_obstacle(self, frame=None):
+        """
+        The nearest obstacle in the region in front of T-Rex as
+        (x, width, top, bottom) in canvas pixels, or None. The region is
+        thresholded in one NumPy operation.
+        """
+        if frame is None:
+            frame = self.capture_frame()
         # Check the bounding box x=[check_x_start..check_x_end], y=[check_y_start..check_y_end]
-        for x in range(self.check_x_start, self.check_x_end):
-            for y in range(self.check_y_start, self.check_y_end):
-                pixel = screenshot.getpixel((x, y))
-                # If pixel is fairly dark => likely obstacle
-                if sum(pixel) < 200:  # sum(R,G,B) < 200 => dark
-                    return True
-        return False
+        return find_obstacle(frame["obstacle"], self.check_x_start, self.check_y_start)
 
     def _get_canvas_screenshot(self):
         """
         Returns a PIL Image of the <canvas> contents.
         We'll ask Selenium for a screenshot of the full page
-        and then crop to the canvas area.
+        and then crop to the canvas area. Only used when the canvas
+        can't be read directly.
         """
+        # PIL is only needed here, so don't make every import pay for it
+        from PIL import Image
+
         png_data = self.driver.get_screenshot_as_png()
         im = Image.open(BytesIO(png_data))
 
@@ -122,30 +173,56 @@ class ChromeDinoBot:
         im = im.crop((left, top, right, bottom))
         return im
 
-    def play(self):
+    def run_game(self):
         """
-        Main loop:
-        1) Start game
-        2) While not game-over:
-           - Check for obstacle
-           - If obstacle => jump
+        One game from a started run until GAME OVER, one canvas read per
+        tick:
+           - Find the nearest obstacle
+           - Let the pilot decide from its distance and the game's speed
+             whether to jump, duck or drop this tick
            - Sleep briefly => continue
+        Returns the number of ticks.
         """
-        self.start_game()
-
+        self.pilot.reset()
+        ticks = 0
         while True:
-            if self.is_game_over():
-                print("Game Over!")
-                break
-
-            if self.see_obstacle():
+            frame = self.capture_frame()
+            now = time.perf_counter()
+            ticks += 1
+            if self.is_game_over(frame):
+                if self.recorder is not None:
+                    self.recorder.add(now, frame, labels=(1,))
+                    self.recorder.flush()
+                return ticks
+
+            action = self.pilot.decide(now, self.see_obstacle(frame))
+            if action == JUMP:
                 self.jump()
+            elif action == DROP:
+                self.drop()
+            if (action == DUCK) != self.ducking:
+                self.duck(action == DUCK)
+            if self.recorder is not None:
+                self.recorder.add(now, frame, keys=(action,) if action else (), labels=(0,))
 
             # Delay so we don't hammer the CPU too hard
-            time.sleep(0.05)
+            time.sleep(self.tick)
+
+    def play(self):
+        """
+        Main loop:
+        1) Start game
+        2) Play until game-over (run_game)
+        3) Close
+        """
+        self.start_game()
+        self.run_game()
+        print("Game Over!")
 
         # Optionally close the browser
         time.sleep(3)
+        if self.recorder is not None:
+            self.recorder.close()
         self.driver.quit()
 
 